@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import os
 import tempfile
@@ -43,6 +44,7 @@ async def _validate_and_save_uploaded_file(
         Tuple of (file_path, metadata_dict) where metadata contains:
         - file_size_bytes: Size of uploaded file
         - original_filename: Original filename from upload
+        - sha256: SHA-256 of the file, computed while saving (extraction cache key)
 
     Raises:
         HTTPException: For any validation failures (400, 413)
@@ -57,12 +59,14 @@ async def _validate_and_save_uploaded_file(
     except FileValidationError as e:
         raise HTTPException(status_code=400, detail="Invalid file path")
 
+    digest = hashlib.sha256()
     try:
         file_size = await validate_file_size(
             file,
             tmp_path,
             FILE_TYPE_CONFIG.global_max_size_bytes,
             CHUNK_SIZE_BYTES,
+            digest=digest,
         )
     except FileValidationError as e:
         raise HTTPException(status_code=413, detail=str(e))
@@ -101,6 +105,7 @@ async def _validate_and_save_uploaded_file(
         metadata = {
             "file_size_bytes": file_size,
             "original_filename": file.filename,
+            "sha256": digest.hexdigest(),
         }
         return tmp_path, metadata
 
@@ -179,6 +184,10 @@ async def detect(
                     text=text,
                     file_paths=[str(p) for p in tmp_paths],
                     min_block_level=block_level,
+                    # Already hashed while saving; reused by the extraction cache
+                    file_digests={
+                        str(p): m["sha256"] for p, m in zip(tmp_paths, all_metadata)
+                    },
                 )
 
                 if result.get("raw_text"):
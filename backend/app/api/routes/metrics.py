@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from multiagent_firewall.metrics import metrics_snapshot
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def metrics():
+    """Process-wide LLM usage (tokens, cost, latency, retries), cascade and provider state."""
+    return metrics_snapshot()
@@ -19,7 +19,9 @@ class DummyOrchestrator:
         self.calls = []
         self.config = config
 
-    async def run(self, text=None, *, file_paths=None, min_block_level=None):
+    async def run(
+        self, text=None, *, file_paths=None, min_block_level=None, file_digests=None
+    ):
         self.calls.append((text, file_paths, min_block_level))
         return {"detected_fields": [], "risk_level": "low"}
 
@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from multiagent_firewall.metrics import LLM_METRICS, record_llm_usage
+
+
+def test_metrics_endpoint_reports_llm_usage():
+    LLM_METRICS.reset()
+    state = {"metadata": {}}
+    record_llm_usage(
+        state,
+        "llm_detector",
+        {"input_tokens": 10, "output_tokens": 2, "latency_ms": 3.0},
+        model="gpt-4o-mini",
+    )
+
+    client = TestClient(app)
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["llm"]["llm_detector"]["gpt-4o-mini"]["input_tokens"] == 10
+    assert "cascade" in body
+    assert "providers" in body
+    LLM_METRICS.reset()
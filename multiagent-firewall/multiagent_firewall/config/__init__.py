@@ -10,19 +10,27 @@ from .detection import (
     HIGH_RISK_FIELDS,
     KEYWORDS,
     LLM_DETECTOR_PROMPT,
+    LLM_DETECTOR_SPANS_PROMPT,
     LOW_RISK_FIELDS,
     MEDIUM_RISK_FIELDS,
     NER_LABELS,
     OCR_DETECTOR_PROMPT,
+    OCR_REGIONS_PROMPT,
     REGEX_PATTERNS,
     RISK_SCORE,
     RISK_SCORE_THRESHOLDS,
     FILE_TYPE_CONFIG,
 )
 from .env import (
+    DocumentConfig,
+    ExtractionCacheConfig,
     GuardConfig,
     LLMConfig,
+    LLMGateConfig,
+    LLMOCRImageConfig,
+    LLMResilienceConfig,
     NERConfig,
+    OCRCacheConfig,
     OCRConfig,
 )
 
@@ -31,17 +39,25 @@ __all__ = [
     "HIGH_RISK_FIELDS",
     "KEYWORDS",
     "LLM_DETECTOR_PROMPT",
+    "LLM_DETECTOR_SPANS_PROMPT",
     "LOW_RISK_FIELDS",
     "MEDIUM_RISK_FIELDS",
     "NER_LABELS",
     "OCR_DETECTOR_PROMPT",
+    "OCR_REGIONS_PROMPT",
     "REGEX_PATTERNS",
     "RISK_SCORE",
     "RISK_SCORE_THRESHOLDS",
     "FILE_TYPE_CONFIG",
     # Env
+    "DocumentConfig",
+    "ExtractionCacheConfig",
     "GuardConfig",
     "LLMConfig",
+    "LLMGateConfig",
+    "LLMOCRImageConfig",
+    "LLMResilienceConfig",
     "NERConfig",
+    "OCRCacheConfig",
     "OCRConfig",
 ]
@@ -28,7 +28,9 @@ _config = _load_config()
 
 # Prompt filenames
 LLM_DETECTOR_PROMPT: str = _config["prompts"]["llm_detector"]
+LLM_DETECTOR_SPANS_PROMPT: str = _config["prompts"]["llm_detector_spans"]
 OCR_DETECTOR_PROMPT: str = _config["prompts"]["ocr_detector"]
+OCR_REGIONS_PROMPT: str = _config["prompts"]["ocr_regions"]
 
 # Regex patterns for DLP detection
 REGEX_PATTERNS: dict[str, dict[str, Any]] = _config["regex_patterns"]
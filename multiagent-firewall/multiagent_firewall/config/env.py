@@ -24,11 +24,54 @@ def _parse_float(value: str | None, default: float, *, min_value: float) -> floa
     return max(min_value, parsed)
 
 
+def _parse_int(value: str | None, default: int, *, min_value: int) -> int:
+    if value is None:
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        return default
+    return max(min_value, parsed)
+
+
 @dataclass(frozen=True)
 class LLMConfig:
     provider: str
     model: str
     client_params: Dict[str, Any] = field(default_factory=dict)
+    # "values" echoes detected values; "spans" returns word offsets only
+    output_format: str = "values"
+    # Emit provider prompt-cache hints for the static system prompt
+    prompt_cache: bool = True
+    # Input token budget (None = unbounded) and how to reduce oversized inputs:
+    # "truncate", "head_tail" (sample both ends) or "chunk" (several calls)
+    max_input_tokens: int | None = None
+    overflow_policy: str = "truncate"
+    # Chunks of one request sent at once (also kept under the provider limit)
+    chunk_concurrency: int = 2
+
+
+@dataclass(frozen=True)
+class LLMResilienceConfig:
+    """Circuit breaker + AIMD concurrency settings applied per LLM provider."""
+
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    half_open_max_calls: int = 1
+    initial_concurrency: int = 8
+    min_concurrency: int = 1
+    max_concurrency: int = 64
+    # Seconds a call waits for a free slot before it is shed
+    queue_timeout: float = 10.0
+
+
+@dataclass(frozen=True)
+class LLMGateConfig:
+    """Learned gate that lets benign prompts skip the LLM detector."""
+
+    enabled: bool = False
+    model_path: str | None = None
+    recall_target: float = 0.95
 
 
 @dataclass(frozen=True)
@@ -37,6 +80,83 @@ class OCRConfig:
     config: str = ""
     confidence_threshold: int = 0
     tesseract_cmd: str | None = None
+    backend: str = "auto"
+    pool_size: int | None = None
+    process_pool: bool = True
+    workers: int | None = None
+    max_concurrency: int = 4
+    # Opt-in: low-scoring images are not OCRed by either tier
+    text_prefilter: bool = False
+    text_prefilter_threshold: float = 0.05
+    # Opt-in: sends images Tesseract did read to the vision LLM
+    region_fallback: bool = False
+    region_confidence: int = 60
+    max_regions: int = 8
+    tiling: bool = True
+    tile_height: int = 2048
+    tile_overlap: int = 128
+    frame_sampling: str = "uniform"
+    max_frames: int = 16
+    max_pages: int = 200
+    frame_hash_distance: int = 6
+
+
+@dataclass(frozen=True)
+class DocumentConfig:
+    """Extraction of PDF and text files in read_document."""
+
+    process_pool: bool = True
+    # Smaller PDFs are extracted in a thread; a worker round trip costs more
+    process_min_bytes: int = 256 * 1024
+    pdf_backend: str = "pdfplumber"
+    pdf_pages_per_task: int = 8
+    # Pages without text but mostly covered by images are rendered and OCRed
+    pdf_ocr: bool = True
+    pdf_ocr_min_image_coverage: float = 0.5
+    pdf_ocr_dpi: int = 200
+    pdf_ocr_max_pages: int = 50
+    # Larger text files are memory-mapped and normalized while being decoded
+    text_stream_min_bytes: int = 4 * 1024 * 1024
+    # Large CSV/JSON files are profiled per column instead of scanned as text
+    structured_scan: bool = True
+    structured_min_bytes: int = 1024 * 1024
+    structured_sample_rows: int = 200
+    structured_sensitive_ratio: float = 0.9
+
+
+@dataclass(frozen=True)
+class OCRCacheConfig:
+    """
+    Content-addressed cache of OCR results (Tesseract and LLM OCR).
+    The optional disk tier holds the recognized text of user images.
+    """
+
+    enabled: bool = True
+    max_entries: int = 256
+    cache_dir: str | None = None
+    max_bytes: int = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ExtractionCacheConfig:
+    """
+    On-disk cache of extracted PDF and text files, keyed by content hash.
+    Disabled unless a directory is set: entries hold extracted document text.
+    """
+
+    cache_dir: str | None = None
+    max_bytes: int = 512 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class LLMOCRImageConfig:
+    """Downscaling and re-encoding applied to images before LLM OCR."""
+
+    enabled: bool = True
+    max_edge: int = 1568
+    grayscale: bool = True
+    image_format: str = "jpeg"
+    quality: int = 85
 
 
 @dataclass(frozen=True)
@@ -63,9 +183,20 @@ class CodeAnalysisConfig:
 class GuardConfig:
     llm: LLMConfig
     llm_ocr: LLMConfig | None = None
+    llm_ocr_concurrency: int = 4
+    llm_ocr_image: LLMOCRImageConfig = field(default_factory=LLMOCRImageConfig)
+    llm_fast: LLMConfig | None = None
+    speculative_llm: bool = False
     ocr: OCRConfig = field(default_factory=OCRConfig)
+    ocr_cache: OCRCacheConfig = field(default_factory=OCRCacheConfig)
+    document: DocumentConfig = field(default_factory=DocumentConfig)
+    extraction_cache: ExtractionCacheConfig = field(
+        default_factory=ExtractionCacheConfig
+    )
     ner: NERConfig = field(default_factory=NERConfig)
     code_analysis: CodeAnalysisConfig = field(default_factory=CodeAnalysisConfig)
+    llm_resilience: LLMResilienceConfig = field(default_factory=LLMResilienceConfig)
+    llm_gate: LLMGateConfig = field(default_factory=LLMGateConfig)
     debug: bool = False
     force_llm_detector: bool = False
 
@@ -84,10 +215,30 @@ class GuardConfig:
             prefix="LLM",
             require_api_key=True,
         )
+        output_format = (os.getenv("LLM_OUTPUT_FORMAT") or "values").strip().lower()
+        if output_format not in ("values", "spans"):
+            output_format = "values"
+        prompt_cache = _str_to_bool(os.getenv("LLM_PROMPT_CACHE"), True)
+        max_input_tokens = (
+            _parse_int(os.getenv("LLM_MAX_INPUT_TOKENS"), 0, min_value=0) or None
+        )
+        overflow_policy = (
+            (os.getenv("LLM_OVERFLOW_POLICY") or "truncate").strip().lower()
+        )
+        if overflow_policy not in ("truncate", "head_tail", "chunk"):
+            overflow_policy = "truncate"
+        chunk_concurrency = _parse_int(
+            os.getenv("LLM_CHUNK_CONCURRENCY"), 2, min_value=1
+        )
         llm_config = LLMConfig(
             provider=llm_provider,
             model=llm_model,
             client_params=llm_client_params,
+            output_format=output_format,
+            prompt_cache=prompt_cache,
+            max_input_tokens=max_input_tokens,
+            overflow_policy=overflow_policy,
+            chunk_concurrency=chunk_concurrency,
         )
 
         ocr_provider, ocr_model, ocr_client_params = load_litellm_env(
@@ -102,6 +253,43 @@ class GuardConfig:
             client_params=ocr_client_params,
         )
 
+        llm_ocr_concurrency = _parse_int(
+            os.getenv("LLM_OCR_CONCURRENCY"), 4, min_value=1
+        )
+        image_format = (os.getenv("LLM_OCR_IMAGE_FORMAT") or "jpeg").strip().lower()
+        if image_format not in ("jpeg", "png", "webp"):
+            image_format = "jpeg"
+        llm_ocr_image = LLMOCRImageConfig(
+            enabled=_str_to_bool(os.getenv("LLM_OCR_IMAGE_PREPROCESS"), True),
+            max_edge=_parse_int(os.getenv("LLM_OCR_MAX_IMAGE_EDGE"), 1568, min_value=0),
+            grayscale=_str_to_bool(os.getenv("LLM_OCR_GRAYSCALE"), True),
+            image_format=image_format,
+            quality=min(
+                95, _parse_int(os.getenv("LLM_OCR_IMAGE_QUALITY"), 85, min_value=1)
+            ),
+        )
+
+        # Optional fast tier for the LLM cascade, enabled by LLM_FAST_MODEL
+        llm_fast_config = None
+        if (os.getenv("LLM_FAST_MODEL") or "").strip():
+            fast_provider, fast_model, fast_client_params = load_litellm_env(
+                prefix="LLM_FAST",
+                fallback_prefix="LLM",
+                require_api_key=False,
+                fallback_extra_params=False,
+            )
+            llm_fast_config = LLMConfig(
+                provider=fast_provider,
+                model=fast_model,
+                client_params=fast_client_params,
+                output_format=output_format,
+                prompt_cache=prompt_cache,
+                max_input_tokens=max_input_tokens,
+                overflow_policy=overflow_policy,
+                chunk_concurrency=chunk_concurrency,
+            )
+        speculative_llm = _str_to_bool(os.getenv("LLM_SPECULATIVE"), False)
+
         ocr_lang = os.getenv("OCR_LANG", "eng")
         ocr_config = os.getenv("OCR_CONFIG", "")
         threshold_str = os.getenv("OCR_CONFIDENCE_THRESHOLD", "0")
@@ -111,6 +299,98 @@ class GuardConfig:
         except ValueError:
             threshold = 0
         tesseract_cmd = os.getenv("TESSERACT_CMD")
+        ocr_backend = (os.getenv("OCR_BACKEND") or "auto").strip().lower()
+        if ocr_backend not in ("auto", "tesserocr", "pytesseract"):
+            ocr_backend = "auto"
+        ocr_pool_size = _parse_int(os.getenv("OCR_POOL_SIZE"), 0, min_value=0) or None
+        ocr_process_pool = _str_to_bool(os.getenv("OCR_PROCESS_POOL"), True)
+        ocr_workers = _parse_int(os.getenv("OCR_WORKERS"), 0, min_value=0) or None
+        ocr_max_concurrency = _parse_int(
+            os.getenv("OCR_MAX_CONCURRENCY"), 4, min_value=1
+        )
+        ocr_text_prefilter = _str_to_bool(os.getenv("OCR_TEXT_PREFILTER"), False)
+        ocr_text_prefilter_threshold = min(
+            1.0,
+            _parse_float(
+                os.getenv("OCR_TEXT_PREFILTER_THRESHOLD"), 0.05, min_value=0.0
+            ),
+        )
+        ocr_region_fallback = _str_to_bool(os.getenv("OCR_REGION_FALLBACK"), False)
+        ocr_region_confidence = min(
+            100, _parse_int(os.getenv("OCR_REGION_CONFIDENCE"), 60, min_value=0)
+        )
+        ocr_max_regions = _parse_int(os.getenv("OCR_MAX_REGIONS"), 8, min_value=1)
+        ocr_tiling = _str_to_bool(os.getenv("OCR_TILING"), True)
+        ocr_tile_height = _parse_int(os.getenv("OCR_TILE_HEIGHT"), 2048, min_value=256)
+        ocr_tile_overlap = _parse_int(os.getenv("OCR_TILE_OVERLAP"), 128, min_value=0)
+        ocr_frame_sampling = (
+            (os.getenv("OCR_FRAME_SAMPLING") or "uniform").strip().lower()
+        )
+        if ocr_frame_sampling not in ("uniform", "all", "first"):
+            ocr_frame_sampling = "uniform"
+        ocr_max_frames = _parse_int(os.getenv("OCR_MAX_FRAMES"), 16, min_value=1)
+        ocr_max_pages = _parse_int(os.getenv("OCR_MAX_PAGES"), 200, min_value=1)
+        ocr_frame_hash_distance = _parse_int(
+            os.getenv("OCR_FRAME_HASH_DISTANCE"), 6, min_value=0
+        )
+        ocr_cache = OCRCacheConfig(
+            enabled=_str_to_bool(os.getenv("OCR_CACHE_ENABLED"), True),
+            max_entries=_parse_int(
+                os.getenv("OCR_CACHE_MAX_ENTRIES"), 256, min_value=1
+            ),
+            cache_dir=(os.getenv("OCR_CACHE_DIR") or "").strip() or None,
+            max_bytes=_parse_int(
+                os.getenv("OCR_CACHE_MAX_BYTES"), 64 * 1024 * 1024, min_value=1
+            ),
+        )
+        extraction_cache = ExtractionCacheConfig(
+            cache_dir=(os.getenv("EXTRACTION_CACHE_DIR") or "").strip() or None,
+            max_bytes=_parse_int(
+                os.getenv("EXTRACTION_CACHE_MAX_BYTES"),
+                512 * 1024 * 1024,
+                min_value=1,
+            ),
+        )
+        pdf_backend = (os.getenv("PDF_BACKEND") or "pdfplumber").strip().lower()
+        if pdf_backend not in ("auto", "pdfplumber", "pypdfium2"):
+            pdf_backend = "pdfplumber"
+        document = DocumentConfig(
+            process_pool=_str_to_bool(os.getenv("DOCUMENT_PROCESS_POOL"), True),
+            process_min_bytes=_parse_int(
+                os.getenv("DOCUMENT_PROCESS_MIN_BYTES"), 256 * 1024, min_value=0
+            ),
+            pdf_backend=pdf_backend,
+            pdf_pages_per_task=_parse_int(
+                os.getenv("PDF_PAGES_PER_TASK"), 8, min_value=1
+            ),
+            pdf_ocr=_str_to_bool(os.getenv("PDF_OCR"), True),
+            pdf_ocr_min_image_coverage=min(
+                1.0,
+                _parse_float(
+                    os.getenv("PDF_OCR_MIN_IMAGE_COVERAGE"), 0.5, min_value=0.0
+                ),
+            ),
+            pdf_ocr_dpi=_parse_int(os.getenv("PDF_OCR_DPI"), 200, min_value=72),
+            pdf_ocr_max_pages=_parse_int(
+                os.getenv("PDF_OCR_MAX_PAGES"), 50, min_value=1
+            ),
+            text_stream_min_bytes=_parse_int(
+                os.getenv("DOCUMENT_STREAM_MIN_BYTES"), 4 * 1024 * 1024, min_value=0
+            ),
+            structured_scan=_str_to_bool(os.getenv("STRUCTURED_SCAN"), True),
+            structured_min_bytes=_parse_int(
+                os.getenv("STRUCTURED_MIN_BYTES"), 1024 * 1024, min_value=0
+            ),
+            structured_sample_rows=_parse_int(
+                os.getenv("STRUCTURED_SAMPLE_ROWS"), 200, min_value=1
+            ),
+            structured_sensitive_ratio=min(
+                1.0,
+                _parse_float(
+                    os.getenv("STRUCTURED_SENSITIVE_RATIO"), 0.9, min_value=0.0
+                ),
+            ),
+        )
 
         debug_mode = _str_to_bool(os.getenv("DEBUG_MODE"), False)
         force_llm_detector = _str_to_bool(
@@ -155,15 +435,74 @@ class GuardConfig:
         except ValueError:
             code_analysis_min_snippet_length = 50
 
+        llm_resilience = LLMResilienceConfig(
+            failure_threshold=_parse_int(
+                os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD"), 5, min_value=1
+            ),
+            recovery_timeout=_parse_float(
+                os.getenv("LLM_CIRCUIT_RECOVERY_TIMEOUT"), 30.0, min_value=0.0
+            ),
+            half_open_max_calls=_parse_int(
+                os.getenv("LLM_CIRCUIT_HALF_OPEN_MAX_CALLS"), 1, min_value=1
+            ),
+            initial_concurrency=_parse_int(
+                os.getenv("LLM_CONCURRENCY_INITIAL"), 8, min_value=1
+            ),
+            min_concurrency=_parse_int(
+                os.getenv("LLM_CONCURRENCY_MIN"), 1, min_value=1
+            ),
+            max_concurrency=_parse_int(
+                os.getenv("LLM_CONCURRENCY_MAX"), 64, min_value=1
+            ),
+            queue_timeout=_parse_float(
+                os.getenv("LLM_CONCURRENCY_QUEUE_TIMEOUT"), 10.0, min_value=0.0
+            ),
+        )
+
+        llm_gate = LLMGateConfig(
+            enabled=_str_to_bool(os.getenv("LLM_GATE_ENABLED"), False),
+            model_path=(os.getenv("LLM_GATE_MODEL_PATH") or "").strip() or None,
+            recall_target=min(
+                1.0,
+                _parse_float(
+                    os.getenv("LLM_GATE_RECALL_TARGET"), 0.95, min_value=0.0
+                ),
+            ),
+        )
+
         return cls(
             llm=llm_config,
             llm_ocr=llm_ocr_config,
+            llm_ocr_concurrency=llm_ocr_concurrency,
+            llm_ocr_image=llm_ocr_image,
+            llm_fast=llm_fast_config,
+            speculative_llm=speculative_llm,
             ocr=OCRConfig(
                 lang=ocr_lang,
                 config=ocr_config,
                 confidence_threshold=threshold,
                 tesseract_cmd=tesseract_cmd,
+                backend=ocr_backend,
+                pool_size=ocr_pool_size,
+                process_pool=ocr_process_pool,
+                workers=ocr_workers,
+                max_concurrency=ocr_max_concurrency,
+                text_prefilter=ocr_text_prefilter,
+                text_prefilter_threshold=ocr_text_prefilter_threshold,
+                region_fallback=ocr_region_fallback,
+                region_confidence=ocr_region_confidence,
+                max_regions=ocr_max_regions,
+                tiling=ocr_tiling,
+                tile_height=ocr_tile_height,
+                tile_overlap=ocr_tile_overlap,
+                frame_sampling=ocr_frame_sampling,
+                max_frames=ocr_max_frames,
+                max_pages=ocr_max_pages,
+                frame_hash_distance=ocr_frame_hash_distance,
             ),
+            ocr_cache=ocr_cache,
+            document=document,
+            extraction_cache=extraction_cache,
             ner=NERConfig(
                 enabled=ner_enabled,
                 model=ner_model or "urchade/gliner_multi-v2.1",
@@ -180,6 +519,8 @@ class GuardConfig:
                 cache_dir=code_analysis_cache_dir,
                 min_snippet_length=code_analysis_min_snippet_length,
             ),
+            llm_resilience=llm_resilience,
+            llm_gate=llm_gate,
             debug=debug_mode,
             force_llm_detector=force_llm_detector,
         )
@@ -10,7 +10,9 @@ NODE_REGISTRY = {
     "run_dlp_detector": nodes.run_dlp_detector,
     "run_ner_detector": nodes.run_ner_detector,
     "run_code_similarity_detector": nodes.run_code_similarity_detector,
+    "start_speculative_llm": nodes.start_speculative_llm,
     "merge_detections": nodes.merge_detections,
+    "evaluate_llm_gate": nodes.evaluate_llm_gate,
     "anonymize_text": nodes.anonymize_text,
     "evaluate_risk": nodes.evaluate_risk,
     "apply_policy": nodes.apply_policy,
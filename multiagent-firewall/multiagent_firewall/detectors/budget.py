@@ -0,0 +1,138 @@
+"""
+Token budget for LLM inputs.
+
+Estimates input tokens (tiktoken when it is installed and its encoding can be
+loaded, a character heuristic otherwise) and reduces oversized inputs by
+truncation, head+tail sampling or chunking.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List
+
+OVERFLOW_POLICIES = ("truncate", "head_tail", "chunk")
+DEFAULT_MAX_CHUNKS = 8
+HEAD_TAIL_SEPARATOR = "\n[...]\n"
+
+# Rough average for English prose and code with BPE tokenizers
+_CHARS_PER_TOKEN = 4.0
+
+
+@lru_cache(maxsize=8)
+def _load_encoding(model: str | None) -> Any | None:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        if model:
+            try:
+                return tiktoken.encoding_for_model(model.split("/")[-1])
+            except KeyError:
+                pass
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Encodings are downloaded on first use; offline hosts fall back to the heuristic
+        return None
+
+
+def estimate_tokens(text: str, model: str | None = None) -> int:
+    """Estimate how many input tokens `text` costs for `model`."""
+    if not text:
+        return 0
+    encoding = _load_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class BudgetedInput:
+    """Result of applying the token budget: one or more pieces to send."""
+
+    pieces: List[str]
+    estimated_tokens: int
+    reduced: bool = False
+    dropped_chunks: int = 0
+
+
+def apply_token_budget(
+    text: str,
+    max_tokens: int | None,
+    policy: str = "truncate",
+    *,
+    model: str | None = None,
+    max_chunks: int = DEFAULT_MAX_CHUNKS,
+) -> BudgetedInput:
+    """
+    Fit `text` within `max_tokens` according to `policy`.
+
+    Cuts happen on whitespace so redaction placeholders are never split.
+    """
+    if policy not in OVERFLOW_POLICIES:
+        raise ValueError(f"Unsupported overflow policy: {policy}")
+    # Every token covers at least one character, so short texts need no tokenizer
+    if not max_tokens or len(text) <= max_tokens:
+        return BudgetedInput(pieces=[text], estimated_tokens=0)
+    estimated = estimate_tokens(text, model)
+    if estimated <= max_tokens:
+        return BudgetedInput(pieces=[text], estimated_tokens=estimated)
+
+    # Characters that fit the budget, with a small margin for estimation error
+    chars_per_token = len(text) / estimated
+    budget_chars = max(1, int(max_tokens * chars_per_token * 0.95))
+
+    if policy == "truncate":
+        pieces = [_cut_head(text, budget_chars)]
+        dropped = 0
+    elif policy == "head_tail":
+        half = max(1, (budget_chars - len(HEAD_TAIL_SEPARATOR)) // 2)
+        pieces = [_cut_head(text, half) + HEAD_TAIL_SEPARATOR + _cut_tail(text, half)]
+        dropped = 0
+    else:
+        chunks = _split_chunks(text, budget_chars)
+        pieces = chunks[:max_chunks]
+        dropped = len(chunks) - len(pieces)
+    return BudgetedInput(
+        pieces=pieces,
+        estimated_tokens=estimated,
+        reduced=policy != "chunk" or dropped > 0,
+        dropped_chunks=dropped,
+    )
+
+
+def _cut_head(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit + 1)
+    return text[: cut if cut > 0 else limit].rstrip()
+
+
+def _cut_tail(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    start = len(text) - limit
+    cut = text.find(" ", start)
+    return text[cut if 0 <= cut < len(text) - 1 else start :].lstrip()
+
+
+def _split_chunks(text: str, limit: int) -> List[str]:
+    chunks: List[str] = []
+    remaining = text
+    while remaining:
+        head = _cut_head(remaining, limit)
+        chunks.append(head)
+        remaining = remaining[len(head) :].lstrip()
+    return chunks
+
+
+__all__ = [
+    "BudgetedInput",
+    "DEFAULT_MAX_CHUNKS",
+    "OVERFLOW_POLICIES",
+    "apply_token_budget",
+    "estimate_tokens",
+]
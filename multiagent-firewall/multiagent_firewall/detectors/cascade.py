@@ -0,0 +1,110 @@
+"""
+Uncertainty heuristics for the fast -> primary LLM detector cascade.
+
+The fast tier answers on its own unless its output looks uncertain, in which
+case `run_llm_detector` escalates the text to the primary model. Only signals
+the fast tier can actually produce are used: the LLM sees anonymized text, so
+its findings never repeat DLP/NER values, and the prompt asks for no
+confidence score.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, List, Mapping
+
+from ..config.detection import HIGH_RISK_FIELDS, LOW_RISK_FIELDS, MEDIUM_RISK_FIELDS
+
+REASON_ERROR = "fast_error"
+REASON_INFERRED = "inferred_field"
+REASON_OTHER = "other_label"
+
+
+def _normalize(name: Any) -> str:
+    return str(name or "").strip().upper().replace("-", "_")
+
+
+def _known_fields() -> set[str]:
+    return {
+        _normalize(field)
+        for group in (HIGH_RISK_FIELDS, MEDIUM_RISK_FIELDS, LOW_RISK_FIELDS)
+        for field in group
+    }
+
+
+def _raw_sources(item: Mapping[str, Any]) -> list[str]:
+    raw = item.get("sources")
+    if raw is None:
+        raw = item.get("source")
+    if raw is None:
+        return []
+    if not isinstance(raw, list):
+        raw = [raw]
+    return [str(source).strip().lower() for source in raw if source]
+
+
+def assess_uncertainty(result: Mapping[str, Any]) -> List[str]:
+    """
+    Return the reasons why a fast-tier result should be escalated.
+
+    An empty list means the fast tier's answer can be trusted as-is.
+    """
+    reasons: list[str] = []
+
+    def add(reason: str) -> None:
+        if reason not in reasons:
+            reasons.append(reason)
+
+    if result.get("_error"):
+        add(REASON_ERROR)
+
+    known = _known_fields()
+
+    for item in result.get("detected_fields") or []:
+        if not isinstance(item, Mapping):
+            continue
+        if any(source.endswith("inferred") for source in _raw_sources(item)):
+            add(REASON_INFERRED)
+
+        field = _normalize(item.get("field") or item.get("type"))
+        if field == "OTHER" or field not in known:
+            add(REASON_OTHER)
+
+    return reasons
+
+
+class CascadeStats:
+    """Process-wide escalation counters for the LLM cascade."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.escalations = 0
+
+    def record(self, escalated: bool) -> float:
+        """Record one cascade run and return the running escalation rate."""
+        with self._lock:
+            self.requests += 1
+            if escalated:
+                self.escalations += 1
+            return self.escalations / self.requests
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            rate = self.escalations / self.requests if self.requests else 0.0
+            return {
+                "requests": self.requests,
+                "escalations": self.escalations,
+                "escalation_rate": rate,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.escalations = 0
+
+
+CASCADE_STATS = CascadeStats()
+
+
+__all__ = ["CASCADE_STATS", "CascadeStats", "assess_uncertainty"]
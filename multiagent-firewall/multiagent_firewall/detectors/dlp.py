@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_left, bisect_right
 from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
 
 from ..config.detection import REGEX_PATTERNS, KEYWORDS
@@ -372,16 +373,12 @@ def _extract_window_text(
     if not word_spans:
         return ""
     match_start, match_end = match_span
-    start_index = None
-    end_index = None
-    for i, (start, end) in enumerate(word_spans):
-        if start_index is None and end >= match_start:
-            start_index = i
-        if start <= match_end:
-            end_index = i
-    if start_index is None:
+    # Spans are sorted and disjoint: bisect instead of walking every word
+    start_index = bisect_left(word_spans, match_start, key=lambda span: span[1])
+    if start_index == len(word_spans):
         start_index = 0
-    if end_index is None:
+    end_index = bisect_right(word_spans, match_end, key=lambda span: span[0]) - 1
+    if end_index < 0:
         end_index = start_index
     if end_index < start_index:
         end_index = start_index
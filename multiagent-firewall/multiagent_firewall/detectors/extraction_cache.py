@@ -0,0 +1,203 @@
+"""
+Content-addressed cache of extracted documents.
+
+The same PDF or text file is often uploaded again: by other users, on retries,
+or from another session. Extracted text is keyed by the SHA-256 of the file
+bytes, the extractor version and the settings that affect the output, and
+stored as one JSON file per entry in a directory shared between processes.
+The directory is bounded in size; least recently used entries are evicted
+first (a hit refreshes the entry's modification time).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction changes its output for the same file and settings
+EXTRACTOR_VERSION = "3"
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(file_path: str) -> str | None:
+    """Return the hex SHA-256 of a file, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def extraction_cache_key(
+    file_digest: str, category: str, settings: Mapping[str, Any]
+) -> str:
+    """Key of a file's extraction from its content digest and extractor settings."""
+    payload = json.dumps(
+        {
+            "sha256": file_digest,
+            "version": EXTRACTOR_VERSION,
+            "category": category,
+            "settings": dict(settings),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """Size-bounded on-disk store of extraction entries (JSON objects)."""
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max(1, max_bytes)
+        self._lock = threading.Lock()
+        # Bytes on disk as last scanned plus our own writes since
+        self._size: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str | None) -> Dict[str, Any] | None:
+        if key is None:
+            return None
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            # Mark as recently used for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            entry = None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Extraction cache read failed: {e}")
+            entry = None
+        with self._lock:
+            if isinstance(entry, dict):
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def set(self, key: str | None, entry: Mapping[str, Any]) -> None:
+        if key is None:
+            return
+        data = json.dumps(dict(entry), ensure_ascii=False).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see partial files
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Extraction cache write failed: {e}")
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._size = self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._entries():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _entries(self) -> list[Path]:
+        return list(self.cache_dir.glob("*/*.json"))
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self._entries():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self) -> int:
+        """Delete least recently used entries until the store fits; return its size."""
+        # Rescan: other processes share the directory
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Extraction cache eviction failed: {e}")
+                continue
+            total -= size
+        return total
+
+
+_CACHES: Dict[Tuple[str, int], ExtractionCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_extraction_cache(settings: Any | None) -> ExtractionCache | None:
+    """
+    Return the process-wide cache for an `ExtractionCacheConfig`, or None if
+    no cache directory is configured.
+    """
+    cache_dir = getattr(settings, "cache_dir", None)
+    if not cache_dir:
+        return None
+    key = (cache_dir, settings.max_bytes)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = ExtractionCache(cache_dir, settings.max_bytes)
+            _CACHES[key] = cache
+        return cache
+
+
+def reset_extraction_caches() -> None:
+    """Forget the process-wide cache instances (mainly for tests)."""
+    with _CACHES_LOCK:
+        _CACHES.clear()
+
+
+__all__ = [
+    "EXTRACTOR_VERSION",
+    "ExtractionCache",
+    "extraction_cache_key",
+    "file_sha256",
+    "get_extraction_cache",
+    "reset_extraction_caches",
+]
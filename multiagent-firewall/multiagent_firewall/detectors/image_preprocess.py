@@ -0,0 +1,151 @@
+"""
+Image preprocessing for vision LLM calls.
+
+Screenshots and scans are usually far larger than a vision model needs to read
+their text. Downscaling to a maximum edge, dropping colour and re-encoding cuts
+upload time and image tokens while keeping text legible. Requires Pillow (the
+`file-analysis` extra); without it the original bytes are sent unchanged.
+"""
+
+from __future__ import annotations
+
+import io
+import mimetypes
+from dataclasses import dataclass
+from typing import Any, List, Sequence, Tuple
+
+IMAGE_FORMATS = {"jpeg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    data: bytes
+    mime_type: str
+    original_bytes: int
+    preprocessed: bool = False
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.original_bytes - len(self.data))
+
+
+def _guess_mime_type(file_path: str) -> str:
+    mime_type, _ = mimetypes.guess_type(file_path)
+    # Default to image/jpeg if not recognized or not an image type
+    if not mime_type or not mime_type.startswith("image/"):
+        return "image/jpeg"
+    return mime_type
+
+
+def prepare_image_for_llm(file_path: str, settings: Any | None = None) -> PreparedImage:
+    """
+    Load `file_path` and, when `settings.enabled`, downscale/re-encode it.
+
+    The re-encoded image is only used when it is smaller than the original.
+    """
+    with open(file_path, "rb") as f:
+        original = f.read()
+    fallback = PreparedImage(
+        data=original,
+        mime_type=_guess_mime_type(file_path),
+        original_bytes=len(original),
+    )
+    if settings is None or not getattr(settings, "enabled", False):
+        return fallback
+
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return fallback
+
+    try:
+        with Image.open(io.BytesIO(original)) as image:
+            data, mime_type = _encode(ImageOps.exif_transpose(image), settings)
+    except Exception:
+        # Unreadable by Pillow (or unsupported encoder): let the provider decide
+        return fallback
+
+    if len(data) >= len(original):
+        return fallback
+    return PreparedImage(
+        data=data,
+        mime_type=mime_type,
+        original_bytes=len(original),
+        preprocessed=True,
+    )
+
+
+def crop_regions_for_llm(
+    file_path: str,
+    boxes: Sequence[Sequence[int]],
+    settings: Any | None = None,
+) -> Tuple[List[PreparedImage], float]:
+    """
+    Crop `boxes` (left, top, right, bottom) out of an image and encode each crop.
+
+    Returns the crops and the share of the image's pixels they cover. Crops are
+    encoded with `settings` when preprocessing is enabled, as PNG otherwise.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(file_path) as source:
+        image = ImageOps.exif_transpose(source)
+        width, height = image.size
+        crops: List[PreparedImage] = []
+        covered = 0
+        for left, top, right, bottom in boxes:
+            box = (max(0, left), max(0, top), min(width, right), min(height, bottom))
+            if box[2] <= box[0] or box[3] <= box[1]:
+                continue
+            covered += (box[2] - box[0]) * (box[3] - box[1])
+            crops.append(encode_image_part(image.crop(box), settings))
+    return crops, covered / max(1, width * height)
+
+
+def encode_image_part(image: Any, settings: Any | None = None) -> PreparedImage:
+    """
+    Encode a crop or frame of a larger image for a multi-image LLM call, with
+    `settings` when preprocessing is enabled, as PNG otherwise.
+    """
+    if settings is not None and getattr(settings, "enabled", False):
+        data, mime_type = _encode(image, settings)
+    else:
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        data, mime_type = buffer.getvalue(), "image/png"
+    return PreparedImage(
+        data=data, mime_type=mime_type, original_bytes=0, preprocessed=True
+    )
+
+
+def _encode(image: Any, settings: Any) -> Tuple[bytes, str]:
+    from PIL import Image
+
+    image_format = (settings.image_format or "jpeg").lower()
+    if image_format not in IMAGE_FORMATS:
+        image_format = "jpeg"
+
+    max_edge = settings.max_edge
+    if max_edge and max(image.size) > max_edge:
+        image = image.copy()
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    if settings.grayscale:
+        image = image.convert("L")
+    elif image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    buffer = io.BytesIO()
+    if image_format == "png":
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        image.save(buffer, format=image_format.upper(), quality=settings.quality)
+    return buffer.getvalue(), IMAGE_FORMATS[image_format]
+
+
+__all__ = [
+    "IMAGE_FORMATS",
+    "PreparedImage",
+    "crop_regions_for_llm",
+    "encode_image_part",
+    "prepare_image_for_llm",
+]
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import json
 import re
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
@@ -12,8 +14,13 @@ from ..config.detection import (
     LOW_RISK_FIELDS,
     MEDIUM_RISK_FIELDS,
     LLM_DETECTOR_PROMPT,
+    LLM_DETECTOR_SPANS_PROMPT,
 )
+from ..utils.exceptions import ProviderUnavailableError
+from .resilience import get_provider_guard
+from .spans import reconstruct_fields, render_spans, segment_text
 from .utils import (
+    build_call_usage,
     build_chat_litellm,
     coerce_litellm_content_to_text,
 )
@@ -48,6 +55,28 @@ def _inject_sensitive_fields(template: str) -> str:
     return template.replace("{sensitive_fields}", block)
 
 
+@lru_cache(maxsize=16)
+def _load_system_prompt(prompt_path: str) -> str:
+    """Read a prompt template once and inject the sensitive fields block."""
+    path = Path(prompt_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Prompt file not found: {path}")
+    template = path.read_text(encoding="utf-8").replace("\r\n", "\n").strip()
+    return _inject_sensitive_fields(template)
+
+
+def supports_cache_control(provider: str, model: str) -> bool:
+    """Whether the provider accepts explicit `cache_control` content blocks."""
+    provider = (provider or "").lower()
+    if provider == "anthropic":
+        return True
+    # Claude models served through other gateways use the same block format
+    return provider in ("bedrock", "vertex_ai") and "claude" in (model or "").lower()
+
+
+OUTPUT_FORMATS = ("values", "spans")
+
+
 class LiteLLMDetector:
     def __init__(
         self,
@@ -57,9 +86,22 @@ class LiteLLMDetector:
         client_params: Dict[str, Any],
         prompt_dir: str | Path | None = None,
         llm: Any | None = None,
+        resilience: Any | None = None,
+        output_format: str = "values",
+        prompt_cache: bool = True,
     ) -> None:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported LLM output format: {output_format}")
         self._provider = provider
         self._model = model
+        # "spans": the model returns word offsets and values are rebuilt locally
+        self._output_format = output_format
+        # Mark the static system prompt cacheable where the provider needs a hint;
+        # OpenAI-style providers cache the stable system-first prefix automatically
+        self._cache_hint = prompt_cache and supports_cache_control(provider, model)
+        self._guard = get_provider_guard(
+            provider, client_params, resilience, model=model
+        )
 
         # Set up prompt directory - default to the prompts folder
         if prompt_dir:
@@ -88,47 +130,89 @@ class LiteLLMDetector:
     def __call__(self, text: str):
         try:
             system_prompt, user_prompt, prompt_info = self._build_prompt(text)
+            started = time.perf_counter()
+            retries = 0
             try:
-                content = self._invoke(system_prompt, user_prompt, json_mode=True)
+                response = self._invoke(system_prompt, user_prompt, json_mode=True)
+            except ProviderUnavailableError:
+                raise
             except Exception:
-                content = self._invoke(system_prompt, user_prompt, json_mode=False)
-
-            result = safe_json_from_text(content) or {"detected_fields": []}
-            if "detected_fields" not in result or not isinstance(
-                result["detected_fields"], list
-            ):
-                result["detected_fields"] = []
-            result["_prompt_source"] = prompt_info
-            result["_model_used"] = self._model
-            result["_provider"] = self._provider
-            return result
+                retries = 1
+                response = self._invoke(system_prompt, user_prompt, json_mode=False)
+
+            return self._parse_result(
+                response,
+                text,
+                prompt_info,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                retries=retries,
+            )
+        except ProviderUnavailableError:
+            raise
         except Exception as exc:
             return {"detected_fields": [], "risk_level": "unknown", "_error": str(exc)}
 
     async def acall(self, text: str):
         try:
             system_prompt, user_prompt, prompt_info = self._build_prompt(text)
+            started = time.perf_counter()
+            retries = 0
             try:
-                content = await self._ainvoke(
+                response = await self._ainvoke(
                     system_prompt, user_prompt, json_mode=True
                 )
+            except ProviderUnavailableError:
+                raise
             except Exception:
-                content = await self._ainvoke(
+                retries = 1
+                response = await self._ainvoke(
                     system_prompt, user_prompt, json_mode=False
                 )
 
-            result = safe_json_from_text(content) or {"detected_fields": []}
-            if "detected_fields" not in result or not isinstance(
-                result["detected_fields"], list
-            ):
-                result["detected_fields"] = []
-            result["_prompt_source"] = prompt_info
-            result["_model_used"] = self._model
-            result["_provider"] = self._provider
-            return result
+            return self._parse_result(
+                response,
+                text,
+                prompt_info,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                retries=retries,
+            )
+        except ProviderUnavailableError:
+            raise
         except Exception as exc:
             return {"detected_fields": [], "risk_level": "unknown", "_error": str(exc)}
 
+    def _parse_result(
+        self,
+        response: Any,
+        text: str,
+        prompt_info: str,
+        *,
+        latency_ms: float = 0.0,
+        retries: int = 0,
+    ) -> dict:
+        content = coerce_litellm_content_to_text(response)
+        result = safe_json_from_text(content) or {"detected_fields": []}
+        if self._output_format == "spans" and "detected_fields" not in result:
+            result["detected_fields"] = reconstruct_fields(
+                result, text, segment_text(text)
+            )
+            result.pop("spans", None)
+        if "detected_fields" not in result or not isinstance(
+            result["detected_fields"], list
+        ):
+            result["detected_fields"] = []
+        result["_prompt_source"] = prompt_info
+        result["_model_used"] = self._model
+        result["_provider"] = self._provider
+        result["_usage"] = build_call_usage(
+            response,
+            provider=self._provider,
+            model=self._model,
+            latency_ms=latency_ms,
+            retries=retries,
+        )
+        return result
+
     def _build_prompt(
         self,
         text: str,
@@ -138,38 +222,49 @@ class LiteLLMDetector:
 
         Returns (system_prompt, user_prompt, prompt_info)
         """
-        # Load the prompt template from file
-        prompt_path = self._prompt_dir / LLM_DETECTOR_PROMPT
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"Prompt file not found: {prompt_path}")
-
-        template = prompt_path.read_text(encoding="utf-8").replace("\r\n", "\n").strip()
-
-        template = _inject_sensitive_fields(template)
+        prompt_name = (
+            LLM_DETECTOR_SPANS_PROMPT
+            if self._output_format == "spans"
+            else LLM_DETECTOR_PROMPT
+        )
+        # system: instructions + sensitive fields. Loaded once and byte-identical
+        # across calls so providers can reuse their cached prefix
+        system_prompt = _load_system_prompt(str(self._prompt_dir / prompt_name))
+        # user: raw text only, or numbered word spans in "spans" mode
+        if self._output_format == "spans":
+            user_prompt = render_spans(text, segment_text(text))
+        else:
+            user_prompt = text
 
-        # system: instructions + sensitive fields
-        system_prompt = template
-        # user: raw text only
-        user_prompt = text
+        return system_prompt, user_prompt, f"prompts/{prompt_name}"
 
-        return system_prompt, user_prompt, f"prompts/{LLM_DETECTOR_PROMPT}"
+    def _build_messages(self, system_prompt: str, user_prompt: str) -> list:
+        if self._cache_hint:
+            system_message = SystemMessage(
+                content=[
+                    {
+                        "type": "text",
+                        "text": system_prompt,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
+            )
+        else:
+            system_message = SystemMessage(content=system_prompt)
+        return [system_message, HumanMessage(content=user_prompt)]
 
-    def _invoke(self, system_prompt: str, user_prompt: str, *, json_mode: bool) -> str:
+    def _invoke(self, system_prompt: str, user_prompt: str, *, json_mode: bool) -> Any:
         model = self._json_llm if json_mode and self._json_llm else self._llm
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt),
-        ]
-        response = model.invoke(messages)
-        return coerce_litellm_content_to_text(response)
+        messages = self._build_messages(system_prompt, user_prompt)
+        # A rejected json_mode call is retried plain; only that one counts
+        with self._guard.slot(record_failure=not json_mode):
+            return model.invoke(messages)
 
     async def _ainvoke(
         self, system_prompt: str, user_prompt: str, *, json_mode: bool
-    ) -> str:
+    ) -> Any:
         model = self._json_llm if json_mode and self._json_llm else self._llm
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt),
-        ]
-        response = await model.ainvoke(messages)
-        return coerce_litellm_content_to_text(response)
+        messages = self._build_messages(system_prompt, user_prompt)
+        # A rejected json_mode call is retried plain; only that one counts
+        async with self._guard.async_slot(record_failure=not json_mode):
+            return await model.ainvoke(messages)
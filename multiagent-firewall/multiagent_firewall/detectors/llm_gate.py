@@ -0,0 +1,242 @@
+"""
+Learned "needs LLM" gate.
+
+A hashed n-gram logistic regression that predicts whether the LLM detector is
+likely to add findings beyond DLP/NER. It is pure Python, works on a bounded
+prefix of the text and keeps inference well under a millisecond, so skipping
+the LLM call for predicted-benign prompts is pure savings.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+MODEL_VERSION = 1
+DEFAULT_DIM = 1 << 18
+MAX_GATE_CHARS = 2048
+
+_token_re = re.compile(r"\w+", re.UNICODE)
+
+
+def _shape(token: str) -> str:
+    """Collapse a token to its character-class shape (e.g. 'ab12' -> 'aa00')."""
+    out = []
+    for ch in token[:12]:
+        if ch.isdigit():
+            out.append("0")
+        elif ch.isupper():
+            out.append("A")
+        elif ch.isalpha():
+            out.append("a")
+        else:
+            out.append("_")
+    return "".join(out)
+
+
+def featurize(text: str, dim: int = DEFAULT_DIM) -> List[int]:
+    """Hash word unigrams, bigrams and token shapes of the text prefix into buckets."""
+    mask = dim - 1
+    tokens = _token_re.findall(text[:MAX_GATE_CHARS])
+    buckets: set[int] = set()
+    previous = ""
+    for token in tokens:
+        lowered = token.lower()
+        buckets.add(zlib.crc32(b"u:" + lowered.encode("utf-8")) & mask)
+        buckets.add(zlib.crc32(b"s:" + _shape(token).encode("utf-8")) & mask)
+        if previous:
+            bigram = f"b:{previous} {lowered}".encode("utf-8")
+            buckets.add(zlib.crc32(bigram) & mask)
+        previous = lowered
+    return list(buckets)
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    ez = math.exp(z)
+    return ez / (1.0 + ez)
+
+
+class LLMGateModel:
+    """Sparse logistic regression over hashed features."""
+
+    def __init__(
+        self,
+        *,
+        weights: Mapping[int, float],
+        bias: float,
+        dim: int = DEFAULT_DIM,
+        recall_quantiles: Sequence[float] = (),
+    ) -> None:
+        if dim & (dim - 1):
+            raise ValueError("Gate feature dimension must be a power of two")
+        self.weights: Dict[int, float] = dict(weights)
+        self.bias = bias
+        self.dim = dim
+        # recall_quantiles[i] is the score at the i-th percentile of positives
+        self.recall_quantiles = list(recall_quantiles)
+
+    def predict_proba(self, text: str) -> float:
+        """Probability that the LLM would add findings beyond DLP/NER."""
+        z = self.bias
+        weights = self.weights
+        for bucket in featurize(text, self.dim):
+            z += weights.get(bucket, 0.0)
+        return _sigmoid(z)
+
+    def threshold_for_recall(self, recall_target: float) -> float:
+        """
+        Score threshold that keeps at least `recall_target` of LLM-positive texts.
+
+        Texts scoring below the threshold may skip the LLM.
+        """
+        if not self.recall_quantiles:
+            return 0.0
+        target = min(max(recall_target, 0.0), 1.0)
+        index = int(math.floor((1.0 - target) * (len(self.recall_quantiles) - 1)))
+        return self.recall_quantiles[max(0, index)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": MODEL_VERSION,
+            "dim": self.dim,
+            "bias": self.bias,
+            "weights": {str(k): round(v, 6) for k, v in self.weights.items() if v},
+            "recall_quantiles": self.recall_quantiles,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "LLMGateModel":
+        if data.get("version") != MODEL_VERSION:
+            raise ValueError(f"Unsupported LLM gate model version: {data.get('version')}")
+        return cls(
+            weights={int(k): float(v) for k, v in (data.get("weights") or {}).items()},
+            bias=float(data.get("bias") or 0.0),
+            dim=int(data.get("dim") or DEFAULT_DIM),
+            recall_quantiles=[float(q) for q in data.get("recall_quantiles") or []],
+        )
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+
+@lru_cache(maxsize=4)
+def load_llm_gate(path: str) -> LLMGateModel:
+    """Load (and cache) a gate model from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        return LLMGateModel.from_dict(json.load(f))
+
+
+def _signatures(fields: Iterable[Any]) -> set[Tuple[str, str]]:
+    seen = set()
+    for item in fields or []:
+        if not isinstance(item, Mapping):
+            continue
+        field = str(item.get("field") or "").strip().lower()
+        value = str(item.get("value") or "").strip().lower()
+        if field or value:
+            seen.add((field, value))
+    return seen
+
+
+def label_from_state(state: Mapping[str, Any]) -> bool | None:
+    """
+    Label a recorded GuardState: True if the LLM added findings beyond DLP/NER.
+
+    Returns None when the LLM detector did not run for that state.
+    """
+    if "llm_fields" not in state:
+        return None
+    pre_llm = _signatures(state.get("dlp_fields") or []) | _signatures(
+        state.get("ner_fields") or []
+    )
+    return bool(_signatures(state.get("llm_fields") or []) - pre_llm)
+
+
+def examples_from_states(
+    states: Iterable[Mapping[str, Any]],
+) -> List[Tuple[str, bool]]:
+    """Turn recorded GuardState outcomes into (text, label) training examples."""
+    examples = []
+    for state in states:
+        label = label_from_state(state)
+        text = state.get("normalized_text") or state.get("raw_text") or ""
+        if label is None or not text:
+            continue
+        examples.append((text, label))
+    return examples
+
+
+def train_llm_gate(
+    examples: Sequence[Tuple[str, bool]],
+    *,
+    dim: int = DEFAULT_DIM,
+    epochs: int = 8,
+    learning_rate: float = 0.2,
+    l2: float = 1e-6,
+    seed: int = 13,
+    calibration: Sequence[Tuple[str, bool]] | None = None,
+) -> LLMGateModel:
+    """
+    Train the gate with SGD on balanced logistic loss.
+
+    Recall thresholds are calibrated on `calibration` examples when given
+    (recommended: a held-out split), otherwise on the training set.
+    """
+    if not examples:
+        raise ValueError("No training examples")
+    featurized = [(featurize(text, dim), bool(label)) for text, label in examples]
+    positives = sum(1 for _, label in featurized if label)
+    negatives = len(featurized) - positives
+    # Balance classes so that rare positives are not drowned out
+    pos_weight = len(featurized) / (2.0 * positives) if positives else 1.0
+    neg_weight = len(featurized) / (2.0 * negatives) if negatives else 1.0
+
+    weights: Dict[int, float] = {}
+    bias = 0.0
+    rng = random.Random(seed)
+    order = list(range(len(featurized)))
+    for epoch in range(epochs):
+        rng.shuffle(order)
+        lr = learning_rate / (1.0 + epoch)
+        for index in order:
+            buckets, label = featurized[index]
+            z = bias + sum(weights.get(b, 0.0) for b in buckets)
+            gradient = _sigmoid(z) - (1.0 if label else 0.0)
+            gradient *= pos_weight if label else neg_weight
+            bias -= lr * gradient
+            for bucket in buckets:
+                current = weights.get(bucket, 0.0)
+                weights[bucket] = current - lr * (gradient + l2 * current)
+
+    model = LLMGateModel(weights=weights, bias=bias, dim=dim)
+    calibration_positives = [
+        text for text, label in (calibration or examples) if label
+    ]
+    positive_scores = sorted(model.predict_proba(t) for t in calibration_positives)
+    model.recall_quantiles = _percentiles(positive_scores)
+    return model
+
+
+def _percentiles(sorted_scores: Sequence[float]) -> List[float]:
+    if not sorted_scores:
+        return []
+    last = len(sorted_scores) - 1
+    return [sorted_scores[int(round(i * last / 100))] for i in range(101)]
+
+
+__all__ = [
+    "LLMGateModel",
+    "examples_from_states",
+    "featurize",
+    "label_from_state",
+    "load_llm_gate",
+    "train_llm_gate",
+]
@@ -1,18 +1,55 @@
 from __future__ import annotations
 
+import asyncio
+import base64
 import os
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, List, Sequence
 
-from ..config.detection import OCR_DETECTOR_PROMPT
+from ..config.detection import OCR_DETECTOR_PROMPT, OCR_REGIONS_PROMPT
 
 from ..types import GuardState
+from ..utils.exceptions import ProviderUnavailableError
+from .image_preprocess import (
+    PreparedImage,
+    crop_regions_for_llm,
+    prepare_image_for_llm,
+)
+from .ocr_layout import OCRLayout, build_layout
+from .resilience import get_provider_guard
+from .tesseract_pool import OCR_BACKENDS, get_tesserocr_pool
 from .utils import (
+    build_call_usage,
     build_chat_litellm,
     coerce_litellm_content_to_text,
 )
 
 
+REGION_SEPARATOR = "<<<CROP>>>"
+
+
+def _load_prompt(filename: str) -> str:
+    prompt_path = Path(__file__).resolve().parent.parent / "prompts" / filename
+    if not prompt_path.exists():
+        raise FileNotFoundError(f"OCR prompt file not found: {prompt_path}")
+    return prompt_path.read_text(encoding="utf-8").replace("\r\n", "\n").strip()
+
+
+def _image_content(images: Sequence[PreparedImage]) -> List[Dict[str, Any]]:
+    """Base64-encode images as chat message content blocks."""
+    return [
+        {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:{image.mime_type};base64,"
+                + base64.b64encode(image.data).decode("utf-8")
+            },
+        }
+        for image in images
+    ]
+
+
 class TesseractOCRDetector:
     """OCR detector using Tesseract"""
 
@@ -23,16 +60,17 @@ class TesseractOCRDetector:
         config: str = "",
         confidence_threshold: int = 0,
         tesseract_cmd: str | None = None,
+        backend: str = "auto",
+        pool_size: int | None = None,
     ):
+        if backend not in OCR_BACKENDS:
+            raise ValueError(f"Unsupported OCR backend: {backend}")
         self.lang = lang
         self.config = config
         self.confidence_threshold = confidence_threshold
         self.tesseract_cmd = tesseract_cmd
-
-        if tesseract_cmd:
-            import pytesseract
-
-            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        self.backend = backend
+        self.pool_size = pool_size
 
     def __call__(self, state: GuardState) -> str:
         """
@@ -41,50 +79,54 @@ class TesseractOCRDetector:
         Returns:
             Extracted text as a plain string, or empty string if extraction fails.
         """
+        return self.analyze(state).text
+
+    def analyze(self, state: GuardState) -> OCRLayout:
+        """
+        Extract the text lines of an image file with their confidence and box.
+
+        Words below `confidence_threshold` are left out of each line's text.
+        """
         file_path = state.get("file_path")
 
         if not file_path:
-            return ""
+            return OCRLayout()
 
         if not os.path.exists(file_path):
-            return ""
+            return OCRLayout()
 
         try:
             import pytesseract
             from PIL import Image
             from ..config import FILE_TYPE_CONFIG
 
-            path = Path(file_path)
-
             # Get image config
             image_config = FILE_TYPE_CONFIG.categories.get("image")
             if not image_config:
-                return ""
+                return OCRLayout()
 
             image = Image.open(file_path)
 
-            ocr_data = pytesseract.image_to_data(
-                image,
-                lang=self.lang,
-                config=self.config,
-                output_type=pytesseract.Output.DICT,
-            )
-
-            text_parts = []
-
-            # Process each detected text element
-            n_boxes = len(ocr_data["text"])
-            for i in range(n_boxes):
-                text = ocr_data["text"][i].strip()
-                conf = int(ocr_data["conf"][i]) if ocr_data["conf"][i] != "-1" else 0
-
-                # Skip empty text or low confidence
-                if not text or conf < self.confidence_threshold:
-                    continue
-
-                text_parts.append(text)
-
-            return " ".join(text_parts)
+            pool = None
+            if self.backend != "pytesseract":
+                pool = get_tesserocr_pool(self.lang, self.config, self.pool_size)
+                if pool is None and self.backend == "tesserocr":
+                    raise RuntimeError("tesserocr backend requested but unavailable")
+            if pool is not None:
+                ocr_data = pool.recognize_data(image)
+            else:
+                if self.tesseract_cmd:
+                    # Set per call, not in __init__: the detector is pickled
+                    # into pool workers, where __init__ does not run again
+                    pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
+                ocr_data = pytesseract.image_to_data(
+                    image,
+                    lang=self.lang,
+                    config=self.config,
+                    output_type=pytesseract.Output.DICT,
+                )
+
+            return build_layout(ocr_data, self.confidence_threshold)
 
         except Exception as e:
             raise RuntimeError(
@@ -101,76 +143,184 @@ class LLMOCRDetector:
         provider: str,
         model: str,
         client_params: dict[str, Any],
+        resilience: Any | None = None,
+        image_preprocess: Any | None = None,
     ):
         self.provider = provider
         self.model = model
-        prompt_path = (
-            Path(__file__).resolve().parent.parent / "prompts" / OCR_DETECTOR_PROMPT
-        )
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"OCR prompt file not found: {prompt_path}")
-        self._system_prompt = (
-            prompt_path.read_text(encoding="utf-8").replace("\r\n", "\n").strip()
+        self.image_preprocess = image_preprocess
+        self._guard = get_provider_guard(
+            provider, client_params, resilience, model=model
         )
+        self._system_prompt = _load_prompt(OCR_DETECTOR_PROMPT)
+        self._regions_prompt = _load_prompt(OCR_REGIONS_PROMPT)
 
         self._llm = build_chat_litellm(
             provider=self.provider, model=self.model, client_params=client_params
         )
 
-    def __call__(self, state: GuardState) -> str:
+    def __call__(
+        self, state: GuardState, usage: Dict[str, Any] | None = None
+    ) -> str:
         """
         Extract text from image file using vision-capable LLM.
 
+        When `usage` is given, it is filled with the call's tokens, cost,
+        latency and retries, plus the image bytes before and after
+        preprocessing.
+
         Returns:
             Extracted text as a plain string, or empty string if extraction fails.
         """
-        file_path = state.get("file_path")
+        try:
+            prepared = self._prepare(state)
+            if prepared is None:
+                return ""
+            message, image = prepared
+            started = time.perf_counter()
+            with self._guard.slot():
+                response = self._llm.invoke(message)
+            return self._finish(response, started, usage, image)
+        except ProviderUnavailableError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"LLM OCR failed to process image: {str(e)}") from e
 
-        if not file_path:
-            return ""
+    async def acall(
+        self, state: GuardState, usage: Dict[str, Any] | None = None
+    ) -> str:
+        """
+        Async variant of `__call__`; does not block the event loop. Decoding,
+        resizing and encoding the image run in a thread.
+        """
+        try:
+            prepared = await asyncio.to_thread(self._prepare, state)
+            if prepared is None:
+                return ""
+            message, image = prepared
+            started = time.perf_counter()
+            async with self._guard.async_slot():
+                response = await self._llm.ainvoke(message)
+            return self._finish(response, started, usage, image)
+        except ProviderUnavailableError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"LLM OCR failed to process image: {str(e)}") from e
 
-        if not os.path.exists(file_path):
-            return ""
+    async def acall_regions(
+        self,
+        file_path: str,
+        boxes: Sequence[Sequence[int]],
+        usage: Dict[str, Any] | None = None,
+    ) -> List[str]:
+        """
+        Extract text from several crops of one image in a single LLM call.
+
+        Returns one text per box, in order (see `acall_images`).
+        """
+        try:
+            crops, pixel_share = await asyncio.to_thread(
+                crop_regions_for_llm, file_path, boxes, self.image_preprocess
+            )
+        except Exception as e:
+            raise RuntimeError(f"LLM OCR failed to process regions: {str(e)}") from e
+        if not crops:
+            return [""] * len(boxes)
+        texts = await self.acall_images(
+            crops, original_bytes=os.path.getsize(file_path), usage=usage
+        )
+        if usage is not None:
+            usage["region_pixel_share"] = pixel_share
+        # Boxes entirely outside the image produce no crop
+        return texts + [""] * (len(boxes) - len(texts))
+
+    async def acall_images(
+        self,
+        images: Sequence[PreparedImage],
+        *,
+        original_bytes: int = 0,
+        usage: Dict[str, Any] | None = None,
+    ) -> List[str]:
+        """
+        Extract text from several images (crops or frames of one file) in a
+        single LLM call.
 
+        Returns one text per image, in order. If the response cannot be split
+        into one block per image, the whole response is attributed to the
+        first image.
+        """
         try:
-            import base64
-            import mimetypes
             from langchain_core.messages import HumanMessage, SystemMessage
-            from ..config import FILE_TYPE_CONFIG
 
-            # Get image config
-            image_config = FILE_TYPE_CONFIG.categories.get("image")
-            if not image_config:
-                return ""
+            content = await asyncio.to_thread(_image_content, images)
+            message = [
+                SystemMessage(content=self._regions_prompt),
+                HumanMessage(content=content),
+            ]
+            started = time.perf_counter()
+            async with self._guard.async_slot():
+                response = await self._llm.ainvoke(message)
+            sent = PreparedImage(
+                data=b"".join(image.data for image in images),
+                mime_type=images[0].mime_type,
+                original_bytes=original_bytes,
+            )
+            text = self._finish(response, started, usage, sent)
+        except ProviderUnavailableError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"LLM OCR failed to process images: {str(e)}") from e
 
-            mime_type, _ = mimetypes.guess_type(file_path)
+        blocks = [block.strip() for block in text.split(REGION_SEPARATOR)]
+        if len(blocks) != len(images):
+            return [text.replace(REGION_SEPARATOR, " ").strip()] + [""] * (
+                len(images) - 1
+            )
+        return blocks
 
-            # Default to image/jpeg if not recognized or not an image type
-            if not mime_type or not mime_type.startswith("image/"):
-                mime_type = "image/jpeg"
+    def _prepare(self, state: GuardState) -> tuple[list, PreparedImage] | None:
+        file_path = state.get("file_path")
 
-            with open(file_path, "rb") as f:
-                image_data = base64.b64encode(f.read()).decode("utf-8")
+        if not file_path:
+            return None
 
-            data_url = f"data:{mime_type};base64,{image_data}"
+        if not os.path.exists(file_path):
+            return None
 
-            message = [
-                SystemMessage(content=self._system_prompt),
-                HumanMessage(
-                    content=[
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": data_url},
-                        }
-                    ]
-                ),
-            ]
+        from langchain_core.messages import HumanMessage, SystemMessage
+        from ..config import FILE_TYPE_CONFIG
 
-            response = self._llm.invoke(message)
-            return coerce_litellm_content_to_text(response)
+        # Get image config
+        image_config = FILE_TYPE_CONFIG.categories.get("image")
+        if not image_config:
+            return None
 
-        except Exception as e:
-            raise RuntimeError(f"LLM OCR failed to process image: {str(e)}") from e
+        image = prepare_image_for_llm(file_path, self.image_preprocess)
+        message = [
+            SystemMessage(content=self._system_prompt),
+            HumanMessage(content=_image_content([image])),
+        ]
+        return message, image
+
+    def _finish(
+        self,
+        response: Any,
+        started: float,
+        usage: Dict[str, Any] | None,
+        image: PreparedImage,
+    ) -> str:
+        if usage is not None:
+            usage.update(
+                build_call_usage(
+                    response,
+                    provider=self.provider,
+                    model=self.model,
+                    latency_ms=(time.perf_counter() - started) * 1000,
+                )
+            )
+            usage["image_original_bytes"] = image.original_bytes
+            usage["image_sent_bytes"] = len(image.data)
+        return coerce_litellm_content_to_text(response)
 
 
 __all__ = ["TesseractOCRDetector", "LLMOCRDetector"]
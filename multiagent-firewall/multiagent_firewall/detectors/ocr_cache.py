@@ -0,0 +1,216 @@
+"""
+Content-addressed cache for OCR results.
+
+Chat clients re-send the whole history on every turn, so the same screenshot is
+OCRed again and again. Results are keyed by the SHA-256 of the image bytes plus
+the settings that affect the output (engine, language, model...), kept in an
+in-memory LRU and optionally persisted to a disk directory shared between
+processes. The disk tier holds the recognized text of user images in plain
+files, so it is bounded in size (least recently used entries are evicted
+first) and its directory should be private to the service.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_SIZE = 1 << 20
+_DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def ocr_cache_key(file_path: str, engine: str, settings: Mapping[str, Any]) -> str | None:
+    """Return the cache key for an image, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    digest.update(b"\0" + engine.encode("utf-8") + b"\0")
+    digest.update(json.dumps(dict(settings), sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class OCRResultCache:
+    """Thread-safe LRU of OCR texts with an optional size-bounded on-disk tier."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        cache_dir: str | None = None,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_bytes = max(1, max_bytes)
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bytes on disk as last scanned plus our own writes since
+        self._disk_size: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str | None) -> str | None:
+        if key is None:
+            return None
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+        text = self._read_disk(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, text)
+        return text
+
+    def set(self, key: str | None, text: str) -> None:
+        if key is None:
+            return
+        with self._lock:
+            self._store(key, text)
+        self._write_disk(key, text)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _store(self, key: str, text: str) -> None:
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def _read_disk(self, key: str) -> str | None:
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            text = path.read_text(encoding="utf-8")
+            # Mark as recently used for eviction
+            os.utime(path)
+            return text
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"OCR cache read failed: {e}")
+            return None
+
+    def _write_disk(self, key: str, text: str) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        data = text.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see partial files
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"OCR cache write failed: {e}")
+            return
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = self._scan_disk_size()
+            else:
+                self._disk_size += len(data)
+            if self._disk_size > self.max_bytes:
+                self._disk_size = self._evict_disk()
+
+    def _disk_entries(self) -> list[Path]:
+        if self.cache_dir is None:
+            return []
+        return list(self.cache_dir.glob("*/*.txt"))
+
+    def _scan_disk_size(self) -> int:
+        total = 0
+        for path in self._disk_entries():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict_disk(self) -> int:
+        """Delete least recently used files until the tier fits; return its size."""
+        # Rescan: other processes share the directory
+        entries = []
+        for path in self._disk_entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"OCR cache eviction failed: {e}")
+                continue
+            total -= size
+        return total
+
+
+_CACHES: Dict[Tuple[int, str | None, int], OCRResultCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_ocr_cache(settings: Any | None) -> OCRResultCache | None:
+    """
+    Return the process-wide cache for an `OCRCacheConfig`, or None if disabled.
+    """
+    if settings is None or not getattr(settings, "enabled", False):
+        return None
+    key = (settings.max_entries, settings.cache_dir, settings.max_bytes)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = OCRResultCache(*key)
+            _CACHES[key] = cache
+        return cache
+
+
+def reset_ocr_caches() -> None:
+    """Drop all in-memory caches (mainly for tests)."""
+    with _CACHES_LOCK:
+        _CACHES.clear()
+
+
+__all__ = [
+    "OCRResultCache",
+    "get_ocr_cache",
+    "ocr_cache_key",
+    "reset_ocr_caches",
+]
@@ -0,0 +1,143 @@
+"""
+Off-loop execution of Tesseract OCR and other CPU-bound extraction.
+
+OCR and PDF parsing are CPU-bound and would otherwise block the event loop for
+every other request on the worker. They are sent to a bounded, process-wide
+process pool so multi-file requests use several cores. Workers are spawned
+(not forked) because the parent process runs threads, and each worker keeps
+its own warm detector between calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Sequence, TypeVar
+
+from .ocr import TesseractOCRDetector
+from .ocr_layout import OCRLayout
+from .ocr_tiles import Strip, merge_strip_layouts, write_strips
+
+T = TypeVar("T")
+
+_EXECUTORS: Dict[int, ProcessPoolExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _ocr_in_worker(detector: TesseractOCRDetector, file_path: str) -> str:
+    return detector({"file_path": file_path}) or ""
+
+
+def _analyze_in_worker(detector: TesseractOCRDetector, file_path: str) -> OCRLayout:
+    return detector.analyze({"file_path": file_path})
+
+
+def get_ocr_executor(workers: int | None = None) -> ProcessPoolExecutor:
+    """Return the shared process pool with `workers` processes (CPU count if None)."""
+    size = max(1, workers or os.cpu_count() or 1)
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(size)
+        if executor is None:
+            executor = ProcessPoolExecutor(
+                max_workers=size, mp_context=multiprocessing.get_context("spawn")
+            )
+            _EXECUTORS[size] = executor
+        return executor
+
+
+async def run_in_process(
+    func: Callable[..., T], *args: Any, workers: int | None = None
+) -> T:
+    """Run a picklable top-level function in the shared worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_ocr_executor(workers), func, *args)
+
+
+async def run_ocr(
+    detector: Any,
+    file_path: str,
+    *,
+    use_processes: bool = True,
+    workers: int | None = None,
+) -> str:
+    """
+    Run `detector` on `file_path` without blocking the event loop.
+
+    Only the built-in Tesseract detector is shipped to worker processes;
+    injected detectors may hold unpicklable state and run in a thread instead.
+    """
+    if use_processes and isinstance(detector, TesseractOCRDetector):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_ocr_executor(workers), _ocr_in_worker, detector, file_path
+        )
+    return await asyncio.to_thread(lambda: detector({"file_path": file_path}) or "")
+
+
+async def analyze_ocr(
+    detector: TesseractOCRDetector,
+    file_path: str,
+    *,
+    use_processes: bool = True,
+    workers: int | None = None,
+) -> OCRLayout:
+    """Like `run_ocr`, but return the line layout with per-line confidences."""
+    if use_processes:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_ocr_executor(workers), _analyze_in_worker, detector, file_path
+        )
+    return await asyncio.to_thread(detector.analyze, {"file_path": file_path})
+
+
+async def analyze_tiled_ocr(
+    detector: TesseractOCRDetector,
+    file_path: str,
+    strips: Sequence[Strip],
+    *,
+    use_processes: bool = True,
+    workers: int | None = None,
+) -> OCRLayout:
+    """
+    OCR an image strip by strip and merge the strips' layouts.
+
+    Strips are written to temporary files so each worker only loads its own
+    strip, and all strips of the image are submitted to the pool at once.
+    """
+    with tempfile.TemporaryDirectory(prefix="ocr-strips-") as directory:
+        paths = await asyncio.to_thread(write_strips, file_path, strips, directory)
+        layouts = await asyncio.gather(
+            *(
+                analyze_ocr(
+                    detector, path, use_processes=use_processes, workers=workers
+                )
+                for path in paths
+            )
+        )
+    return merge_strip_layouts(layouts, strips)
+
+
+def shutdown_ocr_executors() -> None:
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_ocr_executors)
+
+
+__all__ = [
+    "analyze_ocr",
+    "analyze_tiled_ocr",
+    "get_ocr_executor",
+    "run_in_process",
+    "run_ocr",
+    "shutdown_ocr_executors",
+]
@@ -0,0 +1,194 @@
+"""
+Frame selection for multi-frame images (animated GIF/WebP, multi-page TIFF).
+
+Pillow opens such files on their first frame, so OCR used to miss everything
+after it. Frames are now decoded one at a time. In animations, near-identical
+frames are skipped by perceptual hash (dHash), so an animation that loops over
+the same few screens is only OCRed once per screen. Pages of a document (TIFF)
+are only skipped when pixel-identical: dense text pages that differ by a few
+digits have near-identical perceptual hashes. Documents keep up to
+`max_pages` pages; animations are first sampled with a policy:
+
+- "uniform": `max_frames` frames evenly spread over the animation
+- "all": every frame, until `max_frames` distinct frames are found
+- "first": only the first frame
+
+Selected frames are handed out in batches of `max_frames`, decoded as each
+batch is requested, so memory and temporary files stay bounded by one batch
+however many pages a document has.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Set, TypeVar
+
+T = TypeVar("T")
+
+from .image_preprocess import PreparedImage, encode_image_part
+
+FRAME_SAMPLING_POLICIES = ("uniform", "all", "first")
+
+# Formats whose frames are pages of a document rather than an animation
+PAGED_FORMATS = ("TIFF",)
+
+
+@dataclass
+class FrameSelection:
+    total: int = 0
+    paged: bool = False
+    indices: List[int] = field(default_factory=list)
+    duplicates: int = 0
+    truncated: bool = False
+
+    def as_dict(self) -> dict:
+        return {
+            "frames": self.total,
+            "ocr_frames": len(self.indices),
+            "duplicates": self.duplicates,
+            "truncated": self.truncated,
+        }
+
+
+def frame_count(file_path: str) -> int:
+    """Number of frames in an image (1 when single-frame or unreadable)."""
+    try:
+        from PIL import Image
+
+        with Image.open(file_path) as image:
+            return max(1, int(getattr(image, "n_frames", 1)))
+    except Exception:
+        return 1
+
+
+def dhash(image: Any, size: int = 16) -> int:
+    """Difference hash: compares neighbouring pixels of a tiny grayscale copy."""
+    from PIL import Image
+
+    small = image.convert("L").resize((size + 1, size), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def _candidate_indices(total: int, paged: bool, settings: Any) -> List[int]:
+    if paged:
+        return list(range(total))
+    sampling = getattr(settings, "frame_sampling", "uniform")
+    max_frames = max(1, getattr(settings, "max_frames", 16))
+    if sampling == "first":
+        return [0]
+    if sampling == "all" or total <= max_frames:
+        return list(range(total))
+    step = (total - 1) / (max_frames - 1) if max_frames > 1 else 0
+    return sorted({round(i * step) for i in range(max_frames)})
+
+
+def iter_frames(image: Any, settings: Any, selection: FrameSelection) -> Iterator[Any]:
+    """
+    Yield the distinct frames of an open image to OCR, one decoded frame at a
+    time, recording what was selected in `selection`.
+    """
+    selection.total = max(1, int(getattr(image, "n_frames", 1)))
+    selection.paged = (image.format or "").upper() in PAGED_FORMATS
+    limit = max(
+        1,
+        getattr(settings, "max_pages", 200)
+        if selection.paged
+        else getattr(settings, "max_frames", 16),
+    )
+    distance = getattr(settings, "frame_hash_distance", 6)
+    hashes: List[int] = []
+    digests: Set[bytes] = set()
+    for index in _candidate_indices(selection.total, selection.paged, settings):
+        if len(selection.indices) >= limit:
+            selection.truncated = True
+            return
+        image.seek(index)
+        frame = image.convert("RGB")
+        if selection.paged:
+            digest = hashlib.blake2b(frame.tobytes(), digest_size=16).digest()
+            duplicate = digest in digests
+            digests.add(digest)
+        else:
+            frame_hash = dhash(frame)
+            duplicate = any(
+                bin(frame_hash ^ seen).count("1") <= distance for seen in hashes
+            )
+            if not duplicate:
+                hashes.append(frame_hash)
+        if duplicate:
+            selection.duplicates += 1
+            continue
+        selection.indices.append(index)
+        yield frame
+
+
+def _frame_batches(
+    file_path: str,
+    settings: Any,
+    selection: FrameSelection,
+    convert: Callable[[Any, int], T],
+) -> Iterator[List[T]]:
+    from PIL import Image
+
+    batch_size = max(1, getattr(settings, "max_frames", 16))
+    batch: List[T] = []
+    with Image.open(file_path) as image:
+        for frame in iter_frames(image, settings, selection):
+            batch.append(convert(frame, len(selection.indices) - 1))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def write_frames(
+    file_path: str, directory: str, settings: Any, selection: FrameSelection
+) -> Iterator[List[str]]:
+    """
+    Write the selected frames of `file_path` as PNG files under `directory`,
+    yielding the paths of each batch as soon as it is written. The caller may
+    delete a batch's files before requesting the next one.
+    """
+
+    def save(frame: Any, number: int) -> str:
+        path = os.path.join(directory, f"frame-{number:04d}.png")
+        frame.save(path, format="PNG")
+        return path
+
+    return _frame_batches(file_path, settings, selection, save)
+
+
+def frames_for_llm(
+    file_path: str,
+    settings: Any,
+    selection: FrameSelection,
+    image_settings: Any | None = None,
+) -> Iterator[List[PreparedImage]]:
+    """Encode the selected frames of `file_path`, one LLM call's batch at a time."""
+    return _frame_batches(
+        file_path,
+        settings,
+        selection,
+        lambda frame, _: encode_image_part(frame, image_settings),
+    )
+
+
+__all__ = [
+    "FRAME_SAMPLING_POLICIES",
+    "FrameSelection",
+    "dhash",
+    "frame_count",
+    "frames_for_llm",
+    "iter_frames",
+    "write_frames",
+]
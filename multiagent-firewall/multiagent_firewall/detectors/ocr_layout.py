@@ -0,0 +1,209 @@
+"""
+Line layout of a Tesseract result and planning of low-confidence regions.
+
+Tesseract often reads most of an image fine and only struggles with a few lines
+(small print, stylised fonts, handwriting). Instead of sending the whole image
+to the vision LLM, the low-confidence lines are grouped into a few regions that
+are cropped and re-read by the LLM, and the LLM text is merged back in reading
+order.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+Box = Tuple[int, int, int, int]  # left, top, right, bottom
+
+
+@dataclass(frozen=True)
+class OCRLine:
+    text: str  # words at or above the detector's confidence threshold
+    confidence: float  # mean word confidence (0-100)
+    box: Box
+
+
+@dataclass(frozen=True)
+class OCRLayout:
+    lines: List[OCRLine] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return " ".join(line.text for line in self.lines if line.text)
+
+
+@dataclass(frozen=True)
+class OCRRegion:
+    box: Box
+    line_indices: Tuple[int, ...]
+
+
+def build_layout(
+    data: Mapping[str, Sequence[Any]], confidence_threshold: float = 0
+) -> OCRLayout:
+    """
+    Group word-level OCR data (pytesseract `image_to_data` dict format) into
+    lines in reading order.
+    """
+    grouped: Dict[Tuple[Any, Any, Any], Dict[str, Any]] = {}
+    for i, raw_text in enumerate(data.get("text", [])):
+        text = str(raw_text).strip()
+        if not text:
+            continue
+        # Tesseract reports -1 for non-word entries
+        conf = max(0.0, _confidence(data["conf"][i]))
+        key = (
+            _field(data, "block_num", i),
+            _field(data, "par_num", i),
+            _field(data, "line_num", i),
+        )
+        line = grouped.setdefault(key, {"words": [], "confs": [], "boxes": []})
+        if conf >= confidence_threshold:
+            line["words"].append(text)
+        line["confs"].append(conf)
+        left, top = int(_field(data, "left", i)), int(_field(data, "top", i))
+        line["boxes"].append(
+            (
+                left,
+                top,
+                left + int(_field(data, "width", i)),
+                top + int(_field(data, "height", i)),
+            )
+        )
+
+    lines = [
+        OCRLine(
+            text=" ".join(line["words"]),
+            confidence=sum(line["confs"]) / len(line["confs"]),
+            box=_union(line["boxes"]),
+        )
+        for line in grouped.values()
+    ]
+    return OCRLayout(lines=lines)
+
+
+def plan_regions(
+    layout: OCRLayout,
+    *,
+    min_confidence: float,
+    max_regions: int,
+    padding: int = 8,
+) -> List[OCRRegion] | None:
+    """
+    Group consecutive low-confidence lines into regions.
+
+    Returns [] when every line is confident, and None when region fallback is
+    not worthwhile (no readable lines or too many regions), in which case the
+    whole image should go to the LLM.
+    """
+    if not layout.lines:
+        return None
+    regions: List[List[int]] = []
+    for index, line in enumerate(layout.lines):
+        if line.confidence >= min_confidence:
+            continue
+        if regions and regions[-1][-1] == index - 1:
+            regions[-1].append(index)
+        else:
+            regions.append([index])
+    if not regions:
+        return []
+    if len(regions) > max_regions or all(
+        line.confidence < min_confidence for line in layout.lines
+    ):
+        return None
+    return [
+        OCRRegion(
+            box=_pad(_union([layout.lines[i].box for i in indices]), padding),
+            line_indices=tuple(indices),
+        )
+        for indices in regions
+    ]
+
+
+def merge_region_text(
+    layout: OCRLayout, regions: Sequence[OCRRegion], region_texts: Sequence[str]
+) -> str:
+    """
+    Replace the lines of each region with its LLM text, keeping reading order.
+    Regions the LLM returned no text for keep Tesseract's lines.
+    """
+    replaced: Dict[int, str] = {}
+    skipped: set[int] = set()
+    for region, text in zip(regions, region_texts):
+        if not text or not text.strip():
+            continue
+        first, *rest = region.line_indices
+        replaced[first] = text.strip()
+        skipped.update(rest)
+    parts = []
+    for index, line in enumerate(layout.lines):
+        if index in skipped:
+            continue
+        text = replaced.get(index, line.text)
+        if text:
+            parts.append(text)
+    return " ".join(parts)
+
+
+def layout_to_dict(layout: OCRLayout) -> List[Dict[str, Any]]:
+    return [
+        {"text": line.text, "confidence": line.confidence, "box": list(line.box)}
+        for line in layout.lines
+    ]
+
+
+def layout_from_dict(lines: Sequence[Mapping[str, Any]]) -> OCRLayout:
+    return OCRLayout(
+        lines=[
+            OCRLine(
+                text=line["text"],
+                confidence=float(line["confidence"]),
+                box=tuple(line["box"]),  # type: ignore[arg-type]
+            )
+            for line in lines
+        ]
+    )
+
+
+def _confidence(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return -1.0
+
+
+def _field(data: Mapping[str, Sequence[Any]], name: str, index: int) -> Any:
+    values = data.get(name)
+    return values[index] if values is not None and index < len(values) else 0
+
+
+def _union(boxes: Sequence[Box]) -> Box:
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    )
+
+
+def _pad(box: Box, padding: int) -> Box:
+    left, top, right, bottom = box
+    return (
+        max(0, left - padding),
+        max(0, top - padding),
+        right + padding,
+        bottom + padding,
+    )
+
+
+__all__ = [
+    "OCRLayout",
+    "OCRLine",
+    "OCRRegion",
+    "build_layout",
+    "layout_from_dict",
+    "layout_to_dict",
+    "merge_region_text",
+    "plan_regions",
+]
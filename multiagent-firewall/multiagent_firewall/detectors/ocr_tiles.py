@@ -0,0 +1,122 @@
+"""
+Tiling of very tall images for OCR.
+
+Scrolling screenshots and high-DPI scans are split into overlapping full-width
+strips. Each strip is recognized on its own, so Tesseract's memory is bounded
+per strip and the strips of one image spread across the OCR worker pool.
+Strips are horizontal so text lines are never cut lengthwise; the overlap is
+taller than a text line so every line appears whole in at least one strip.
+
+Each strip owns the part of the image from the middle of its overlap with the
+previous strip to the middle of its overlap with the next one. A line is kept
+only from the strip that owns its vertical centre, which drops the duplicate
+(or partial) copies read in the overlaps.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import List, Sequence, Tuple
+
+from .ocr_layout import OCRLayout, OCRLine
+
+Strip = Tuple[int, int]  # top, bottom
+
+
+def image_size(file_path: str) -> Tuple[int, int] | None:
+    """Return (width, height) from the image header, or None if unreadable."""
+    try:
+        from PIL import Image
+
+        with Image.open(file_path) as image:
+            width, height = image.size
+            # EXIF orientations 5-8 are rotated by 90 degrees
+            if image.getexif().get(0x0112) in (5, 6, 7, 8):
+                return height, width
+            return width, height
+    except Exception:
+        return None
+
+
+def plan_strips(height: int, tile_height: int, overlap: int) -> List[Strip]:
+    """
+    Split `height` pixels into strips of at most `tile_height` that overlap by
+    `overlap` pixels. Returns a single strip when no tiling is needed.
+    """
+    tile_height = max(1, tile_height)
+    overlap = max(0, min(overlap, tile_height // 2))
+    if height <= tile_height:
+        return [(0, height)]
+    step = tile_height - overlap
+    strips: List[Strip] = []
+    top = 0
+    while True:
+        bottom = min(height, top + tile_height)
+        strips.append((top, bottom))
+        if bottom >= height:
+            return strips
+        top += step
+
+
+def write_strips(file_path: str, strips: Sequence[Strip], directory: str) -> List[str]:
+    """Crop `strips` out of the image into PNG files under `directory`."""
+    from PIL import Image, ImageOps
+
+    paths = []
+    with Image.open(file_path) as source:
+        image = ImageOps.exif_transpose(source)
+        width = image.size[0]
+        for index, (top, bottom) in enumerate(strips):
+            path = os.path.join(directory, f"strip-{index:04d}.png")
+            image.crop((0, top, width, bottom)).save(path, format="PNG")
+            paths.append(path)
+    return paths
+
+
+def merge_strip_layouts(
+    layouts: Sequence[OCRLayout], strips: Sequence[Strip]
+) -> OCRLayout:
+    """Combine per-strip layouts into one, in image coordinates, without duplicates."""
+    lines: List[OCRLine] = []
+    for index, (layout, (top, bottom)) in enumerate(zip(layouts, strips)):
+        own_top = (top + strips[index - 1][1]) / 2 if index > 0 else float("-inf")
+        own_bottom = (
+            (strips[index + 1][0] + bottom) / 2
+            if index + 1 < len(strips)
+            else float("inf")
+        )
+        for line in layout.lines:
+            left, line_top, right, line_bottom = line.box
+            box = (left, line_top + top, right, line_bottom + top)
+            centre = (box[1] + box[3]) / 2
+            if own_top <= centre < own_bottom:
+                lines.append(
+                    OCRLine(text=line.text, confidence=line.confidence, box=box)
+                )
+    return OCRLayout(lines=lines)
+
+
+def merge_overlapping_texts(texts: Sequence[str], max_overlap_words: int = 60) -> str:
+    """
+    Join texts read from consecutive overlapping strips, dropping the words
+    repeated at the start of a strip that ended the previous one.
+    """
+    words: List[str] = []
+    for text in texts:
+        next_words = text.split()
+        limit = min(len(words), len(next_words), max_overlap_words)
+        for size in range(limit, 0, -1):
+            if words[-size:] == next_words[:size]:
+                next_words = next_words[size:]
+                break
+        words.extend(next_words)
+    return " ".join(words)
+
+
+__all__ = [
+    "image_size",
+    "merge_overlapping_texts",
+    "merge_strip_layouts",
+    "plan_strips",
+    "write_strips",
+]
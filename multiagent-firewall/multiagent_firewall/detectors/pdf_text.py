@@ -0,0 +1,262 @@
+"""
+Page-parallel PDF text extraction.
+
+Pages are split into contiguous ranges that are extracted independently, in
+the worker process pool for large files, and page texts are yielded in page
+order as soon as their range is done. Opening a document costs time linear in
+its page count, so there is one range per worker rather than many small ones.
+Two backends are supported:
+
+- "pdfplumber": layout-aware and the historical default
+- "pypdfium2": PDFium's text layer, several times faster on large documents
+
+"auto" picks pypdfium2 when it is installed and pdfplumber otherwise.
+
+Pages without a text layer report how much of the page their images cover, so
+scanned pages can be told apart from blank ones and rendered for OCR.
+
+PDFium is not thread-safe: every pypdfium2 call in a process holds
+`PDFIUM_LOCK`, so ranges extracted or rendered in threads run one at a time.
+Worker processes each have their own PDFium and still run in parallel.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import math
+import os
+import threading
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Sequence
+
+from .ocr_executor import run_in_process
+
+PDF_BACKENDS = ("auto", "pdfplumber", "pypdfium2")
+
+# Serializes all PDFium use in this process
+PDFIUM_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PDFPage:
+    index: int
+    text: str
+    # Share of the page covered by images, only measured for pages without text
+    image_coverage: float = 0.0
+
+    def is_scanned(self, min_image_coverage: float) -> bool:
+        return not self.text.strip() and self.image_coverage >= min_image_coverage
+
+
+def resolve_pdf_backend(backend: str) -> str:
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unsupported PDF backend: {backend}")
+    if backend == "auto":
+        if importlib.util.find_spec("pypdfium2") is not None:
+            return "pypdfium2"
+        return "pdfplumber"
+    return backend
+
+
+def pdf_page_count(file_path: str, backend: str = "pdfplumber") -> int:
+    if resolve_pdf_backend(backend) == "pypdfium2":
+        import pypdfium2
+
+        with PDFIUM_LOCK:
+            pdf = pypdfium2.PdfDocument(file_path)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_page_range(
+    file_path: str,
+    start: int,
+    end: int,
+    backend: str = "pdfplumber",
+    measure_images: bool = True,
+) -> List[PDFPage]:
+    """Extract pages [start, end); pages without text give an empty text."""
+    if resolve_pdf_backend(backend) == "pypdfium2":
+        return _pdfium_page_range(file_path, start, end, measure_images)
+
+    import pdfplumber
+
+    # Only the range's pages are built; pdfplumber numbers pages from 1
+    options = {"pages": list(range(start + 1, end + 1))} if start else {}
+    with pdfplumber.open(file_path, **options) as pdf:
+        pages = []
+        for index, page in enumerate(pdf.pages[: end - start], start=start):
+            text = page.extract_text() or ""
+            coverage = 0.0
+            if not text.strip() and measure_images:
+                coverage = _coverage(
+                    [(i["x0"], i["top"], i["x1"], i["bottom"]) for i in page.images],
+                    page.width,
+                    page.height,
+                )
+            pages.append(PDFPage(index, text, coverage))
+            # Drop the parsed layout so memory stays bounded per page
+            page.close()
+        return pages
+
+
+def _pdfium_page_range(
+    file_path: str, start: int, end: int, measure_images: bool
+) -> List[PDFPage]:
+    import pypdfium2
+    import pypdfium2.raw as pdfium_c
+
+    pages = []
+    with PDFIUM_LOCK:
+        pdf = pypdfium2.PdfDocument(file_path)
+        try:
+            for index in range(start, min(end, len(pdf))):
+                page = pdf[index]
+                try:
+                    textpage = page.get_textpage()
+                    try:
+                        text = textpage.get_text_range().replace("\r\n", "\n").strip()
+                    finally:
+                        textpage.close()
+                    coverage = 0.0
+                    if not text and measure_images:
+                        width, height = page.get_size()
+                        boxes = [
+                            _object_bounds(obj)
+                            for obj in page.get_objects(
+                                filter=[pdfium_c.FPDF_PAGEOBJ_IMAGE]
+                            )
+                        ]
+                        coverage = _coverage(boxes, width, height)
+                finally:
+                    page.close()
+                pages.append(PDFPage(index, text, coverage))
+        finally:
+            pdf.close()
+    return pages
+
+
+def _object_bounds(obj) -> Sequence[float]:
+    # left, bottom, right, top; `get_pos` was renamed in pypdfium2 5
+    get_bounds = getattr(obj, "get_bounds", None) or obj.get_pos
+    return get_bounds()
+
+
+def _coverage(boxes: Sequence[Sequence[float]], width: float, height: float) -> float:
+    """Share of the page area covered by boxes (overlaps counted once per box)."""
+    area = 0.0
+    for x0, y0, x1, y1 in boxes:
+        w = min(max(x0, x1), width) - max(min(x0, x1), 0)
+        h = min(max(y0, y1), height) - max(min(y0, y1), 0)
+        if w > 0 and h > 0:
+            area += w * h
+    return min(1.0, area / max(1e-9, width * height))
+
+
+def render_pdf_pages(
+    file_path: str, indices: Sequence[int], directory: str, dpi: int = 200
+) -> List[str]:
+    """Render the given pages to PNG files under `directory` (needs pypdfium2)."""
+    import pypdfium2
+
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    with PDFIUM_LOCK:
+        pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        paths = []
+        for index in indices:
+            with PDFIUM_LOCK:
+                page = pdf[index]
+                try:
+                    bitmap = page.render(scale=dpi / 72)
+                    # Copy out of PDFium's buffer so the bitmap can be freed here
+                    image = bitmap.to_pil().copy()
+                    bitmap.close()
+                finally:
+                    page.close()
+            path = os.path.join(directory, f"{stem}-page-{index + 1}.png")
+            image.save(path, format="PNG")
+            paths.append(path)
+        return paths
+    finally:
+        with PDFIUM_LOCK:
+            pdf.close()
+
+
+def read_pdf_pages(file_path: str, backend: str = "pdfplumber") -> List[str]:
+    """Extract every page's text sequentially in the current process."""
+    count = pdf_page_count(file_path, backend)
+    pages = extract_page_range(file_path, 0, count, backend, measure_images=False)
+    return [page.text for page in pages]
+
+
+def plan_page_ranges(
+    count: int, min_pages: int, parallelism: int
+) -> List[tuple[int, int]]:
+    """Split `count` pages into at most `parallelism` contiguous [start, end) ranges."""
+    size = max(1, min_pages, math.ceil(count / max(1, parallelism)))
+    return [(start, min(count, start + size)) for start in range(0, count, size)]
+
+
+async def iter_pdf_pages(
+    file_path: str,
+    *,
+    backend: str = "pdfplumber",
+    pages_per_task: int = 8,
+    use_processes: bool = True,
+    workers: int | None = None,
+) -> AsyncIterator[PDFPage]:
+    """
+    Yield pages in page order while later page ranges are still being
+    extracted. All ranges are scheduled up front: one per worker process, of
+    at least `pages_per_task` pages. In threads the whole document is one
+    range, since pdfplumber holds the GIL and PDFium calls are serialized.
+    """
+    backend = resolve_pdf_backend(backend)
+    count = await asyncio.to_thread(pdf_page_count, file_path, backend)
+    parallelism = (workers or os.cpu_count() or 1) if use_processes else 1
+
+    def _schedule(start: int, end: int) -> asyncio.Future:
+        if use_processes:
+            return asyncio.ensure_future(
+                run_in_process(
+                    extract_page_range, file_path, start, end, backend, workers=workers
+                )
+            )
+        return asyncio.ensure_future(
+            asyncio.to_thread(extract_page_range, file_path, start, end, backend)
+        )
+
+    tasks = [
+        _schedule(start, end)
+        for start, end in plan_page_ranges(count, pages_per_task, parallelism)
+    ]
+    try:
+        for task in tasks:
+            for page in await task:
+                yield page
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+__all__ = [
+    "PDFIUM_LOCK",
+    "PDF_BACKENDS",
+    "PDFPage",
+    "extract_page_range",
+    "iter_pdf_pages",
+    "pdf_page_count",
+    "plan_page_ranges",
+    "read_pdf_pages",
+    "render_pdf_pages",
+    "resolve_pdf_backend",
+]
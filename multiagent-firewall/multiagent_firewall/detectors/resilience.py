@@ -0,0 +1,372 @@
+"""
+Per-provider circuit breaker and adaptive (AIMD) concurrency limiter.
+
+Every LLM call site (text detection and vision OCR) goes through the
+`ProviderGuard` registered for its provider, so a degraded provider is shed
+immediately instead of piling up requests that would only time out. Calls over
+the concurrency limit wait a bounded time for a slot before being shed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Mapping
+
+from ..utils.exceptions import ProviderUnavailableError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Classic closed/open/half-open circuit breaker."""
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = max(0.0, recovery_timeout)
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may proceed (reserving a half-open trial slot)."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                return False
+            if self._half_open_in_flight >= self.half_open_max_calls:
+                return False
+            self._half_open_in_flight += 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._half_open_in_flight = 0
+            self._state = CLOSED
+
+    def release(self) -> None:
+        """Give back a half-open trial slot for a call with no outcome."""
+        with self._lock:
+            self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trip()
+                return
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._trip()
+
+    def _trip(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._half_open_in_flight = 0
+
+    def _maybe_half_open(self) -> None:
+        if self._state != OPEN:
+            return
+        if self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._half_open_in_flight = 0
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit.
+
+    Successful calls grow the limit additively (about +1 per `limit` successes);
+    failures shrink it multiplicatively. Calls over the limit wait up to a
+    timeout for a slot, so a burst queues briefly instead of being shed.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.backoff_ratio = min(max(backoff_ratio, 0.1), 0.95)
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._async_waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        with self._lock:
+            return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            return self._take()
+
+    def acquire(self, timeout: float = 0.0) -> bool:
+        """Take a slot, blocking the thread up to `timeout` seconds for one."""
+        deadline = time.monotonic() + timeout
+        with self._released:
+            while not self._take():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._released.wait(remaining)
+            return True
+
+    async def acquire_async(self, timeout: float = 0.0) -> bool:
+        """Take a slot, waiting up to `timeout` seconds without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            with self._lock:
+                if self._take():
+                    return True
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                waiter = loop.create_future()
+                self._async_waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+
+    def release(self, *, success: bool | None) -> None:
+        """Free a slot; `success=None` leaves the limit unchanged (no outcome)."""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if success:
+                self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+            elif success is not None:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+            # Waiters retry; those still over the limit wait again
+            self._released.notify_all()
+            while self._async_waiters:
+                waiter = self._async_waiters.popleft()
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+    def _take(self) -> bool:
+        if self._in_flight >= int(self._limit):
+            return False
+        self._in_flight += 1
+        return True
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ProviderGuard:
+    """Circuit breaker + concurrency limiter shared by all calls to one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        breaker: CircuitBreaker,
+        limiter: AdaptiveConcurrencyLimiter,
+        queue_timeout: float = 0.0,
+    ) -> None:
+        self.name = name
+        self.breaker = breaker
+        self.limiter = limiter
+        self.queue_timeout = max(0.0, queue_timeout)
+
+    @contextmanager
+    def slot(self, *, record_failure: bool = True) -> Iterator[None]:
+        """
+        Reserve a call slot for the duration of one provider call.
+
+        Raises ProviderUnavailableError without calling the provider when the
+        circuit is open, or when no slot frees up within `queue_timeout`
+        seconds. Blocks the calling thread while waiting: async code uses
+        `async_slot`. With `record_failure=False`, an exception raised by the
+        call is not held against the provider (e.g. a rejected optional
+        request parameter that is retried without it).
+        """
+        self._check_circuit()
+        if not self.limiter.acquire(self.queue_timeout):
+            self._shed()
+        with self._record(record_failure):
+            yield
+
+    @asynccontextmanager
+    async def async_slot(
+        self, *, record_failure: bool = True
+    ) -> AsyncIterator[None]:
+        """Async variant of `slot`: waits for a slot without blocking the loop."""
+        self._check_circuit()
+        if not await self.limiter.acquire_async(self.queue_timeout):
+            self._shed()
+        with self._record(record_failure):
+            yield
+
+    def _check_circuit(self) -> None:
+        if not self.breaker.allow_request():
+            raise ProviderUnavailableError(
+                f"LLM provider '{self.name}' circuit is open"
+            )
+
+    def _shed(self) -> None:
+        # The half-open trial slot, if any, was not used
+        self.breaker.release()
+        raise ProviderUnavailableError(
+            f"LLM provider '{self.name}' concurrency limit reached "
+            f"({self.limiter.limit} in flight)"
+        )
+
+    @contextmanager
+    def _record(self, record_failure: bool) -> Iterator[None]:
+        try:
+            yield
+        except Exception:
+            if record_failure:
+                self.limiter.release(success=False)
+                self.breaker.record_failure()
+            else:
+                self.limiter.release(success=None)
+                self.breaker.release()
+            raise
+        except BaseException:
+            # Cancellation is not the provider's fault
+            self.limiter.release(success=None)
+            self.breaker.release()
+            raise
+        else:
+            self.limiter.release(success=True)
+            self.breaker.record_success()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "concurrency_limit": self.limiter.limit,
+            "in_flight": self.limiter.in_flight,
+        }
+
+
+_GUARDS: Dict[str, ProviderGuard] = {}
+_GUARDS_LOCK = threading.Lock()
+
+
+def provider_key(
+    provider: str,
+    client_params: Mapping[str, Any] | None,
+    model: str | None = None,
+) -> str:
+    """
+    Identify a provider endpoint: provider name, model and custom base URL.
+
+    Models are guarded separately so that, e.g., a throttled fast cascade tier
+    does not open the circuit for the primary model on the same provider.
+    """
+    name = (provider or "unknown").strip().lower()
+    if model:
+        name = f"{name}/{model.strip()}"
+    api_base = (client_params or {}).get("api_base")
+    if api_base:
+        return f"{name}@{str(api_base).rstrip('/')}"
+    return name
+
+
+def get_provider_guard(
+    provider: str,
+    client_params: Mapping[str, Any] | None = None,
+    resilience: Any | None = None,
+    model: str | None = None,
+) -> ProviderGuard:
+    """
+    Return the process-wide guard for a provider model, creating it on first use.
+
+    `resilience` is an `LLMResilienceConfig`; its values are only applied when
+    the guard is created.
+    """
+    key = provider_key(provider, client_params, model)
+    with _GUARDS_LOCK:
+        guard = _GUARDS.get(key)
+        if guard is None:
+            guard = _build_guard(key, resilience)
+            _GUARDS[key] = guard
+        return guard
+
+
+def reset_provider_guards() -> None:
+    """Drop all registered guards (mainly for tests)."""
+    with _GUARDS_LOCK:
+        _GUARDS.clear()
+
+
+def provider_guard_snapshot() -> Dict[str, Dict[str, Any]]:
+    with _GUARDS_LOCK:
+        guards = dict(_GUARDS)
+    return {key: guard.snapshot() for key, guard in guards.items()}
+
+
+def _build_guard(key: str, resilience: Any | None) -> ProviderGuard:
+    if resilience is None:
+        from ..config.env import LLMResilienceConfig
+
+        resilience = LLMResilienceConfig()
+    return ProviderGuard(
+        key,
+        breaker=CircuitBreaker(
+            failure_threshold=resilience.failure_threshold,
+            recovery_timeout=resilience.recovery_timeout,
+            half_open_max_calls=resilience.half_open_max_calls,
+        ),
+        limiter=AdaptiveConcurrencyLimiter(
+            initial_limit=resilience.initial_concurrency,
+            min_limit=resilience.min_concurrency,
+            max_limit=resilience.max_concurrency,
+        ),
+        queue_timeout=resilience.queue_timeout,
+    )
+
+
+__all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "CircuitBreaker",
+    "ProviderGuard",
+    "get_provider_guard",
+    "provider_guard_snapshot",
+    "provider_key",
+    "reset_provider_guards",
+]
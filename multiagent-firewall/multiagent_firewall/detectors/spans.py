@@ -0,0 +1,120 @@
+"""
+Offset-indexed LLM output format.
+
+The input is split into numbered spans of whitespace-separated words and the
+model answers with `[span_id, start, end, field, source]` tuples pointing at
+word positions. Values are rebuilt locally from the original text, so the
+model never has to echo them back.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+DEFAULT_SPAN_WORDS = 40
+
+_word_re = re.compile(r"\S+")
+_edge_punctuation = "\"'`([{<>}]),.;:!?"
+
+
+@dataclass(frozen=True)
+class TextSpan:
+    """A numbered run of words, with each word's character offsets in the text."""
+
+    span_id: int
+    words: Tuple[Tuple[int, int], ...]
+
+
+def segment_text(text: str, max_words: int = DEFAULT_SPAN_WORDS) -> List[TextSpan]:
+    """Split text into spans of at most `max_words` words, breaking at newlines too."""
+    spans: List[TextSpan] = []
+    current: List[Tuple[int, int]] = []
+    last_end = 0
+
+    def flush() -> None:
+        if current:
+            spans.append(TextSpan(span_id=len(spans) + 1, words=tuple(current)))
+            current.clear()
+
+    for match in _word_re.finditer(text):
+        if current and (
+            len(current) >= max_words or "\n" in text[last_end : match.start()]
+        ):
+            flush()
+        current.append(match.span())
+        last_end = match.end()
+    flush()
+    return spans
+
+
+def render_spans(text: str, spans: Sequence[TextSpan]) -> str:
+    """Render spans as '[id] words ...' lines for the user message."""
+    lines = []
+    for span in spans:
+        words = " ".join(text[start:end] for start, end in span.words)
+        lines.append(f"[{span.span_id}] {words}")
+    return "\n".join(lines)
+
+
+def reconstruct_fields(
+    result: Dict[str, Any], text: str, spans: Sequence[TextSpan]
+) -> List[Dict[str, Any]]:
+    """
+    Turn span tuples from the model into detected_fields with local values.
+
+    Out-of-range tuples and values touching anonymization placeholders are dropped.
+    """
+    by_id = {span.span_id: span for span in spans}
+    fields: List[Dict[str, Any]] = []
+    for raw in result.get("spans") or []:
+        parsed = _parse_span_tuple(raw)
+        if parsed is None:
+            continue
+        span_id, start, end, field, source = parsed
+        span = by_id.get(span_id)
+        if span is None or start < 0 or end <= start or end > len(span.words):
+            continue
+        value = text[span.words[start][0] : span.words[end - 1][1]]
+        value = value.strip(_edge_punctuation).strip()
+        if not value or "<<" in value or ">>" in value or "REDACTED:" in value:
+            continue
+        item: Dict[str, Any] = {"field": field, "value": value}
+        if source:
+            item["sources"] = [source]
+        fields.append(item)
+    return fields
+
+
+def _parse_span_tuple(raw: Any) -> Tuple[int, int, int, str, str] | None:
+    if isinstance(raw, dict):
+        raw = [
+            raw.get("span_id", raw.get("span")),
+            raw.get("start"),
+            raw.get("end"),
+            raw.get("field"),
+            raw.get("source") or raw.get("sources"),
+        ]
+    if not isinstance(raw, (list, tuple)) or len(raw) < 4:
+        return None
+    try:
+        span_id, start, end = int(raw[0]), int(raw[1]), int(raw[2])
+    except (TypeError, ValueError):
+        return None
+    field = str(raw[3] or "").strip()
+    if not field:
+        return None
+    source = raw[4] if len(raw) > 4 else ""
+    if isinstance(source, list):
+        source = source[0] if source else ""
+    return span_id, start, end, field, str(source or "").strip()
+
+
+__all__ = [
+    "DEFAULT_SPAN_WORDS",
+    "TextSpan",
+    "reconstruct_fields",
+    "render_spans",
+    "segment_text",
+]
@@ -0,0 +1,450 @@
+"""
+Structure-aware scanning of large CSV and JSON uploads.
+
+Flat text scanning runs every DLP rule over every cell of a large table and
+sends the whole table to the LLM. Instead, records are read lazily and each
+column (CSV) or JSON path is profiled with the DLP rules on a sample of its
+values drawn across the whole file (reservoir sampling), using the column name
+as keyword context:
+
+- "sensitive": one field matches most sampled values; the whole column is
+  reported once, without scanning the rest of its cells
+- "ambiguous": some sampled values match; every cell of the column is scanned
+  in a second pass over the file
+- "clean": no sampled value matches; the column is not scanned further, so
+  values rarer than the sample can reach are missed (the caller warns)
+
+The DLP rules cannot find names, addresses or free-text PII, so the sampled
+values of every column not reported whole are also handed to NER, in short
+blocks per column. The file's text is replaced by a summary (schema, column
+classes and a few sample rows with sensitive cells masked), which is what the
+LLM sees.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from .dlp import detect_checksums, detect_regex_patterns
+
+STRUCTURED_FORMATS = {".csv": "csv", ".json": "json"}
+
+SENSITIVE = "sensitive"
+AMBIGUOUS = "ambiguous"
+CLEAN = "clean"
+
+# Fewer sampled values than this cannot classify a column as sensitive
+MIN_SAMPLED_VALUES = 10
+SUMMARY_ROWS = 5
+_MAX_ROW_CHARS = 1000
+# NER models read a few hundred words at a time; longer blocks are truncated
+_NER_BLOCK_CHARS = 1000
+_SCAN_BLOCK_CELLS = 500
+# Distinct findings reported per ambiguous column
+_MAX_COLUMN_FINDINGS = 100
+
+Pairs = List[Tuple[str, str]]
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    # Non-empty cells: in the whole file, and in the sample
+    cells: int = 0
+    sampled: int = 0
+    matches: Dict[str, int] = field(default_factory=dict)
+    examples: Dict[str, str] = field(default_factory=dict)
+    kind: str = CLEAN
+    field: str | None = None
+    ratio: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "class": self.kind,
+            "field": self.field,
+            "ratio": round(self.ratio, 3),
+            "sampled": self.sampled,
+            "cells": self.cells,
+        }
+
+
+@dataclass
+class StructuredProfile:
+    format: str
+    rows: int
+    sampled_rows: int
+    columns: List[ColumnProfile]
+    fields: List[dict]
+    summary: str
+    # {"column", "text"} blocks of sampled values for NER
+    ner_samples: List[dict] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "format": self.format,
+            "rows": self.rows,
+            "sampled_rows": self.sampled_rows,
+            "columns": {column.name: column.as_dict() for column in self.columns},
+        }
+
+
+def structured_format(file_path: str) -> str | None:
+    """Return "csv" or "json" for files handled by the structured scan."""
+    lowered = file_path.lower()
+    for extension, fmt in STRUCTURED_FORMATS.items():
+        if lowered.endswith(extension):
+            return fmt
+    return None
+
+
+def profile_structured_file(
+    file_path: str, sample_rows: int = 200, sensitive_ratio: float = 0.9
+) -> StructuredProfile | None:
+    """
+    Profile a CSV or JSON file and collect its findings. Returns None when the
+    file does not parse as records, so the caller can scan it as flat text.
+    """
+    fmt = structured_format(file_path)
+    if fmt is None:
+        return None
+    try:
+        if fmt == "csv":
+            return _profile(
+                fmt, lambda: _csv_records(file_path), sample_rows, sensitive_ratio
+            )
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return _profile(
+            fmt, lambda: _json_records(data), sample_rows, sensitive_ratio
+        )
+    except (csv.Error, ValueError, RecursionError):
+        # UnicodeDecodeError and JSONDecodeError are ValueErrors
+        return None
+
+
+def _profile(
+    fmt: str,
+    read_records: Callable[[], Iterator[Tuple[Any, Pairs]]],
+    sample_rows: int,
+    sensitive_ratio: float,
+) -> StructuredProfile | None:
+    records = read_records()
+    first = next(records, None)
+    if first is None:
+        return None
+    # CSV column names, or the JSON path prefix of records
+    header, _ = first
+    sample_size = max(1, sample_rows)
+    columns: Dict[str, ColumnProfile] = {}
+    reservoirs: Dict[str, List[str]] = {}
+    samples: List[Any] = []
+    # Seeded so a file is always classified the same way
+    rng = random.Random(0)
+    rows = 0
+
+    # First pass: count cells and sample each column across the whole file
+    for raw, pairs in records:
+        rows += 1
+        if len(samples) < SUMMARY_ROWS:
+            samples.append(raw)
+        for name, value in pairs:
+            column = columns.setdefault(name, ColumnProfile(name))
+            value = value.strip()
+            if not value:
+                continue
+            column.cells += 1
+            reservoir = reservoirs.setdefault(name, [])
+            if len(reservoir) < sample_size:
+                reservoir.append(value)
+            else:
+                slot = rng.randrange(column.cells)
+                if slot < sample_size:
+                    reservoir[slot] = value
+
+    findings: Dict[str, Dict[Tuple[str, str], dict]] = {}
+    for name, column in columns.items():
+        for value in reservoirs.get(name, ()):
+            column.sampled += 1
+            matched = _scan(name, [value])
+            _collect(findings, name, matched)
+            for field_name in {item["field"] for item in matched}:
+                column.matches[field_name] = column.matches.get(field_name, 0) + 1
+                column.examples.setdefault(
+                    field_name,
+                    next(i["value"] for i in matched if i["field"] == field_name),
+                )
+        _classify(column, sensitive_ratio)
+
+    # Second pass, only when needed: scan ambiguous columns in full
+    if any(column.kind == AMBIGUOUS for column in columns.values()):
+        pending: Dict[str, List[str]] = {}
+        records = read_records()
+        next(records, None)
+        for _, pairs in records:
+            for name, value in pairs:
+                if columns[name].kind != AMBIGUOUS:
+                    continue
+                if len(findings.get(name, ())) >= _MAX_COLUMN_FINDINGS:
+                    # Enough evidence for the column
+                    continue
+                value = value.strip()
+                if not value:
+                    continue
+                block = pending.setdefault(name, [])
+                block.append(value)
+                if len(block) >= _SCAN_BLOCK_CELLS:
+                    _collect(findings, name, _scan(name, block))
+                    block.clear()
+        for name, block in pending.items():
+            if block:
+                _collect(findings, name, _scan(name, block))
+
+    sampled_rows = min(rows, sample_size)
+    fields = _column_fields(columns.values(), findings)
+    summary = _summary(fmt, header, samples, columns, rows, sampled_rows)
+    return StructuredProfile(
+        fmt,
+        rows,
+        sampled_rows,
+        list(columns.values()),
+        fields,
+        summary,
+        _ner_samples(columns, reservoirs),
+    )
+
+
+def _ner_samples(
+    columns: Dict[str, ColumnProfile], reservoirs: Dict[str, List[str]]
+) -> List[dict]:
+    """Sampled values of the columns not reported whole, in blocks per column."""
+    blocks: List[dict] = []
+    for name, column in columns.items():
+        if column.kind == SENSITIVE:
+            continue
+        lines: List[str] = []
+        size = 0
+        for value in reservoirs.get(name, ()):
+            line = f"{name}: {value}"[:_NER_BLOCK_CHARS]
+            if lines and size + len(line) > _NER_BLOCK_CHARS:
+                blocks.append({"column": name, "text": "\n".join(lines)})
+                lines, size = [], 0
+            lines.append(line)
+            size += len(line) + 1
+        if lines:
+            blocks.append({"column": name, "text": "\n".join(lines)})
+    return blocks
+
+
+def _scan(column: str, values: Sequence[str]) -> List[dict]:
+    """Run the DLP rules over cells of one column, with its name as context."""
+    text = "\n".join(f"{column}: {value}" for value in values)
+    lowered = column.lower()
+    return [
+        item
+        for item in detect_regex_patterns(text) + detect_checksums(text)
+        # Values found in the column name itself are not cell values
+        if item.get("value") and item["value"].lower() not in lowered
+    ]
+
+
+def _collect(
+    findings: Dict[str, Dict[Tuple[str, str], dict]], column: str, items: List[dict]
+) -> None:
+    seen = findings.setdefault(column, {})
+    for item in items:
+        if len(seen) >= _MAX_COLUMN_FINDINGS:
+            return
+        seen.setdefault((item["field"], item["value"]), item)
+
+
+def _classify(column: ColumnProfile, sensitive_ratio: float) -> None:
+    if not column.matches:
+        column.kind = CLEAN
+        return
+    field_name, count = max(column.matches.items(), key=lambda item: item[1])
+    column.field = field_name
+    column.ratio = count / column.sampled if column.sampled else 0.0
+    if column.sampled >= MIN_SAMPLED_VALUES and column.ratio >= sensitive_ratio:
+        column.kind = SENSITIVE
+    else:
+        column.kind = AMBIGUOUS
+
+
+def _column_fields(
+    columns, findings: Dict[str, Dict[Tuple[str, str], dict]]
+) -> List[dict]:
+    fields: List[dict] = []
+    for column in columns:
+        if column.kind == SENSITIVE:
+            fields.append(
+                {
+                    "field": column.field,
+                    "value": column.examples[column.field],
+                    "sources": ["dlp_structured"],
+                    "column": column.name,
+                    "cells": column.cells,
+                    "match_ratio": round(column.ratio, 3),
+                }
+            )
+        elif column.kind == AMBIGUOUS:
+            for item in findings.get(column.name, {}).values():
+                fields.append(
+                    {
+                        "field": item["field"],
+                        "value": item["value"],
+                        "sources": ["dlp_structured"],
+                        "column": column.name,
+                    }
+                )
+    return fields
+
+
+def _csv_records(file_path: str) -> Iterator[Tuple[Any, Pairs]]:
+    """Yield the header row, then (row, [(column, cell), ...]) per data row."""
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        try:
+            dialect: Any = csv.Sniffer().sniff(f.read(64 * 1024), delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        f.seek(0)
+        reader = csv.reader(f, dialect)
+        header = next(reader, None)
+        if header is None:
+            return
+        names = [name.strip() or f"column_{i + 1}" for i, name in enumerate(header)]
+        yield names, []
+        for row in reader:
+            yield row, [
+                (names[i] if i < len(names) else f"column_{i + 1}", cell)
+                for i, cell in enumerate(row)
+            ]
+
+
+def _json_records(data: Any) -> Iterator[Tuple[Any, Pairs]]:
+    """
+    Yield the records prefix, then ((prefix, record), [(path, value), ...]) per
+    record of a parsed JSON document.
+
+    Records are the items of a top-level array, or of the largest array of
+    objects in a top-level object (its other keys form one more record).
+    """
+    prefix = ""
+    if isinstance(data, list):
+        records: List[Any] = data
+    elif isinstance(data, dict):
+        arrays = [
+            key
+            for key, value in data.items()
+            if isinstance(value, list) and any(isinstance(v, dict) for v in value)
+        ]
+        if arrays:
+            key = max(arrays, key=lambda k: len(data[k]))
+            prefix = f"{key}[]"
+            rest = {k: v for k, v in data.items() if k != key}
+            records = data[key]
+            yield prefix, []
+            if rest:
+                yield ("", rest), _flatten(rest, "")
+            for record in records:
+                yield (prefix, record), _flatten(record, prefix)
+            return
+        records = [data]
+    else:
+        raise ValueError("JSON document is not an array or object")
+    yield prefix, []
+    for record in records:
+        yield (prefix, record), _flatten(record, prefix)
+
+
+def _flatten(value: Any, path: str, out: Pairs | None = None) -> Pairs:
+    out = [] if out is None else out
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(item, f"{path}.{key}" if path else str(key), out)
+    elif isinstance(value, list):
+        for item in value:
+            _flatten(item, f"{path}[]", out)
+    elif value is not None:
+        out.append((path or "$", str(value)))
+    return out
+
+
+def _mask(value: Any, path: str, masks: Dict[str, str]) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _mask(item, f"{path}.{key}" if path else str(key), masks)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_mask(item, f"{path}[]", masks) for item in value]
+    if value is not None and (path or "$") in masks:
+        return masks[path or "$"]
+    return value
+
+
+def _summary(
+    fmt: str,
+    header: Any,
+    samples: List[Any],
+    columns: Dict[str, ColumnProfile],
+    rows: int,
+    sampled_rows: int,
+) -> str:
+    masks = {
+        column.name: f"<{column.field}>"
+        for column in columns.values()
+        if column.kind == SENSITIVE
+    }
+    lines = [
+        f"{fmt.upper()} data with {rows} records and {len(columns)} "
+        f"{'columns' if fmt == 'csv' else 'fields'} "
+        f"({sampled_rows} values per column sampled across the file).",
+        "Columns:" if fmt == "csv" else "Fields:",
+    ]
+    for column in columns.values():
+        if column.kind == SENSITIVE:
+            description = (
+                f"{column.field} in {column.ratio:.0%} of sampled values "
+                "(whole column reported)"
+            )
+        elif column.kind == AMBIGUOUS:
+            description = "some sensitive values, scanned in full"
+        else:
+            description = "no sensitive values in sample"
+        lines.append(f"- {column.name}: {description}")
+    lines.append("Sample records:")
+    if fmt == "csv":
+        names = list(header)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(names)
+        for row in samples:
+            writer.writerow(
+                [
+                    masks.get(names[i] if i < len(names) else f"column_{i + 1}", cell)
+                    for i, cell in enumerate(row)
+                ]
+            )
+        lines.extend(line[:_MAX_ROW_CHARS] for line in buffer.getvalue().splitlines())
+    else:
+        for prefix, record in samples:
+            masked = _mask(record, prefix, masks)
+            lines.append(json.dumps(masked, ensure_ascii=False)[:_MAX_ROW_CHARS])
+    return "\n".join(lines)
+
+
+__all__ = [
+    "AMBIGUOUS",
+    "CLEAN",
+    "ColumnProfile",
+    "SENSITIVE",
+    "STRUCTURED_FORMATS",
+    "StructuredProfile",
+    "profile_structured_file",
+    "structured_format",
+]
@@ -0,0 +1,191 @@
+"""
+Warm in-process Tesseract engines via `tesserocr`.
+
+`pytesseract` spawns a `tesseract` process (and loads the language data) for
+every image. When `tesserocr` is installed, a pool of `PyTessBaseAPI` handles
+is kept per language/config instead, one per core by default, so each OCR call
+only pays for recognition. `tesserocr` releases the GIL while recognizing, so
+handles can be used from worker threads concurrently.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import shlex
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+OCR_BACKENDS = ("auto", "tesserocr", "pytesseract")
+
+_DATA_KEYS = (
+    "text",
+    "conf",
+    "left",
+    "top",
+    "width",
+    "height",
+    "block_num",
+    "par_num",
+    "line_num",
+)
+
+
+def _parse_tesseract_config(config: str) -> Tuple[int | None, Dict[str, str]]:
+    """Translate a tesseract CLI config string (`--psm N -c k=v`) for tesserocr."""
+    psm = None
+    variables: Dict[str, str] = {}
+    tokens = shlex.split(config or "")
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == "--psm" and i + 1 < len(tokens):
+            psm = int(tokens[i + 1])
+            i += 2
+            continue
+        if token == "-c" and i + 1 < len(tokens) and "=" in tokens[i + 1]:
+            name, value = tokens[i + 1].split("=", 1)
+            variables[name] = value
+            i += 2
+            continue
+        i += 1
+    return psm, variables
+
+
+class TesserocrPool:
+    """Bounded pool of initialized `tesserocr.PyTessBaseAPI` handles."""
+
+    def __init__(
+        self,
+        tesserocr: Any,
+        *,
+        lang: str,
+        config: str = "",
+        size: int | None = None,
+    ) -> None:
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self.size = max(1, size or os.cpu_count() or 1)
+        self._psm, self._variables = _parse_tesseract_config(config)
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        # Fail fast (e.g. missing language data) before the pool is registered
+        self._idle.put(self._new_handle())
+
+    def _new_handle(self) -> Any:
+        kwargs: Dict[str, Any] = {"lang": self.lang}
+        if self._psm is not None:
+            kwargs["psm"] = self._psm
+        api = self._tesserocr.PyTessBaseAPI(**kwargs)
+        for name, value in self._variables.items():
+            api.SetVariable(name, value)
+        self._created += 1
+        return api
+
+    @contextmanager
+    def handle(self) -> Iterator[Any]:
+        try:
+            api = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                api = self._new_handle() if self._created < self.size else None
+            if api is None:
+                api = self._idle.get()
+        try:
+            yield api
+        finally:
+            api.Clear()
+            self._idle.put(api)
+
+    def recognize_data(self, image: Any) -> Dict[str, List[Any]]:
+        """
+        Recognize a PIL image and return word-level data in the same dict
+        format as `pytesseract.image_to_data(..., output_type=Output.DICT)`.
+        """
+        RIL = self._tesserocr.RIL
+        data: Dict[str, List[Any]] = {key: [] for key in _DATA_KEYS}
+        block = par = line = 0
+        with self.handle() as api:
+            api.SetImage(image)
+            api.Recognize()
+            iterator = api.GetIterator()
+            for word in self._tesserocr.iterate_level(iterator, RIL.WORD):
+                if word.IsAtBeginningOf(RIL.BLOCK):
+                    block, par, line = block + 1, 0, 0
+                if word.IsAtBeginningOf(RIL.PARA):
+                    par, line = par + 1, 0
+                if word.IsAtBeginningOf(RIL.TEXTLINE):
+                    line += 1
+                box = word.BoundingBox(RIL.WORD)
+                if box is None:
+                    continue
+                left, top, right, bottom = box
+                data["text"].append(word.GetUTF8Text(RIL.WORD) or "")
+                data["conf"].append(word.Confidence(RIL.WORD))
+                data["left"].append(left)
+                data["top"].append(top)
+                data["width"].append(right - left)
+                data["height"].append(bottom - top)
+                data["block_num"].append(block)
+                data["par_num"].append(par)
+                data["line_num"].append(line)
+        return data
+
+    def close(self) -> None:
+        while True:
+            try:
+                api = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            api.End()
+
+
+_POOLS: Dict[Tuple[str, str, int | None], TesserocrPool | None] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_tesserocr_pool(
+    lang: str, config: str = "", size: int | None = None
+) -> TesserocrPool | None:
+    """
+    Return the process-wide pool for these settings, or None when `tesserocr`
+    is not installed or cannot initialize (the caller falls back to pytesseract).
+    """
+    key = (lang, config, size)
+    with _POOLS_LOCK:
+        if key in _POOLS:
+            return _POOLS[key]
+        try:
+            import tesserocr
+        except ImportError:
+            pool = None
+        else:
+            try:
+                pool = TesserocrPool(tesserocr, lang=lang, config=config, size=size)
+            except Exception as e:
+                logger.warning(f"tesserocr initialization failed, using pytesseract: {e}")
+                pool = None
+        _POOLS[key] = pool
+        return pool
+
+
+def reset_tesserocr_pools() -> None:
+    """Release all pooled engines (mainly for tests)."""
+    with _POOLS_LOCK:
+        pools = [pool for pool in _POOLS.values() if pool is not None]
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+__all__ = [
+    "OCR_BACKENDS",
+    "TesserocrPool",
+    "get_tesserocr_pool",
+    "reset_tesserocr_pools",
+]
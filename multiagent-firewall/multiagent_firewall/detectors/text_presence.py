@@ -0,0 +1,72 @@
+"""
+Cheap text-likelihood estimate for images, used to skip OCR on photos.
+
+Rendered text is made of thin, high-contrast strokes: scanning a row, a sharp
+rise in intensity is followed within a few pixels by a sharp fall (or the
+reverse for light-on-dark text). Photos and diagrams mostly have soft gradients
+or one-sided edges. The score is the density of such stroke pairs on a
+grayscale thumbnail, scaled to [0, 1]. Requires NumPy and Pillow (the
+`file-analysis` extra); without them no estimate is made.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+DEFAULT_THUMBNAIL_EDGE = 1024
+# Minimum intensity jump between neighbouring pixels that counts as an edge
+_EDGE_THRESHOLD = 0.2
+# Maximum stroke width in thumbnail pixels
+_MAX_STROKE_WIDTH = 4
+# Stroke-pair density at which an image is considered certainly textual
+_SATURATION_DENSITY = 0.005
+
+
+def estimate_text_likelihood(
+    image: Any, *, thumbnail_edge: int = DEFAULT_THUMBNAIL_EDGE
+) -> float:
+    """Return a text-likelihood score in [0, 1] for a PIL image."""
+    import numpy as np
+
+    thumbnail = image.convert("L")
+    thumbnail.thumbnail((thumbnail_edge, thumbnail_edge))
+    pixels = np.asarray(thumbnail, dtype=np.float32) / 255.0
+    if pixels.ndim != 2 or pixels.shape[1] < 2:
+        return 0.0
+
+    dx = np.diff(pixels, axis=1)
+    rising = dx > _EDGE_THRESHOLD
+    falling = dx < -_EDGE_THRESHOLD
+    strokes = np.zeros_like(rising)
+    for width in range(1, min(_MAX_STROKE_WIDTH, dx.shape[1] - 1) + 1):
+        strokes[:, :-width] |= (rising[:, :-width] & falling[:, width:]) | (
+            falling[:, :-width] & rising[:, width:]
+        )
+    density = float(strokes.mean())
+    return min(1.0, density / _SATURATION_DENSITY)
+
+
+def image_text_likelihood(
+    file_path: str, *, thumbnail_edge: int = DEFAULT_THUMBNAIL_EDGE
+) -> float | None:
+    """
+    Score an image file, or return None when it cannot be scored (missing
+    dependencies or unreadable image) so callers fall back to running OCR.
+    """
+    try:
+        import numpy  # noqa: F401
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(file_path) as image:
+            # Lets JPEG decoders downscale while decoding
+            image.draft("L", (thumbnail_edge, thumbnail_edge))
+            return round(
+                estimate_text_likelihood(image, thumbnail_edge=thumbnail_edge), 4
+            )
+    except Exception:
+        return None
+
+
+__all__ = ["DEFAULT_THUMBNAIL_EDGE", "estimate_text_likelihood", "image_text_likelihood"]
@@ -0,0 +1,174 @@
+"""
+Streaming reads and normalization of large texts.
+
+A large log file read with `f.read()` and normalized with `re.sub` is held as
+several full-size strings at once (a single non-Latin-1 character makes each of
+them four bytes per character). Here, files are memory-mapped and decoded
+incrementally, and normalization (system tags stripped, whitespace collapsed)
+runs chunk by chunk, so only the normalized output is ever held in full.
+"""
+
+from __future__ import annotations
+
+import codecs
+import mmap
+import os
+import re
+from typing import Iterable, Iterator
+
+DEFAULT_CHUNK_BYTES = 1 << 20
+DEFAULT_CHUNK_CHARS = 1 << 20
+
+_whitespace_re = re.compile(r"\s+")
+_OPEN_TAG = "<system-reminder>"
+_CLOSE_TAG = "</system-reminder>"
+_open_tag_re = re.compile(re.escape(_OPEN_TAG), flags=re.IGNORECASE)
+_close_tag_re = re.compile(re.escape(_CLOSE_TAG), flags=re.IGNORECASE)
+
+
+def iter_text_chunks(
+    file_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES, encoding: str = "utf-8"
+) -> Iterator[str]:
+    """
+    Yield the decoded text of a file in chunks, decoding a memory map of it
+    incrementally. Raises UnicodeDecodeError on invalid input, like `f.read()`.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, size, max(1, chunk_bytes)):
+                    text = decoder.decode(mapped[start : start + chunk_bytes])
+                    if text:
+                        yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_string_chunks(
+    text: str, chunk_chars: int = DEFAULT_CHUNK_CHARS
+) -> Iterator[str]:
+    """Yield slices of an in-memory string."""
+    size = max(1, chunk_chars)
+    for start in range(0, len(text), size):
+        yield text[start : start + size]
+
+
+class TextNormalizer:
+    """
+    Incremental equivalent of stripping `<system-reminder>...</system-reminder>`
+    blocks, collapsing whitespace runs to one space and stripping both ends.
+
+    Tags and whitespace runs may span chunk boundaries. Text after an opening
+    tag is held back until its closing tag, and emitted as is if none follows.
+    """
+
+    def __init__(self) -> None:
+        # Unprocessed tail: a possible partial opening tag
+        self._pending = ""
+        # Text of an open block, starting with its opening tag
+        self._block: str | None = None
+        # Offset in the block from which the closing tag is searched
+        self._searched = 0
+        self._started = False
+        self._space = False
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return the normalized text that is now final."""
+        out: list[str] = []
+        data = self._pending + chunk
+        self._pending = ""
+        while data:
+            if self._block is not None:
+                self._block += data
+                data = ""
+                match = _close_tag_re.search(self._block, self._searched)
+                if match is None:
+                    self._searched = max(0, len(self._block) - len(_CLOSE_TAG) + 1)
+                    break
+                data = self._block[match.end() :]
+                self._block = None
+                continue
+            match = _open_tag_re.search(data)
+            if match is not None:
+                out.append(self._collapse(data[: match.start()]))
+                self._block = data[match.start() : match.end()]
+                self._searched = len(_OPEN_TAG)
+                data = data[match.end() :]
+                continue
+            keep = _partial_tag_length(data)
+            out.append(self._collapse(data[: len(data) - keep]))
+            self._pending = data[len(data) - keep :]
+            break
+        return "".join(out)
+
+    def flush(self) -> str:
+        """Return the remaining normalized text; the input is complete."""
+        rest = (self._block or "") + self._pending
+        self._block = None
+        self._pending = ""
+        return self._collapse(rest)
+
+    def _collapse(self, text: str) -> str:
+        if not text:
+            return ""
+        collapsed = _whitespace_re.sub(" ", text)
+        core = collapsed.strip(" ")
+        if not core:
+            self._space = True
+            return ""
+        prefix = " " if self._started and (self._space or collapsed[0] == " ") else ""
+        self._started = True
+        self._space = collapsed[-1] == " "
+        return prefix + core
+
+
+def _partial_tag_length(text: str) -> int:
+    """Length of the longest suffix of `text` that starts an opening tag."""
+    tail = text[-(len(_OPEN_TAG) - 1) :].lower()
+    for length in range(len(tail), 0, -1):
+        if _OPEN_TAG.startswith(tail[-length:]):
+            return length
+    return 0
+
+
+def normalize_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield the normalized text of a chunked input, chunk by chunk."""
+    normalizer = TextNormalizer()
+    for chunk in chunks:
+        text = normalizer.feed(chunk)
+        if text:
+            yield text
+    text = normalizer.flush()
+    if text:
+        yield text
+
+
+def normalize_text(text: str, chunk_chars: int = DEFAULT_CHUNK_CHARS) -> str:
+    """Normalize an in-memory string without full-size intermediate copies."""
+    return "".join(normalize_chunks(iter_string_chunks(text, chunk_chars)))
+
+
+def read_normalized_text(
+    file_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> str | None:
+    """
+    Read and normalize a UTF-8 file without holding its raw text.
+    Returns None if the file cannot be read or decoded.
+    """
+    try:
+        return "".join(normalize_chunks(iter_text_chunks(file_path, chunk_bytes)))
+    except (OSError, ValueError):
+        return None
+
+
+__all__ = [
+    "TextNormalizer",
+    "iter_string_chunks",
+    "iter_text_chunks",
+    "normalize_chunks",
+    "normalize_text",
+    "read_normalized_text",
+]
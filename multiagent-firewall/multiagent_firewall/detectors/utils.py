@@ -32,6 +32,64 @@ def coerce_litellm_content_to_text(response: Any) -> str:
     return ""
 
 
+def extract_token_usage(response: Any) -> Dict[str, int] | None:
+    """
+    Read token usage from a LangChain response, splitting cached vs uncached input.
+
+    Returns None when the provider did not report usage.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if not isinstance(usage, dict):
+        return None
+    input_tokens = int(usage.get("input_tokens") or 0)
+    details = usage.get("input_token_details") or {}
+    cached = int(details.get("cache_read") or 0)
+    return {
+        "input_tokens": input_tokens,
+        "cached_input_tokens": cached,
+        "uncached_input_tokens": max(0, input_tokens - cached),
+        "cache_creation_input_tokens": int(details.get("cache_creation") or 0),
+        "output_tokens": int(usage.get("output_tokens") or 0),
+    }
+
+
+def estimate_cost_usd(model_id: str, usage: Dict[str, Any]) -> float | None:
+    """Price a call from its token usage with LiteLLM's cost map (None if unknown)."""
+    try:
+        import litellm
+
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model_id,
+            prompt_tokens=usage.get("input_tokens", 0),
+            completion_tokens=usage.get("output_tokens", 0),
+            cache_read_input_tokens=usage.get("cached_input_tokens", 0),
+            cache_creation_input_tokens=usage.get("cache_creation_input_tokens", 0),
+        )
+    except Exception:
+        return None
+    return round(prompt_cost + completion_cost, 8)
+
+
+def build_call_usage(
+    response: Any,
+    *,
+    provider: str,
+    model: str,
+    latency_ms: float,
+    retries: int = 0,
+) -> Dict[str, Any]:
+    """Describe one provider call: tokens, cost (when priced), latency and retries."""
+    tokens = extract_token_usage(response)
+    usage: Dict[str, Any] = dict(tokens or {})
+    usage["latency_ms"] = round(latency_ms, 2)
+    usage["retries"] = retries
+    if tokens:
+        cost = estimate_cost_usd(build_litellm_model_string(model, provider), tokens)
+        if cost is not None:
+            usage["cost_usd"] = cost
+    return usage
+
+
 def json_env(var_name: str) -> Dict[str, Any]:
     """Parse an env var as a JSON object (or return {})."""
     raw = os.getenv(var_name)
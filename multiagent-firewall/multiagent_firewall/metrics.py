@@ -0,0 +1,128 @@
+"""
+LLM usage accounting.
+
+Each provider call reports tokens (prompt, completion, cached), cost when the
+model is priced by LiteLLM, latency and retries. Calls are summed per request
+into `metadata["llm_usage"]` (overall and per node) and aggregated
+process-wide in `LLM_METRICS` for capacity planning.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Mapping, Tuple
+
+from .detectors.cascade import CASCADE_STATS
+from .detectors.resilience import provider_guard_snapshot
+from .types import GuardState
+
+_SUMMED_KEYS = (
+    "input_tokens",
+    "cached_input_tokens",
+    "uncached_input_tokens",
+    "cache_creation_input_tokens",
+    "output_tokens",
+    "cost_usd",
+    "latency_ms",
+    "retries",
+)
+
+
+def _accumulate(totals: Dict[str, Any], usage: Mapping[str, Any]) -> None:
+    totals["calls"] = totals.get("calls", 0) + 1
+    _add(totals, usage, _SUMMED_KEYS)
+
+
+def _add(
+    totals: Dict[str, Any], usage: Mapping[str, Any], keys: Tuple[str, ...]
+) -> None:
+    for key in keys:
+        value = usage.get(key)
+        if isinstance(value, (int, float)):
+            totals[key] = totals.get(key, 0) + value
+    if isinstance(totals.get("cost_usd"), float):
+        totals["cost_usd"] = round(totals["cost_usd"], 8)
+    if isinstance(totals.get("latency_ms"), float):
+        totals["latency_ms"] = round(totals["latency_ms"], 2)
+
+
+class LLMUsageMetrics:
+    """Thread-safe process-wide LLM usage counters keyed by node and model."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._totals: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def record(self, node: str, model: str, usage: Mapping[str, Any]) -> None:
+        with self._lock:
+            totals = self._totals.setdefault((node, model), {})
+            _accumulate(totals, usage)
+            latency = usage.get("latency_ms")
+            if isinstance(latency, (int, float)):
+                totals["max_latency_ms"] = max(totals.get("max_latency_ms", 0), latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            items = [(key, dict(totals)) for key, totals in self._totals.items()]
+        by_node: Dict[str, Dict[str, Any]] = {}
+        for (node, model), totals in items:
+            calls = totals.get("calls") or 0
+            if calls:
+                totals["avg_latency_ms"] = round(totals.get("latency_ms", 0) / calls, 2)
+            by_node.setdefault(node, {})[model] = totals
+        return by_node
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+LLM_METRICS = LLMUsageMetrics()
+
+
+def record_llm_usage(
+    state: GuardState,
+    node: str,
+    usage: Mapping[str, Any] | None,
+    *,
+    model: str | None = None,
+) -> None:
+    """Add one provider call to the request metadata and the process-wide metrics."""
+    if not usage:
+        return
+    request_totals = state.setdefault("metadata", {}).setdefault("llm_usage", {})
+    _accumulate(request_totals, usage)
+    by_node = request_totals.setdefault("by_node", {})
+    _accumulate(by_node.setdefault(node, {}), usage)
+    LLM_METRICS.record(node, model or "unknown", usage)
+
+
+def merge_llm_usage(
+    metadata: Dict[str, Any], usage_totals: Mapping[str, Any] | None
+) -> None:
+    """Fold per-request totals recorded on another state into `metadata`."""
+    if not usage_totals:
+        return
+    request_totals = metadata.setdefault("llm_usage", {})
+    _add(request_totals, usage_totals, ("calls",) + _SUMMED_KEYS)
+    by_node = request_totals.setdefault("by_node", {})
+    for node, totals in (usage_totals.get("by_node") or {}).items():
+        _add(by_node.setdefault(node, {}), totals, ("calls",) + _SUMMED_KEYS)
+
+
+def metrics_snapshot() -> Dict[str, Any]:
+    """Everything needed to judge caching, gating and cascade effectiveness."""
+    return {
+        "llm": LLM_METRICS.snapshot(),
+        "cascade": CASCADE_STATS.snapshot(),
+        "providers": provider_guard_snapshot(),
+    }
+
+
+__all__ = [
+    "LLMUsageMetrics",
+    "LLM_METRICS",
+    "merge_llm_usage",
+    "metrics_snapshot",
+    "record_llm_usage",
+]
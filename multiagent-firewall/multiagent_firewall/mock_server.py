@@ -0,0 +1,393 @@
+"""
+Deterministic OpenAI-compatible mock LLM server for offline benchmarking.
+
+Point the firewall at it with `LLM_PROVIDER=openai` and
+`LLM_BASE_URL=http://127.0.0.1:8765/v1` (any API key works):
+
+    python -m multiagent_firewall.mock_server --port 8765 --latency lognormal:300:0.5
+
+- Text detection requests answer with the findings of the local DLP regex
+  rules, in either the `values` or the `spans` output format.
+- Vision (LLM OCR) requests answer with a fixed text plus a digest of the image.
+- Latency, streaming (SSE), error rate and cached-prompt usage are simulated,
+  all driven by a seeded RNG so runs are reproducible.
+
+Stdlib only; nothing here reaches the network.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+from .detectors.dlp import detect_regex_patterns
+
+_span_line_re = re.compile(r"^\[(\d+)\] (.*)$")
+_word_re = re.compile(r"\S+")
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """
+    Simulated provider latency in milliseconds.
+
+    Spec strings: "fixed:MS", "uniform:MIN:MAX" or "lognormal:MEDIAN:SIGMA".
+    """
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        parts = (spec or "fixed:0").split(":")
+        kind = parts[0].strip().lower()
+        try:
+            values = [float(p) for p in parts[1:]]
+        except ValueError as exc:
+            raise ValueError(f"Invalid latency spec: {spec}") from exc
+        if kind == "fixed" and len(values) == 1:
+            return cls(kind, values[0])
+        if kind in ("uniform", "lognormal") and len(values) == 2:
+            return cls(kind, values[0], values[1])
+        raise ValueError(f"Invalid latency spec: {spec}")
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(max(self.a, 1e-3)), self.b)
+        return self.a
+
+
+@dataclass
+class MockSettings:
+    latency: LatencyModel = LatencyModel()
+    error_rate: float = 0.0
+    error_status: int = 503
+    seed: int = 0
+    ocr_text: str = "Mock OCR text"
+    stream_chunk_chars: int = 16
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+def _message_text(content: Any) -> Tuple[str, bool]:
+    """Flatten message content to text; report whether it carried an image."""
+    if isinstance(content, str):
+        return content, False
+    text_parts: List[str] = []
+    has_image = False
+    for block in content or []:
+        if not isinstance(block, dict):
+            continue
+        if block.get("type") == "text":
+            text_parts.append(str(block.get("text") or ""))
+        elif block.get("type") == "image_url":
+            has_image = True
+            url = (block.get("image_url") or {}).get("url", "")
+            text_parts.append(url)
+    return "\n".join(text_parts), has_image
+
+
+def _detections(text: str) -> List[Dict[str, Any]]:
+    fields = []
+    for finding in detect_regex_patterns(text):
+        fields.append(
+            {"field": finding["field"], "value": finding["value"], "sources": ["Explicit"]}
+        )
+    return fields
+
+
+def _span_detections(user_text: str) -> List[List[Any]]:
+    spans: List[List[Any]] = []
+    for line in user_text.splitlines():
+        match = _span_line_re.match(line)
+        if not match:
+            continue
+        span_id, body = int(match.group(1)), match.group(2)
+        words = [m.span() for m in _word_re.finditer(body)]
+        for finding in detect_regex_patterns(body):
+            start_char = body.find(finding["value"])
+            if start_char < 0:
+                continue
+            end_char = start_char + len(finding["value"])
+            indices = [
+                i for i, (s, e) in enumerate(words) if s < end_char and e > start_char
+            ]
+            if indices:
+                spans.append(
+                    [span_id, indices[0], indices[-1] + 1, finding["field"], "Explicit"]
+                )
+    return spans
+
+
+class MockLLM:
+    """Request-independent core of the mock server (usable without HTTP)."""
+
+    def __init__(self, settings: MockSettings | None = None) -> None:
+        self.settings = settings or MockSettings()
+        self._rng = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._seen_prefixes: set[str] = set()
+        self.requests = 0
+
+    def next_latency_ms(self) -> float:
+        with self._lock:
+            return max(0.0, self.settings.latency.sample_ms(self._rng))
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            return self._rng.random() < self.settings.error_rate
+
+    def complete(self, body: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Return (content, usage) for a chat completion request body."""
+        system_text, user_text, has_image = "", "", False
+        for message in body.get("messages") or []:
+            text, image = _message_text(message.get("content"))
+            if message.get("role") == "system":
+                system_text += text
+            else:
+                user_text += text
+                has_image = has_image or image
+
+        if has_image:
+            digest = hashlib.sha256(user_text.encode("utf-8")).hexdigest()[:12]
+            content = f"{self.settings.ocr_text} [{digest}]"
+        elif "numbered spans" in system_text:
+            content = json.dumps({"spans": _span_detections(user_text)})
+        else:
+            content = json.dumps({"detected_fields": _detections(user_text)})
+
+        # Simulate provider prefix caching of the (static) system prompt
+        prefix = hashlib.sha256(system_text.encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = prefix in self._seen_prefixes
+            self._seen_prefixes.add(prefix)
+        system_tokens = _estimate_tokens(system_text)
+        prompt_tokens = system_tokens + _estimate_tokens(user_text)
+        completion_tokens = _estimate_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": system_tokens if cached else 0},
+        }
+        return content, usage
+
+
+def _handler_for(mock: MockLLM):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            pass
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:  # noqa: N802
+            path = self.path.rstrip("/")
+            if path in ("/health", "/v1/health"):
+                self._send_json(200, {"status": "ok", "requests": mock.requests})
+            elif path in ("/models", "/v1/models"):
+                self._send_json(
+                    200,
+                    {"object": "list", "data": [{"id": "mock", "object": "model"}]},
+                )
+            else:
+                self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self) -> None:  # noqa: N802
+            if self.path.rstrip("/") not in ("/chat/completions", "/v1/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._send_json(400, {"error": {"message": "invalid JSON"}})
+                return
+
+            latency_s = mock.next_latency_ms() / 1000
+            if mock.should_fail():
+                time.sleep(latency_s)
+                self._send_json(
+                    mock.settings.error_status,
+                    {"error": {"message": "mock provider error", "type": "server_error"}},
+                )
+                return
+
+            content, usage = mock.complete(body)
+            model = body.get("model") or "mock"
+            created = int(time.time())
+            completion_id = f"chatcmpl-mock-{mock.requests}"
+            if body.get("stream"):
+                self._stream(completion_id, model, created, content, usage, latency_s, body)
+                return
+
+            time.sleep(latency_s)
+            self._send_json(
+                200,
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                },
+            )
+
+        def _stream(
+            self,
+            completion_id: str,
+            model: str,
+            created: int,
+            content: str,
+            usage: Dict[str, Any],
+            latency_s: float,
+            body: Dict[str, Any],
+        ) -> None:
+            size = max(1, mock.settings.stream_chunk_chars)
+            pieces = [content[i : i + size] for i in range(0, len(content), size)] or [""]
+            # Half the latency before the first token, the rest spread over chunks
+            first_token_s = latency_s / 2
+            per_chunk_s = (latency_s - first_token_s) / len(pieces)
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            def emit(payload: Dict[str, Any] | str) -> None:
+                data = payload if isinstance(payload, str) else json.dumps(payload)
+                self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            def chunk(delta: Dict[str, Any], finish: str | None = None) -> Dict[str, Any]:
+                return {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                }
+
+            time.sleep(first_token_s)
+            emit(chunk({"role": "assistant", "content": ""}))
+            for piece in pieces:
+                emit(chunk({"content": piece}))
+                time.sleep(per_chunk_s)
+            emit(chunk({}, "stop"))
+            if (body.get("stream_options") or {}).get("include_usage"):
+                final = chunk({})
+                final["choices"] = []
+                final["usage"] = usage
+                emit(final)
+            emit("[DONE]")
+
+    return Handler
+
+
+class MockLLMServer:
+    """Threaded mock server; use as a context manager or call start()/stop()."""
+
+    def __init__(
+        self,
+        settings: MockSettings | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.mock = MockLLM(settings)
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self.mock))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help='Latency model: "fixed:MS", "uniform:MIN:MAX" or "lognormal:MEDIAN:SIGMA"',
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ocr-text", default="Mock OCR text")
+    args = parser.parse_args(argv)
+
+    settings = MockSettings(
+        latency=LatencyModel.parse(args.latency),
+        error_rate=min(max(args.error_rate, 0.0), 1.0),
+        error_status=args.error_status,
+        seed=args.seed,
+        ocr_text=args.ocr_text,
+    )
+    server = MockLLMServer(settings, host=args.host, port=args.port)
+    print(f"Mock LLM server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["LatencyModel", "MockLLM", "MockLLMServer", "MockSettings", "main"]
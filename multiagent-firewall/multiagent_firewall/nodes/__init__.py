@@ -5,6 +5,8 @@ from .detection import (
     run_code_similarity_detector,
 )
 from .document import read_document, llm_ocr_document
+from .gating import evaluate_llm_gate
+from .speculative import start_speculative_llm
 from .policy import apply_policy, generate_remediation
 from .risk import evaluate_risk
 from .preprocessing import merge_detections, normalize
@@ -21,6 +23,8 @@ __all__ = [
     "run_dlp_detector",
     "run_ner_detector",
     "run_code_similarity_detector",
+    "evaluate_llm_gate",
+    "start_speculative_llm",
     "evaluate_risk",
     "apply_policy",
     "generate_remediation",
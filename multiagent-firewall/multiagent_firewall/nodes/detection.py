@@ -1,95 +1,392 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from typing import Any, Callable
+
 from ..detectors import GlinerNERDetector, LiteLLMDetector, CodeSimilarityDetector
+from ..detectors.budget import apply_token_budget
+from ..detectors.cascade import CASCADE_STATS, assess_uncertainty
 from ..detectors.dlp import detect_checksums, detect_keywords, detect_regex_patterns
+from ..detectors.resilience import get_provider_guard
 from ..config.detection import KEYWORDS, REGEX_PATTERNS
 from ..types import FieldList, GuardState
-from ..utils import append_error
+from ..utils import append_error, append_warning
+from ..utils.exceptions import ProviderUnavailableError
+from ..metrics import record_llm_usage
+from ..utils.matching import AhoCorasickMatcher
+from .speculative import (
+    merge_speculative_state,
+    shared_detection,
+    take_speculative_llm,
+)
 
 
 async def run_llm_detector(state: GuardState, *, fw_config) -> GuardState:
     """
     Run LLM-based detection
+
+    When a fast LLM tier is configured (`llm_fast`), it runs first and the text
+    is only escalated to the primary model if the fast output is uncertain.
+
+    When a speculative call was started once DLP finished, its result is
+    reconciled here with the later findings instead of issuing a new request.
+
+    Inputs over the model's `max_input_tokens` are truncated, head+tail
+    sampled or chunked per `overflow_policy`, with a warning.
     """
     text = state.get("anonymized_text") or state.get("normalized_text") or ""
     anonymized_map = (
         state.get("metadata", {}).get("llm_anonymized_values", {}).get("mapping", {})
         or {}
     )
-    reverse_map = {}
-    for original, token in anonymized_map.items():
-        reverse_map.setdefault(token, set()).add(original)
-
-    anonymized_tokens = set(reverse_map.keys())
-    anonymized_stripped = {token.strip("<>") for token in anonymized_tokens}
-    anonymized_originals = {
-        value for value in anonymized_map.keys() if isinstance(value, str)
-    }
-    anonymized_originals_normalized = {
-        value.strip().lower()
-        for value in anonymized_originals
-        if isinstance(value, str) and value.strip()
-    }
+    speculative = take_speculative_llm(state)
+    unmasked = 0
+    if speculative is not None:
+        # Values found after the call was sent (NER, code similarity) were not
+        # masked in it; they are unioned so the LLM cannot reintroduce them
+        unmasked = sum(
+            1 for value in anonymized_map if value not in speculative.mapping
+        )
+        anonymized_map = {**speculative.mapping, **anonymized_map}
+    is_anonymized_value = _anonymized_value_checker(anonymized_map)
 
     if not text:
+        if speculative is not None:
+            speculative.task.cancel()
         state["llm_fields"] = []
         return state
     try:
-        llm_config = fw_config.llm
-        llm_detector = LiteLLMDetector(
-            provider=llm_config.provider,
-            model=llm_config.model,
-            client_params=llm_config.client_params,
+        speculative_result = (
+            await _await_speculative(state, speculative, unmasked)
+            if speculative is not None
+            else None
         )
-        result = await llm_detector.acall(text)
-        fields = []
-        for item in result.get("detected_fields", []):
-            if not isinstance(item, dict):
-                continue
-            value = item.get("value")
-            if isinstance(value, str):
-                value_normalized = value.strip().lower()
-                if (
-                    value in anonymized_tokens
-                    or _is_redacted_token(value)
-                    or _is_anonymized_token(value)
-                    or value in anonymized_stripped
-                    or f"REDACTED:{value.upper()}" in anonymized_stripped
-                    or _contains_anonymized_token(
-                        value, anonymized_tokens, anonymized_stripped
-                    )
-                    or value in anonymized_originals
-                    or value_normalized in anonymized_originals_normalized
-                ):
-                    # Skip anonymized tokens and any mapped originals to avoid reintroducing redacted data
-                    continue
-            raw_sources = item.get("sources")
-            if raw_sources is None:
-                raw_sources = item.get("source")
-            if isinstance(raw_sources, list):
-                source_items = raw_sources
-            elif raw_sources is None:
-                source_items = []
-            else:
-                source_items = [raw_sources]
-            normalized_sources: list[str] = []
-            for raw_source in source_items:
-                normalized = _normalize_llm_source(raw_source)
-                if normalized and normalized not in normalized_sources:
-                    normalized_sources.append(normalized)
-            if not normalized_sources:
-                normalized_sources.append("llm_explicit")
-            cleaned = {k: v for k, v in item.items() if k not in ("source", "sources")}
-            cleaned["sources"] = normalized_sources
-            fields.append(cleaned)
+        if speculative_result is not None:
+            merge_speculative_state(state, speculative)
+            fields = _collect_llm_fields(
+                {"detected_fields": speculative_result}, is_anonymized_value
+            )
+        else:
+            pieces = _budget_llm_input(state, text, fw_config.llm)
+            fields = await _detect_llm_pieces(
+                state, pieces, fw_config, is_anonymized_value
+            )
         state["llm_fields"] = fields
+    except ProviderUnavailableError as exc:
+        append_warning(
+            state,
+            f"LLM detector skipped, falling back to DLP/NER-only detection: {exc}",
+        )
+        state.setdefault("metadata", {})["llm_degraded"] = True
+        state["llm_fields"] = []
     except Exception as exc:
         append_error(state, f"LLM detector failed: {exc}")
         state["llm_fields"] = []
     return state
 
 
+async def _detect_llm_fields(
+    state: GuardState,
+    text: str,
+    fw_config,
+    is_anonymized_value: Callable[[str], bool],
+) -> FieldList:
+    if getattr(fw_config, "llm_fast", None) is not None:
+        return await _run_llm_cascade(state, text, fw_config, is_anonymized_value)
+    result = await _call_llm(state, fw_config.llm, fw_config, text)
+    return _collect_llm_fields(result, is_anonymized_value)
+
+
+async def _detect_llm_pieces(
+    state: GuardState,
+    pieces: list[str],
+    fw_config,
+    is_anonymized_value: Callable[[str], bool],
+) -> FieldList:
+    """
+    Detect each piece of a budgeted input, a few chunks at a time.
+
+    A failed chunk is reported and skipped; the call only fails when every
+    chunk failed.
+    """
+    if len(pieces) == 1:
+        return await _detect_llm_fields(
+            state, pieces[0], fw_config, is_anonymized_value
+        )
+    semaphore = asyncio.Semaphore(_chunk_concurrency(fw_config))
+
+    async def _detect(piece: str) -> FieldList:
+        async with semaphore:
+            return await _detect_llm_fields(
+                state, piece, fw_config, is_anonymized_value
+            )
+
+    results = await asyncio.gather(
+        *(_detect(piece) for piece in pieces), return_exceptions=True
+    )
+    fields: FieldList = []
+    failures: list[Exception] = []
+    for result in results:
+        if isinstance(result, Exception):
+            failures.append(result)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            fields.extend(result)
+    if len(failures) == len(results):
+        # Report a real error over the provider being unavailable
+        raise next(
+            (f for f in failures if not isinstance(f, ProviderUnavailableError)),
+            failures[0],
+        )
+    if failures:
+        metadata = state.setdefault("metadata", {})
+        metadata.setdefault("llm_input_budget", {})["failed_chunks"] = len(failures)
+        if any(isinstance(f, ProviderUnavailableError) for f in failures):
+            metadata["llm_degraded"] = True
+        append_warning(
+            state,
+            f"LLM detector failed for {len(failures)} of {len(pieces)} chunks, "
+            f"kept the findings of the others: {failures[0]}",
+        )
+    return fields
+
+
+def _chunk_concurrency(fw_config) -> int:
+    """Chunks in flight for one request: at most half the provider's limit."""
+    llm_config = fw_config.llm
+    guard = get_provider_guard(
+        llm_config.provider,
+        llm_config.client_params,
+        getattr(fw_config, "llm_resilience", None),
+        model=llm_config.model,
+    )
+    configured = getattr(llm_config, "chunk_concurrency", 2)
+    return max(1, min(configured, guard.limiter.limit // 2))
+
+
+def _budget_llm_input(state: GuardState, text: str, llm_config) -> list[str]:
+    """Split or reduce the LLM input to the configured token budget."""
+    max_tokens = getattr(llm_config, "max_input_tokens", None)
+    policy = getattr(llm_config, "overflow_policy", "truncate")
+    budgeted = apply_token_budget(text, max_tokens, policy, model=llm_config.model)
+    if max_tokens and budgeted.estimated_tokens > max_tokens:
+        state.setdefault("metadata", {})["llm_input_budget"] = {
+            "estimated_tokens": budgeted.estimated_tokens,
+            "max_input_tokens": max_tokens,
+            "policy": policy,
+            "pieces": len(budgeted.pieces),
+            "dropped_chunks": budgeted.dropped_chunks,
+        }
+    if budgeted.reduced:
+        dropped = (
+            f", {budgeted.dropped_chunks} chunk(s) dropped"
+            if budgeted.dropped_chunks
+            else ""
+        )
+        append_warning(
+            state,
+            f"LLM input reduced to fit {max_tokens} tokens "
+            f"(~{budgeted.estimated_tokens} estimated, policy={policy}{dropped})",
+        )
+    return budgeted.pieces
+
+
+async def _await_speculative(
+    state: GuardState, speculative, unmasked: int
+) -> FieldList | None:
+    """Wait for a speculative LLM call; None means fall back to a regular call."""
+    waited = time.perf_counter()
+    info: dict[str, Any] = {
+        "redacted_values": len(speculative.mapping),
+        "unmasked_values": unmasked,
+    }
+    try:
+        result = await speculative.task
+    except ProviderUnavailableError:
+        raise
+    except Exception as exc:
+        info["used"] = False
+        info["error"] = str(exc)
+        result = None
+    else:
+        info["used"] = True
+    info["wait_ms"] = _elapsed_ms(waited)
+    info["total_ms"] = _elapsed_ms(speculative.started)
+    state.setdefault("metadata", {})["llm_speculative"] = info
+    return result
+
+
+def _build_llm_detector(llm_config, fw_config) -> LiteLLMDetector:
+    return LiteLLMDetector(
+        provider=llm_config.provider,
+        model=llm_config.model,
+        client_params=llm_config.client_params,
+        resilience=getattr(fw_config, "llm_resilience", None),
+        output_format=getattr(llm_config, "output_format", "values"),
+        prompt_cache=getattr(llm_config, "prompt_cache", True),
+    )
+
+
+async def _call_llm(state: GuardState, llm_config, fw_config, text: str) -> dict:
+    result = await _build_llm_detector(llm_config, fw_config).acall(text)
+    _record_llm_usage(state, result)
+    return result
+
+
+def _record_llm_usage(state: GuardState, result) -> None:
+    """Account tokens, cost, latency and retries of one LLM detector call."""
+    if not isinstance(result, dict):
+        return
+    record_llm_usage(
+        state, "llm_detector", result.get("_usage"), model=result.get("_model_used")
+    )
+
+
+async def _run_llm_cascade(
+    state: GuardState,
+    text: str,
+    fw_config,
+    is_anonymized_value: Callable[[str], bool],
+) -> FieldList:
+    """Run the fast tier and escalate to the primary model only on uncertainty."""
+    fast_config = fw_config.llm_fast
+    primary_config = fw_config.llm
+    cascade: dict[str, Any] = {
+        "fast_model": fast_config.model,
+        "primary_model": primary_config.model,
+        "latency_ms": {},
+    }
+
+    started = time.perf_counter()
+    try:
+        fast_result = await _call_llm(state, fast_config, fw_config, text)
+    except ProviderUnavailableError:
+        fast_result = {"detected_fields": [], "_error": "fast tier unavailable"}
+    cascade["latency_ms"]["fast"] = _elapsed_ms(started)
+
+    reasons = assess_uncertainty(fast_result)
+    cascade["escalated"] = bool(reasons)
+    cascade["reasons"] = reasons
+
+    try:
+        if not reasons:
+            return _collect_llm_fields(fast_result, is_anonymized_value)
+
+        started = time.perf_counter()
+        try:
+            primary_result = await _call_llm(state, primary_config, fw_config, text)
+        except ProviderUnavailableError as exc:
+            if fast_result.get("_error"):
+                raise
+            append_warning(
+                state, f"LLM cascade kept fast-tier findings, primary unavailable: {exc}"
+            )
+            return _collect_llm_fields(fast_result, is_anonymized_value)
+        finally:
+            cascade["latency_ms"]["primary"] = _elapsed_ms(started)
+        return _collect_llm_fields(primary_result, is_anonymized_value)
+    finally:
+        cascade["escalation_rate"] = CASCADE_STATS.record(bool(reasons))
+        _merge_cascade(state.setdefault("metadata", {}), cascade)
+
+
+def _merge_cascade(metadata: dict, cascade: dict[str, Any]) -> None:
+    """Fold the cascade outcome of one chunk into `metadata["llm_cascade"]`."""
+    merged = metadata.get("llm_cascade")
+    if merged is None:
+        metadata["llm_cascade"] = {
+            **cascade,
+            "chunks": 1,
+            "escalated_chunks": int(cascade["escalated"]),
+        }
+        return
+    merged["chunks"] += 1
+    merged["escalated_chunks"] += int(cascade["escalated"])
+    merged["escalated"] = merged["escalated"] or cascade["escalated"]
+    merged["reasons"] = list(dict.fromkeys(merged["reasons"] + cascade["reasons"]))
+    # Summed over chunks: time spent in each tier
+    for tier, latency in cascade["latency_ms"].items():
+        merged["latency_ms"][tier] = round(
+            merged["latency_ms"].get(tier, 0.0) + latency, 2
+        )
+    merged["escalation_rate"] = cascade["escalation_rate"]
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _collect_llm_fields(
+    result, is_anonymized_value: Callable[[str], bool]
+) -> FieldList:
+    """Normalize raw LLM findings, dropping anonymized tokens and mapped originals."""
+    fields: FieldList = []
+    for item in result.get("detected_fields", []):
+        if not isinstance(item, dict):
+            continue
+        value = item.get("value")
+        if isinstance(value, str) and is_anonymized_value(value):
+            # Skip anonymized tokens and any mapped originals to avoid reintroducing redacted data
+            continue
+        raw_sources = item.get("sources")
+        if raw_sources is None:
+            raw_sources = item.get("source")
+        if isinstance(raw_sources, list):
+            source_items = raw_sources
+        elif raw_sources is None:
+            source_items = []
+        else:
+            source_items = [raw_sources]
+        normalized_sources: list[str] = []
+        for raw_source in source_items:
+            normalized = _normalize_llm_source(raw_source)
+            if normalized and normalized not in normalized_sources:
+                normalized_sources.append(normalized)
+        if not normalized_sources:
+            normalized_sources.append("llm_explicit")
+        cleaned = {k: v for k, v in item.items() if k not in ("source", "sources")}
+        cleaned["sources"] = normalized_sources
+        fields.append(cleaned)
+    return fields
+
+
+def _anonymized_value_checker(anonymized_map: dict) -> Callable[[str], bool]:
+    """
+    Build a predicate telling whether an LLM value is redacted or a mapped original.
+
+    Built once per request and passed to every tier and chunk of that request.
+    It is not cached across requests: the mapping holds the raw sensitive values.
+    """
+    mapping_items = (anonymized_map or {}).items()
+    anonymized_tokens = {token for _, token in mapping_items}
+    anonymized_stripped = {token.strip("<>") for token in anonymized_tokens}
+    anonymized_originals = {
+        value for value, _ in mapping_items if isinstance(value, str)
+    }
+    anonymized_originals_normalized = {
+        value.strip().lower() for value in anonymized_originals if value.strip()
+    }
+    # Full tokens contain their stripped form, but both are kept to mirror the
+    # original substring semantics for arbitrary token shapes
+    token_matcher = AhoCorasickMatcher(anonymized_tokens | anonymized_stripped)
+
+    def is_anonymized_value(value: str) -> bool:
+        return (
+            value in anonymized_tokens
+            or _is_redacted_token(value)
+            or _is_anonymized_token(value)
+            or value in anonymized_stripped
+            or f"REDACTED:{value.upper()}" in anonymized_stripped
+            or token_matcher.contains_any(value)
+            or value in anonymized_originals
+            or value.strip().lower() in anonymized_originals_normalized
+        )
+
+    return is_anonymized_value
+
+
 def _normalize_llm_source(raw_source: object | None) -> str:
     """Normalize the LLM detector source label so it is identifiable as LLM output."""
     if not raw_source:
@@ -114,26 +411,16 @@ def _is_redacted_token(value: str) -> bool:
     return core.startswith("REDACTED:")
 
 
-def _contains_anonymized_token(
-    value: str, tokens: set[str], stripped_tokens: set[str]
-) -> bool:
-    if not value:
-        return False
-    for token in tokens:
-        if token and token in value:
-            return True
-    for token in stripped_tokens:
-        if token and token in value:
-            return True
-    return False
-
-
 async def run_dlp_detector(state: GuardState) -> GuardState:
     """
     Run DLP detection
 
     Runs regex, keyword and checksum detectors
     """
+    return await shared_detection(state, "dlp", lambda: _run_dlp_detector(state))
+
+
+async def _run_dlp_detector(state: GuardState) -> GuardState:
     text = state.get("normalized_text") or ""
     findings: FieldList = []
     errors: list[str] = []
@@ -168,6 +455,9 @@ async def run_dlp_detector(state: GuardState) -> GuardState:
     else:
         errors.append(f"Checksum detector failed: {checksum_res}")
 
+    # Columns of structured uploads were already profiled by read_document
+    findings.extend(state.get("structured_fields") or [])
+
     update: GuardState = {"dlp_fields": findings}
     if errors:
         update["errors"] = errors
@@ -177,9 +467,13 @@ async def run_dlp_detector(state: GuardState) -> GuardState:
 async def run_ner_detector(state: GuardState, *, fw_config) -> GuardState:
     """
     Run NER-based detection
+
+    Also reads the sampled column values of structured uploads, whose text
+    is replaced by a summary; those findings carry their `column`.
     """
     text = state.get("normalized_text") or ""
-    if not text:
+    samples = state.get("structured_ner_samples") or []
+    if not text and not samples:
         return {"ner_fields": []}
 
     ner_config = getattr(fw_config, "ner", None)
@@ -195,7 +489,9 @@ async def run_ner_detector(state: GuardState, *, fw_config) -> GuardState:
             min_score=ner_config.min_score,
         )
         # Run inference in thread
-        findings = await asyncio.to_thread(ner_detector.detect, text)
+        findings = await asyncio.to_thread(
+            _detect_ner, ner_detector, text, samples
+        )
         return {"ner_fields": findings}
     except Exception as exc:
         return {
@@ -204,6 +500,16 @@ async def run_ner_detector(state: GuardState, *, fw_config) -> GuardState:
         }
 
 
+def _detect_ner(ner_detector, text: str, samples: list[dict]) -> FieldList:
+    findings = ner_detector.detect(text)
+    for sample in samples:
+        findings.extend(
+            {**item, "column": sample["column"]}
+            for item in ner_detector.detect(sample["text"])
+        )
+    return findings
+
+
 async def run_code_similarity_detector(state: GuardState, *, fw_config) -> GuardState:
     """
     Run code similarity detection against a private repository.
@@ -1,19 +1,74 @@
 from __future__ import annotations
 
+import asyncio
+import dataclasses
 import importlib.util
 import logging
 import os
+import shutil
 import sys
+import tempfile
 import warnings
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import Any, Awaitable, Callable
 from urllib.parse import urlparse, unquote
 
 from ..detectors import TesseractOCRDetector, LLMOCRDetector
+from ..detectors.extraction_cache import (
+    extraction_cache_key,
+    file_sha256,
+    get_extraction_cache,
+)
+from ..detectors.ocr_cache import get_ocr_cache, ocr_cache_key
+from ..detectors.ocr_executor import (
+    analyze_ocr,
+    analyze_tiled_ocr,
+    run_in_process,
+    run_ocr,
+)
+from ..detectors.ocr_frames import (
+    FrameSelection,
+    frame_count,
+    frames_for_llm,
+    write_frames,
+)
+from ..detectors.ocr_layout import (
+    OCRLayout,
+    OCRRegion,
+    layout_from_dict,
+    layout_to_dict,
+    merge_region_text,
+    plan_regions,
+)
+from ..detectors.ocr_tiles import (
+    Strip,
+    image_size,
+    merge_overlapping_texts,
+    plan_strips,
+)
+from ..detectors.pdf_text import (
+    PDFPage,
+    iter_pdf_pages,
+    read_pdf_pages,
+    render_pdf_pages,
+    resolve_pdf_backend,
+)
+from ..detectors.structured import (
+    CLEAN,
+    StructuredProfile,
+    profile_structured_file,
+    structured_format,
+)
+from ..detectors.text_presence import image_text_likelihood
+from ..detectors.text_stream import read_normalized_text
+from ..metrics import record_llm_usage
 from ..types import GuardState
 from ..utils import (
     append_error,
     append_warning,
 )
+from ..utils.exceptions import ProviderUnavailableError
 from ..config import FILE_TYPE_CONFIG
 
 logger = logging.getLogger(__name__)
@@ -58,33 +113,26 @@ def is_image_file(file_path: str) -> bool:
     return image_config.is_extension_supported(Path(file_path).suffix)
 
 
-def read_pdf(file_path: str) -> str | None:
+def read_pdf(file_path: str, backend: str = "pdfplumber") -> str | None:
     """
     Extract text from PDF file.
     """
     try:
-        import pdfplumber
-
-        path = Path(file_path)
-
         # Get PDF file type config
         pdf_config = FILE_TYPE_CONFIG.categories.get("pdf")
         if not pdf_config:
             return None
 
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                extracted_text = page.extract_text()
-                if extracted_text:
-                    text += extracted_text + "\n"
-
-        return text.strip()
+        return _join_pdf_pages(read_pdf_pages(file_path, backend))
     except Exception as e:
         logger.warning(f"PDF extraction failed: {e}")
         return None
 
 
+def _join_pdf_pages(pages) -> str:
+    return "\n".join(page for page in pages if page).strip()
+
+
 def read_text_file(file_path: str) -> str | None:
     """
     Read plain text file.
@@ -96,7 +144,9 @@ def read_text_file(file_path: str) -> str | None:
         return None
 
 
-def extract_text_from_file(file_path: str) -> str | None:
+def extract_text_from_file(
+    file_path: str, pdf_backend: str = "pdfplumber"
+) -> str | None:
     """
     Extract text from file based on category from FileTypeConfig.
     """
@@ -110,7 +160,7 @@ def extract_text_from_file(file_path: str) -> str | None:
         file_type_def = FILE_TYPE_CONFIG.get_by_extension(file_path)
 
         if file_type_def and file_type_def.category == "pdf":
-            return read_pdf(file_path)
+            return read_pdf(file_path, pdf_backend)
         else:
             # Try as plain text for text/unknown formats
             return read_text_file(file_path)
@@ -118,19 +168,27 @@ def extract_text_from_file(file_path: str) -> str | None:
         return None
 
 
+@lru_cache(maxsize=8)
+def _cached_tesseract_detector(ocr_config) -> TesseractOCRDetector:
+    return TesseractOCRDetector(
+        lang=ocr_config.lang,
+        config=ocr_config.config,
+        confidence_threshold=ocr_config.confidence_threshold,
+        tesseract_cmd=ocr_config.tesseract_cmd,
+        backend=getattr(ocr_config, "backend", "auto"),
+        pool_size=getattr(ocr_config, "pool_size", None),
+    )
+
+
 def _get_default_ocr_detector(fw_config):
     """
     Get default OCR detector from configuration.
 
+    The detector is reused across images with the same OCR settings.
     Returns None if Tesseract is not available or fails to initialize.
     """
     try:
-        return TesseractOCRDetector(
-            lang=fw_config.ocr.lang,
-            config=fw_config.ocr.config,
-            confidence_threshold=fw_config.ocr.confidence_threshold,
-            tesseract_cmd=fw_config.ocr.tesseract_cmd,
-        )
+        return _cached_tesseract_detector(fw_config.ocr)
     except Exception as e:
         # Log warning but don't crash
         warnings.warn(
@@ -142,73 +200,784 @@ def _get_default_ocr_detector(fw_config):
         return None
 
 
+@dataclasses.dataclass
+class _ImageOCRAttempt:
+    """Outcome of running Tesseract on one image, applied to state later."""
+
+    # "ok" | "cached" | "no_text" | "unsupported" | "no_detector" | "error"
+    status: str
+    text: str = ""
+    error: Exception | None = None
+    text_score: float | None = None
+    # Set when only some lines need the LLM (region fallback)
+    layout: OCRLayout | None = None
+    regions: list[OCRRegion] | None = None
+    # Set when the text is too unreliable for regions; the LLM reads it whole
+    low_confidence: bool = False
+    tiles: int = 0
+    frames: FrameSelection | None = None
+    # Frames not OCRed because they scored below the prefilter
+    prefiltered: int = 0
+
+
+async def _plan_ocr_strips(
+    file_path_clean: str, fw_config
+) -> tuple[int, list[Strip]] | None:
+    """Return (width, strips) when an image is tall enough to be OCRed in strips."""
+    ocr = fw_config.ocr
+    if not getattr(ocr, "tiling", False):
+        return None
+    size = await asyncio.to_thread(image_size, file_path_clean)
+    if size is None or size[1] <= ocr.tile_height:
+        return None
+    width, height = size
+    return width, plan_strips(height, ocr.tile_height, ocr.tile_overlap)
+
+
+async def _ocr_image(
+    file_path_clean: str, fw_config, semaphore: asyncio.Semaphore
+) -> _ImageOCRAttempt:
+    """
+    Run Tesseract on an image off the event loop.
+
+    Does not touch the state so several images can run concurrently.
+    """
+    cache = get_ocr_cache(getattr(fw_config, "ocr_cache", None))
+    cache_key = None
+    if cache is not None:
+        # Hashing the image (and a disk cache) would block the event loop
+        cache_key = await asyncio.to_thread(
+            ocr_cache_key,
+            file_path_clean,
+            "tesseract",
+            _tesseract_cache_settings(fw_config),
+        )
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not None:
+            return _ImageOCRAttempt("cached", cached)
+
+    # Multi-frame images are scored and OCRed frame by frame
+    multi_frame = await asyncio.to_thread(frame_count, file_path_clean) > 1
+
+    # Images unlikely to contain text skip both OCR tiers (opt-in)
+    text_score = None
+    if getattr(fw_config.ocr, "text_prefilter", False) and not multi_frame:
+        text_score = await asyncio.to_thread(image_text_likelihood, file_path_clean)
+        threshold = fw_config.ocr.text_prefilter_threshold
+        if text_score is not None and text_score < threshold:
+            return _ImageOCRAttempt("no_text", text_score=text_score)
+
+    if not _has_ocr_support():
+        return _ImageOCRAttempt("unsupported", text_score=text_score)
+
+    ocr_detector = _get_default_ocr_detector(fw_config)
+    if not ocr_detector:
+        return _ImageOCRAttempt("no_detector", text_score=text_score)
+
+    if multi_frame:
+        return await _ocr_frames(
+            file_path_clean, ocr_detector, fw_config, semaphore, cache, cache_key
+        )
+
+    use_processes = getattr(fw_config.ocr, "process_pool", False)
+    workers = getattr(fw_config.ocr, "workers", None)
+    region_fallback = getattr(fw_config.ocr, "region_fallback", False)
+    try:
+        # Layout-based OCR (strips, regions) needs the built-in Tesseract detector
+        tesseract = isinstance(ocr_detector, TesseractOCRDetector)
+        tiling = (
+            await _plan_ocr_strips(file_path_clean, fw_config) if tesseract else None
+        )
+        if tesseract and (tiling or region_fallback):
+            async with semaphore:
+                if tiling:
+                    layout = await analyze_tiled_ocr(
+                        ocr_detector,
+                        file_path_clean,
+                        tiling[1],
+                        use_processes=use_processes,
+                        workers=workers,
+                    )
+                else:
+                    layout = await analyze_ocr(
+                        ocr_detector,
+                        file_path_clean,
+                        use_processes=use_processes,
+                        workers=workers,
+                    )
+            text = layout.text
+            tiles = len(tiling[1]) if tiling else 0
+            regions = (
+                plan_regions(
+                    layout,
+                    min_confidence=fw_config.ocr.region_confidence,
+                    max_regions=fw_config.ocr.max_regions,
+                )
+                if region_fallback
+                else None
+            )
+            if text and regions:
+                # Partial text is not cached; the merged result depends on the LLM
+                return _ImageOCRAttempt(
+                    "ok",
+                    text,
+                    text_score=text_score,
+                    layout=layout,
+                    regions=regions,
+                    tiles=tiles,
+                )
+            if text and region_fallback and regions is None:
+                # Nor is text the LLM re-reads as a whole
+                return _ImageOCRAttempt(
+                    "ok", text, text_score=text_score, low_confidence=True, tiles=tiles
+                )
+            if cache is not None:
+                await asyncio.to_thread(cache.set, cache_key, text)
+            return _ImageOCRAttempt("ok", text, text_score=text_score, tiles=tiles)
+        else:
+            async with semaphore:
+                text = await run_ocr(
+                    ocr_detector,
+                    file_path_clean,
+                    use_processes=use_processes,
+                    workers=workers,
+                )
+        text = text or ""
+        if cache is not None:
+            await asyncio.to_thread(cache.set, cache_key, text)
+        return _ImageOCRAttempt("ok", text, text_score=text_score)
+    except Exception as e:
+        return _ImageOCRAttempt("error", error=e, text_score=text_score)
+
+
+async def _ocr_frames(
+    file_path_clean: str,
+    ocr_detector,
+    fw_config,
+    semaphore: asyncio.Semaphore,
+    cache,
+    cache_key: str | None,
+) -> _ImageOCRAttempt:
+    """
+    OCR the distinct frames (or pages) of a multi-frame image, one batch of
+    `ocr.max_frames` frames at a time; the frames of a batch run concurrently.
+    """
+    ocr = fw_config.ocr
+    selection = FrameSelection()
+    text_score = None
+    prefiltered = 0
+    ocred = 0
+    texts: list[str] = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="ocr-frames-") as directory:
+            batches = write_frames(file_path_clean, directory, ocr, selection)
+            try:
+                while frame_paths := await asyncio.to_thread(next, batches, None):
+                    kept = frame_paths
+                    if getattr(ocr, "text_prefilter", False):
+                        scores = await asyncio.gather(
+                            *(
+                                asyncio.to_thread(image_text_likelihood, path)
+                                for path in frame_paths
+                            )
+                        )
+                        known = [s for s in (*scores, text_score) if s is not None]
+                        text_score = max(known) if known else None
+                        kept = [
+                            path
+                            for path, score in zip(frame_paths, scores)
+                            if score is None or score >= ocr.text_prefilter_threshold
+                        ]
+                        prefiltered += len(frame_paths) - len(kept)
+                    async with semaphore:
+                        texts.extend(
+                            await asyncio.gather(
+                                *(_run_frame_ocr(ocr_detector, p, ocr) for p in kept)
+                            )
+                        )
+                    ocred += len(kept)
+                    # Only one batch of frames is on disk at a time
+                    for path in frame_paths:
+                        os.remove(path)
+            finally:
+                batches.close()
+    except Exception as e:
+        return _ImageOCRAttempt("error", error=e, text_score=text_score)
+
+    if prefiltered and not ocred:
+        return _ImageOCRAttempt("no_text", text_score=text_score, frames=selection)
+    text = " ".join(text for text in texts if text)
+    if cache is not None:
+        await asyncio.to_thread(cache.set, cache_key, text)
+    return _ImageOCRAttempt(
+        "ok", text, text_score=text_score, frames=selection, prefiltered=prefiltered
+    )
+
+
+async def _run_frame_ocr(ocr_detector, frame_path: str, ocr) -> str | None:
+    return await run_ocr(
+        ocr_detector,
+        frame_path,
+        use_processes=getattr(ocr, "process_pool", False),
+        workers=getattr(ocr, "workers", None),
+    )
+
+
 def _process_image_file(
-    file_path_clean: str, state: GuardState, fw_config
+    file_path_clean: str, state: GuardState, attempt: _ImageOCRAttempt
 ) -> str | None:
     """
-    Process an image file with OCR.
+    Apply the OCR outcome of an image file to the state.
 
     Returns extracted text or None if extraction failed.
     """
-    if not _has_ocr_support():
+    if "metadata" not in state:
+        state["metadata"] = {}
+    if attempt.text_score is not None:
+        state["metadata"].setdefault("image_text_scores", {})[
+            file_path_clean
+        ] = attempt.text_score
+
+    if attempt.frames is not None:
+        selection = attempt.frames
+        state["metadata"].setdefault("ocr_frames", {})[
+            file_path_clean
+        ] = selection.as_dict()
+        if selection.truncated:
+            _warn_frames_truncated(state, file_path_clean, selection)
+
+    if attempt.tiles:
+        state["metadata"].setdefault("ocr_tiled_images", {})[
+            file_path_clean
+        ] = attempt.tiles
+
+    if attempt.status == "no_text" or attempt.prefiltered:
+        state["metadata"].setdefault("ocr_skipped_images", []).append(file_path_clean)
+        skipped = (
+            f"{attempt.prefiltered} frame(s) of {file_path_clean}"
+            if attempt.prefiltered
+            else file_path_clean
+        )
         append_warning(
             state,
-            "Image file detected but OCR dependencies are not installed. "
-            f"Install {FILE_ANALYSIS_EXTRA} and Tesseract.",
+            f"OCR skipped {skipped}: text score below "
+            "OCR_TEXT_PREFILTER_THRESHOLD; any text in it is not scanned",
         )
-        if "metadata" not in state:
-            state["metadata"] = {}
-        if "images_needing_llm_ocr" not in state["metadata"]:
-            state["metadata"]["images_needing_llm_ocr"] = []
-        state["metadata"]["images_needing_llm_ocr"].append(file_path_clean)
+    if attempt.status == "no_text":
         return None
 
-    ocr_detector = _get_default_ocr_detector(fw_config)
-    if not ocr_detector:
+    if attempt.status == "cached":
+        _record_ocr_cache_hit(state)
+        return _handle_tesseract_text(file_path_clean, state, attempt.text)
+
+    if attempt.status == "ok":
+        if attempt.text and attempt.regions and attempt.layout is not None:
+            return _queue_llm_ocr_regions(file_path_clean, state, attempt)
+        if attempt.low_confidence:
+            append_warning(
+                state,
+                f"Tesseract text of {file_path_clean} has too many "
+                "low-confidence lines; queued for LLM OCR",
+            )
+            _queue_llm_ocr(file_path_clean, state)
+        return _handle_tesseract_text(file_path_clean, state, attempt.text)
+
+    if attempt.status == "unsupported":
+        append_warning(
+            state,
+            "Image file detected but OCR dependencies are not installed. "
+            f"Install {FILE_ANALYSIS_EXTRA} and Tesseract.",
+        )
+    elif attempt.status == "no_detector":
         append_warning(
             state,
             f"Image file detected but no OCR detector available: {file_path_clean}",
         )
-        if "metadata" not in state:
-            state["metadata"] = {}
-        if "images_needing_llm_ocr" not in state["metadata"]:
-            state["metadata"]["images_needing_llm_ocr"] = []
+    else:
+        append_error(
+            state, f"OCR detection failed for {file_path_clean}: {str(attempt.error)}"
+        )
+
+    _queue_llm_ocr(file_path_clean, state)
+    return None
+
+
+def _warn_frames_truncated(
+    state: GuardState, file_path_clean: str, selection: FrameSelection
+) -> None:
+    kind = "pages" if selection.paged else "frames"
+    append_warning(
+        state,
+        f"Only the first {len(selection.indices)} distinct {kind} of "
+        f"{file_path_clean} were OCRed",
+    )
+
+
+def _queue_llm_ocr(file_path_clean: str, state: GuardState) -> None:
+    if "metadata" not in state:
+        state["metadata"] = {}
+    if "images_needing_llm_ocr" not in state["metadata"]:
+        state["metadata"]["images_needing_llm_ocr"] = []
+    if file_path_clean not in state["metadata"]["images_needing_llm_ocr"]:
         state["metadata"]["images_needing_llm_ocr"].append(file_path_clean)
+
+
+def _handle_tesseract_text(file_path_clean: str, state: GuardState, text: str) -> str:
+    if "metadata" not in state:
+        state["metadata"] = {}
+    state["metadata"]["ocr_attempted"] = True
+    state["metadata"]["tesseract_text_found"] = bool(text)
+
+    if text:
+        state["metadata"]["ocr_method"] = "tesseract"
+    else:
+        append_warning(state, f"No text extracted from image: {file_path_clean}")
+        _queue_llm_ocr(file_path_clean, state)
+
+    return text
+
+
+def _queue_llm_ocr_regions(
+    file_path_clean: str, state: GuardState, attempt: _ImageOCRAttempt
+) -> str:
+    """Keep Tesseract's text and queue only its low-confidence regions for LLM OCR."""
+    state["metadata"]["ocr_attempted"] = True
+    state["metadata"]["tesseract_text_found"] = True
+    state["metadata"]["ocr_method"] = "tesseract"
+    state["metadata"].setdefault("llm_ocr_regions", []).append(
+        {
+            "path": file_path_clean,
+            "tesseract_text": attempt.text,
+            "lines": layout_to_dict(attempt.layout),  # type: ignore[arg-type]
+            "regions": [
+                {"box": list(region.box), "line_indices": list(region.line_indices)}
+                for region in attempt.regions or []
+            ],
+        }
+    )
+    return attempt.text
+
+
+def _tesseract_cache_settings(fw_config) -> dict:
+    ocr = fw_config.ocr
+    return {
+        "lang": ocr.lang,
+        "config": ocr.config,
+        "confidence_threshold": ocr.confidence_threshold,
+        "backend": getattr(ocr, "backend", "auto"),
+        "tiles": _tile_cache_settings(ocr),
+        "frames": _frame_cache_settings(ocr),
+        # Prefiltered frames are left out of the text
+        "prefilter": (
+            ocr.text_prefilter_threshold
+            if getattr(ocr, "text_prefilter", False)
+            else None
+        ),
+    }
+
+
+def _tile_cache_settings(ocr) -> list | None:
+    if not getattr(ocr, "tiling", False):
         return None
+    return [ocr.tile_height, ocr.tile_overlap]
 
-    try:
-        temp_state: dict = dict(state)  # type: ignore
-        temp_state["file_path"] = file_path_clean
 
-        text = ocr_detector(temp_state) or ""  # type: ignore
+def _frame_cache_settings(ocr) -> list:
+    return [
+        getattr(ocr, "frame_sampling", "uniform"),
+        getattr(ocr, "max_frames", 16),
+        getattr(ocr, "max_pages", 200),
+        getattr(ocr, "frame_hash_distance", 6),
+    ]
+
 
-        if "metadata" not in state:
-            state["metadata"] = {}
-        state["metadata"]["ocr_attempted"] = True
-        state["metadata"]["tesseract_text_found"] = bool(text)
+def _llm_ocr_cache_settings(llm_ocr_settings, fw_config) -> dict:
+    image = getattr(fw_config, "llm_ocr_image", None)
+    return {
+        "provider": llm_ocr_settings.provider,
+        "model": llm_ocr_settings.model,
+        "image": dataclasses.asdict(image) if image is not None else None,
+        "tiles": _tile_cache_settings(fw_config.ocr),
+        "frames": _frame_cache_settings(fw_config.ocr),
+    }
+
+
+def _record_ocr_cache_hit(state: GuardState) -> None:
+    if "metadata" not in state:
+        state["metadata"] = {}
+    metadata = state["metadata"]
+    metadata["ocr_cache_hits"] = metadata.get("ocr_cache_hits", 0) + 1
+
+
+def _start_extraction(
+    file_paths: list, fw_config, digests: dict | None = None
+) -> dict[int, asyncio.Task]:
+    """
+    Schedule extraction of every readable file, keyed by its index in file_paths.
 
-        if text:
-            state["metadata"]["ocr_method"] = "tesseract"
+    Images are OCRed (at most `ocr.max_concurrency` at a time), PDFs parsed in
+    the worker pool (or a thread when small) and text files read in a thread.
+    PDFs and text files are first looked up in the extraction cache; `digests`
+    maps file paths to their SHA-256 when the caller already computed it.
+    """
+    semaphore = asyncio.Semaphore(
+        max(1, getattr(fw_config.ocr, "max_concurrency", 1))
+    )
+    digests = digests or {}
+    tasks: dict[int, asyncio.Task] = {}
+    for index, file_path in enumerate(file_paths):
+        if not isinstance(file_path, str):
+            continue
+        try:
+            file_path_clean = sanitize_file_path(file_path)
+            if not os.path.exists(file_path_clean):
+                continue
+            file_type_def = FILE_TYPE_CONFIG.get_by_extension(file_path_clean)
+        except Exception:
+            # Reported by the sequential pass in read_document
+            continue
+        if not file_type_def:
+            continue
+        category = file_type_def.category
+        if category == "image":
+            coroutine = _ocr_image(file_path_clean, fw_config, semaphore)
+        elif category == "pdf" and _has_pdf_support():
+            coroutine = _extract_cached(
+                file_path_clean,
+                category,
+                partial(_extract_pdf, file_path_clean, fw_config, semaphore),
+                fw_config,
+                digests.get(file_path),
+            )
+        elif category == "text":
+            coroutine = _extract_cached(
+                file_path_clean,
+                category,
+                partial(_extract_text_file, file_path_clean, fw_config),
+                fw_config,
+                digests.get(file_path),
+            )
         else:
-            append_warning(state, f"No text extracted from image: {file_path_clean}")
-            if "images_needing_llm_ocr" not in state["metadata"]:
-                state["metadata"]["images_needing_llm_ocr"] = []
-            state["metadata"]["images_needing_llm_ocr"].append(file_path_clean)
+            continue
+        tasks[index] = asyncio.create_task(coroutine)
+    return tasks
 
-        return text
+
+@dataclasses.dataclass
+class _FileExtraction:
+    """Extraction of a PDF or text file, or its entry from the extraction cache."""
+
+    result: Any = None
+    cache_key: str | None = None
+    cached: dict | None = None
+
+
+def _read_text_upload(file_path_clean: str, fw_config) -> str | None:
+    """
+    Read a text file. Large files are streamed and come back already
+    normalized, so their raw text is never held as one string.
+    """
+    document = getattr(fw_config, "document", None)
+    if (
+        document is not None
+        and os.path.getsize(file_path_clean) >= document.text_stream_min_bytes
+    ):
+        return read_normalized_text(file_path_clean)
+    return extract_text_from_file(file_path_clean)
+
+
+def _is_structured_upload(file_path_clean: str, document) -> bool:
+    return bool(
+        document is not None
+        and document.structured_scan
+        and structured_format(file_path_clean) is not None
+        and os.path.getsize(file_path_clean) >= document.structured_min_bytes
+    )
+
+
+async def _extract_text_file(
+    file_path_clean: str, fw_config
+) -> str | StructuredProfile | None:
+    """
+    Read a text file, or profile its columns when it is a large CSV/JSON file.
+    Files that do not parse as records are read as text.
+    """
+    document = getattr(fw_config, "document", None)
+    if _is_structured_upload(file_path_clean, document):
+        args = (
+            file_path_clean,
+            document.structured_sample_rows,
+            document.structured_sensitive_ratio,
+        )
+        try:
+            if document.process_pool:
+                profile = await run_in_process(
+                    profile_structured_file,
+                    *args,
+                    workers=getattr(fw_config.ocr, "workers", None),
+                )
+            else:
+                profile = await asyncio.to_thread(profile_structured_file, *args)
+        except Exception as e:
+            logger.warning(f"Structured scan failed: {e}")
+            profile = None
+        if profile is not None:
+            return profile
+    return await asyncio.to_thread(_read_text_upload, file_path_clean, fw_config)
+
+
+def _extraction_cache_settings(category: str, fw_config) -> dict:
+    document = getattr(fw_config, "document", None)
+    if category == "text":
+        # Streamed files are cached normalized, structured ones as a summary
+        settings: dict = {
+            "stream_min_bytes": getattr(document, "text_stream_min_bytes", None)
+        }
+        if document is not None and document.structured_scan:
+            settings["structured"] = [
+                document.structured_min_bytes,
+                document.structured_sample_rows,
+                document.structured_sensitive_ratio,
+            ]
+        return settings
+    if category != "pdf":
+        return {}
+    if document is None:
+        return {"backend": "pdfplumber"}
+    settings: dict = {
+        "backend": resolve_pdf_backend(document.pdf_backend),
+        "pdf_ocr": document.pdf_ocr,
+    }
+    if document.pdf_ocr:
+        # Scanned pages go through image OCR, so its settings shape the text
+        settings["pages"] = [
+            document.pdf_ocr_min_image_coverage,
+            document.pdf_ocr_dpi,
+            document.pdf_ocr_max_pages,
+        ]
+        settings["ocr"] = dataclasses.asdict(fw_config.ocr)
+    return settings
+
+
+async def _extract_cached(
+    file_path_clean: str,
+    category: str,
+    extract: Callable[[], Awaitable[Any]],
+    fw_config,
+    digest: str | None = None,
+) -> _FileExtraction:
+    """Serve a file from the extraction cache, or extract it with `extract`."""
+    cache = get_extraction_cache(getattr(fw_config, "extraction_cache", None))
+    if cache is None:
+        return _FileExtraction(await extract())
+    if digest is None:
+        digest = await asyncio.to_thread(file_sha256, file_path_clean)
+    if digest is None:
+        return _FileExtraction(await extract())
+    key = extraction_cache_key(
+        digest, category, _extraction_cache_settings(category, fw_config)
+    )
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None and isinstance(cached.get("text"), str):
+        return _FileExtraction(cache_key=key, cached=cached)
+    return _FileExtraction(await extract(), key)
+
+
+def _apply_structured_scan(
+    file_path_clean: str, state: GuardState, structured: dict
+) -> None:
+    """Record the column findings, NER samples and profile of a structured upload."""
+    fields, profile = structured["fields"], structured["profile"]
+    state.setdefault("structured_fields", []).extend(fields)
+    state.setdefault("structured_ner_samples", []).extend(
+        structured.get("ner_samples", [])
+    )
+    state["metadata"].setdefault("structured_files", {})[file_path_clean] = profile
+    skipped = [
+        name
+        for name, column in profile["columns"].items()
+        if column["class"] == CLEAN
+    ]
+    if skipped:
+        append_warning(
+            state,
+            f"Columns of {file_path_clean} with no sensitive value in a sample of "
+            f"{profile['sampled_rows']} values were not scanned in full: "
+            + ", ".join(skipped),
+        )
+
+
+def _pending_outcomes(state: GuardState) -> tuple:
+    metadata = state.get("metadata", {})
+    return (
+        len(state.get("errors", [])),
+        len(state.get("warnings", [])),
+        len(metadata.get("images_needing_llm_ocr", [])),
+        len(metadata.get("llm_ocr_regions", [])),
+    )
+
+
+async def _process_extracted_file(
+    file_path_clean: str,
+    category: str,
+    state: GuardState,
+    extraction: _FileExtraction | None,
+    fw_config,
+) -> str | None:
+    """
+    Apply a PDF or text file extraction to the state, from the cache when it
+    was a hit. Clean extractions (no warning, error or pending LLM OCR) are
+    stored in the cache.
+    """
+    if extraction is not None and extraction.cached is not None:
+        metadata = state["metadata"]
+        metadata["extraction_cache_hits"] = (
+            metadata.get("extraction_cache_hits", 0) + 1
+        )
+        if extraction.cached.get("pdf_ocr_pages"):
+            metadata.setdefault("pdf_ocr_pages", {})[file_path_clean] = list(
+                extraction.cached["pdf_ocr_pages"]
+            )
+        structured = extraction.cached.get("structured")
+        if structured:
+            _apply_structured_scan(file_path_clean, state, structured)
+        return extraction.cached["text"]
+
+    before = _pending_outcomes(state)
+    result = extraction.result if extraction is not None else None
+    structured = None
+    if category == "pdf":
+        text = _process_pdf_file(file_path_clean, state, result)
+    elif isinstance(result, StructuredProfile):
+        structured = {
+            "fields": result.fields,
+            "profile": result.as_dict(),
+            "ner_samples": result.ner_samples,
+        }
+        _apply_structured_scan(file_path_clean, state, structured)
+        # Its skipped-column warning is replayed on cache hits
+        before = _pending_outcomes(state)
+        text = result.summary
+    else:
+        text = _process_text_file(file_path_clean, state, result)
+
+    if (
+        text is not None
+        and extraction is not None
+        and extraction.cache_key is not None
+        and _pending_outcomes(state) == before
+    ):
+        cache = get_extraction_cache(getattr(fw_config, "extraction_cache", None))
+        if cache is not None:
+            entry: dict = {"text": text}
+            ocr_pages = state["metadata"].get("pdf_ocr_pages", {})
+            if file_path_clean in ocr_pages:
+                entry["pdf_ocr_pages"] = ocr_pages[file_path_clean]
+            if structured is not None:
+                entry["structured"] = structured
+            await asyncio.to_thread(cache.set, extraction.cache_key, entry)
+    return text
+
+
+@dataclasses.dataclass
+class _PDFExtraction:
+    """Pages of a PDF plus the OCR outcome of its rendered scanned pages."""
+
+    pages: list[PDFPage]
+    # page index -> (rendered image path, OCR attempt)
+    ocr: dict[int, tuple[str, _ImageOCRAttempt]] = dataclasses.field(
+        default_factory=dict
+    )
+    render_dir: str | None = None
+    scanned_skipped: int = 0
+    render_error: Exception | None = None
+
+
+async def _extract_pdf(
+    file_path_clean: str, fw_config, semaphore: asyncio.Semaphore
+) -> _PDFExtraction | None:
+    """
+    Extract a PDF's pages. Large PDFs are split into page ranges extracted in
+    the worker pool; pages are collected in order as their range finishes.
+
+    Pages without text but mostly covered by images are scanned pages: only
+    those are rendered and sent through image OCR, concurrently.
+    """
+    document = getattr(fw_config, "document", None)
+    backend = getattr(document, "pdf_backend", "pdfplumber")
+    use_processes = bool(
+        document is not None
+        and document.process_pool
+        and os.path.getsize(file_path_clean) >= document.process_min_bytes
+    )
+    workers = getattr(fw_config.ocr, "workers", None)
+    try:
+        pages = [
+            page
+            async for page in iter_pdf_pages(
+                file_path_clean,
+                backend=backend,
+                pages_per_task=getattr(document, "pdf_pages_per_task", 8),
+                use_processes=use_processes,
+                workers=workers,
+            )
+        ]
     except Exception as e:
-        append_error(state, f"OCR detection failed for {file_path_clean}: {str(e)}")
-        if "metadata" not in state:
-            state["metadata"] = {}
-        if "images_needing_llm_ocr" not in state["metadata"]:
-            state["metadata"]["images_needing_llm_ocr"] = []
-        state["metadata"]["images_needing_llm_ocr"].append(file_path_clean)
+        logger.warning(f"PDF extraction failed: {e}")
         return None
 
-
-def _process_pdf_file(file_path_clean: str, state: GuardState) -> str | None:
+    extraction = _PDFExtraction(pages)
+    if document is None or not document.pdf_ocr:
+        return extraction
+    scanned = [
+        page.index
+        for page in pages
+        if page.is_scanned(document.pdf_ocr_min_image_coverage)
+    ]
+    if not scanned:
+        return extraction
+    extraction.scanned_skipped = max(0, len(scanned) - document.pdf_ocr_max_pages)
+    scanned = scanned[: document.pdf_ocr_max_pages]
+
+    # Rendered pages outlive this node when queued for LLM OCR (see _process_pdf_file)
+    extraction.render_dir = render_dir = tempfile.mkdtemp(prefix="pdf-pages-")
+    args = (file_path_clean, scanned, render_dir, document.pdf_ocr_dpi)
+    render = asyncio.ensure_future(
+        run_in_process(render_pdf_pages, *args, workers=workers)
+        if use_processes
+        else asyncio.to_thread(render_pdf_pages, *args)
+    )
+    try:
+        paths = await asyncio.shield(render)
+    except asyncio.CancelledError:
+        # The worker keeps rendering; delete its pages once it stops
+        render.add_done_callback(
+            lambda _: shutil.rmtree(render_dir, ignore_errors=True)
+        )
+        raise
+    except Exception as e:
+        extraction.render_error = e
+        return extraction
+    try:
+        attempts = await asyncio.gather(
+            *(_ocr_image(path, fw_config, semaphore) for path in paths)
+        )
+    except BaseException:
+        shutil.rmtree(render_dir, ignore_errors=True)
+        raise
+    extraction.ocr = {
+        index: (path, attempt)
+        for index, path, attempt in zip(scanned, paths, attempts)
+    }
+    return extraction
+
+
+def _process_pdf_file(
+    file_path_clean: str, state: GuardState, extraction: _PDFExtraction | None
+) -> str | None:
     """
-    Process a PDF file.
+    Apply the extracted pages of a PDF file (and the OCR of its scanned
+    pages) to the state.
 
     Returns extracted text or None if extraction failed.
     """
@@ -220,23 +989,102 @@ def _process_pdf_file(file_path_clean: str, state: GuardState) -> str | None:
         )
         return None
 
-    text = extract_text_from_file(file_path_clean)
-
-    if text is None:
+    if extraction is None:
         append_error(state, f"Failed to extract text from PDF: {file_path_clean}")
         return None
 
-    return text
+    try:
+        texts = {page.index: page.text for page in extraction.pages}
+        for index, (image_path, attempt) in extraction.ocr.items():
+            texts[index] = _process_image_file(image_path, state, attempt) or ""
+        if extraction.ocr:
+            state["metadata"].setdefault("pdf_ocr_pages", {})[file_path_clean] = [
+                index + 1 for index in extraction.ocr
+            ]
+        if extraction.render_error is not None:
+            append_warning(
+                state,
+                f"Scanned pages of {file_path_clean} could not be rendered for OCR: "
+                f"{extraction.render_error}",
+            )
+        if extraction.scanned_skipped:
+            append_warning(
+                state,
+                f"{extraction.scanned_skipped} scanned pages of {file_path_clean} "
+                "were not OCRed (page limit reached)",
+            )
+
+        text, spans = _join_pdf_page_spans([texts[index] for index in sorted(texts)])
+        page_spans = dict(zip(sorted(texts), spans))
+        for index, (image_path, _) in extraction.ocr.items():
+            _mark_llm_ocr_span(state, image_path, *page_spans[index])
+        return text
+    finally:
+        _release_rendered_pages(extraction.render_dir, state)
 
 
-def _process_text_file(file_path_clean: str, state: GuardState) -> str | None:
+def _join_pdf_page_spans(pages: list[str]) -> tuple[str, list[tuple[int, int]]]:
     """
-    Process a plain text file.
+    Join pages like `_join_pdf_pages`, also returning each page's (start, end)
+    in the joined text. Empty pages get an empty span where they would sit.
+    """
+    # Offsets first, then a single join: no repeated concatenation
+    spans = []
+    length = 0
+    for page in pages:
+        if page:
+            length += 1 if length else 0
+            spans.append((length, length + len(page)))
+            length += len(page)
+        else:
+            spans.append((length, length))
+    joined = "\n".join(page for page in pages if page)
+    text = joined.strip()
+    lead = len(joined) - len(joined.lstrip())
 
-    Returns extracted text or None if extraction failed.
+    def _clamp(offset: int) -> int:
+        return min(max(offset - lead, 0), len(text))
+
+    return text, [(_clamp(start), _clamp(end)) for start, end in spans]
+
+
+def _pending_llm_ocr_paths(metadata: dict) -> list[str]:
+    return list(metadata.get("images_needing_llm_ocr", [])) + [
+        request["path"] for request in metadata.get("llm_ocr_regions", [])
+    ]
+
+
+def _mark_llm_ocr_span(state: GuardState, path: str, start: int, end: int) -> None:
+    """
+    Remember where the text of an image queued for LLM OCR sits in the text
+    of its file, so the LLM text is spliced in there rather than appended.
+    read_document shifts the span to the image's offset in raw_text.
+    """
+    metadata = state.setdefault("metadata", {})
+    if path in _pending_llm_ocr_paths(metadata):
+        metadata.setdefault("llm_ocr_spans", {})[path] = [start, end]
+
+
+def _release_rendered_pages(render_dir: str | None, state: GuardState) -> None:
+    """Delete rendered pages now, unless some still wait for LLM OCR."""
+    if render_dir is None:
+        return
+    metadata = state.get("metadata", {})
+    pending = _pending_llm_ocr_paths(metadata)
+    if any(os.path.dirname(path) == render_dir for path in pending):
+        metadata.setdefault("pdf_render_dirs", []).append(render_dir)
+    else:
+        shutil.rmtree(render_dir, ignore_errors=True)
+
+
+def _process_text_file(
+    file_path_clean: str, state: GuardState, text: str | None
+) -> str | None:
     """
-    text = extract_text_from_file(file_path_clean)
+    Apply the extracted text of a plain text file to the state.
 
+    Returns extracted text or None if extraction failed.
+    """
     if text is None:
         append_error(state, f"Failed to extract text from file: {file_path_clean}")
         return None
@@ -244,14 +1092,99 @@ def _process_text_file(file_path_clean: str, state: GuardState) -> str | None:
     return text
 
 
-def read_document(state: GuardState, *, fw_config) -> GuardState:
+async def _read_one_document(
+    index: int,
+    file_path,
+    state: GuardState,
+    tasks: dict[int, asyncio.Task],
+    fw_config,
+    file_types_seen: list,
+    joined_length: int,
+) -> str | None:
+    """
+    Apply the extraction of file_paths[index] to the state and return its
+    text, which read_document joins at `joined_length` in raw_text. Spans of
+    its images queued for LLM OCR are moved to that offset.
+    """
+    known_spans = set(state["metadata"].get("llm_ocr_spans", {}))
+    text = None
+    try:
+        # Sanitize and validate file path
+        if not isinstance(file_path, str):
+            append_error(state, f"Invalid file path type: {type(file_path)}")
+            return None
+
+        file_path_clean = sanitize_file_path(file_path)
+
+        if not os.path.exists(file_path_clean):
+            append_error(state, f"File not found: {file_path}")
+            return None
+
+        file_type_def = FILE_TYPE_CONFIG.get_by_extension(file_path_clean)
+
+        if not file_type_def:
+            append_error(state, f"Unsupported file type: {file_path}")
+            return None
+
+        category = file_type_def.category
+        file_types_seen.append(category)
+
+        if category == "image":
+            attempt = await tasks.pop(index)
+            text = _process_image_file(file_path_clean, state, attempt)
+            _mark_llm_ocr_span(state, file_path_clean, 0, len(text or ""))
+        elif category in ("pdf", "text"):
+            extracted = await tasks.pop(index) if index in tasks else None
+            text = await _process_extracted_file(
+                file_path_clean, category, state, extracted, fw_config
+            )
+        else:
+            append_error(state, f"Unknown file category: {category}")
+            return None
+
+    except Exception as e:
+        text = None
+        append_error(state, f"Document extraction error for {file_path}: {str(e)}")
+    finally:
+        spans = state["metadata"].get("llm_ocr_spans", {})
+        # Texts are joined with a space; an empty text adds nothing
+        offset = joined_length + (1 if joined_length and text else 0)
+        for path in set(spans) - known_spans:
+            spans[path] = [position + offset for position in spans[path]]
+
+    return text
+
+
+def _discard_extractions(tasks: dict[int, asyncio.Task]) -> None:
+    """
+    Cancel extractions read_document did not apply (it failed or was
+    cancelled) and delete the PDF pages they rendered.
+    """
+    for task in tasks.values():
+        if not task.done():
+            # _extract_pdf deletes its rendered pages when cancelled
+            task.cancel()
+        elif not task.cancelled() and task.exception() is None:
+            result = task.result()
+            extraction = getattr(result, "result", None)
+            if isinstance(extraction, _PDFExtraction) and extraction.render_dir:
+                shutil.rmtree(extraction.render_dir, ignore_errors=True)
+
+
+async def read_document(state: GuardState, *, fw_config) -> GuardState:
     """
     Document ingestion node: Extracts text from multiple files.
 
     Supports:
     - images: Run OCR detector if available or fallback to VLM
     - PDFs: Extract text using pdfplumber
-    - text files: Read as plain text
+    - text files: Read as plain text; large CSV/JSON files are profiled per
+      column (findings in `structured_fields`) and replaced by a summary
+
+    Extraction of all files starts up front and runs concurrently: OCR and
+    large PDFs in a process pool, text reads in threads. Results are applied
+    in input order, so the output does not depend on which file finishes
+    first.
 
     Processes file_paths list and merges text with double newline separator.
     """
@@ -268,46 +1201,25 @@ def read_document(state: GuardState, *, fw_config) -> GuardState:
 
     extracted_texts = []
     file_types_seen = []
-
-    for file_path in file_paths:
-        try:
-            # Sanitize and validate file path
-            if not isinstance(file_path, str):
-                append_error(state, f"Invalid file path type: {type(file_path)}")
-                continue
-
-            file_path_clean = sanitize_file_path(file_path)
-
-            if not os.path.exists(file_path_clean):
-                append_error(state, f"File not found: {file_path}")
-                continue
-
-            file_type_def = FILE_TYPE_CONFIG.get_by_extension(file_path_clean)
-
-            if not file_type_def:
-                append_error(state, f"Unsupported file type: {file_path}")
-                continue
-
-            category = file_type_def.category
-            file_types_seen.append(category)
-
-            text = None
-            if category == "image":
-                text = _process_image_file(file_path_clean, state, fw_config)
-            elif category == "pdf":
-                text = _process_pdf_file(file_path_clean, state)
-            elif category == "text":
-                text = _process_text_file(file_path_clean, state)
-            else:
-                append_error(state, f"Unknown file category: {category}")
-                continue
-
+    # Length of raw_text once the texts extracted so far are joined to it
+    joined_length = len(state.get("raw_text", ""))
+    tasks = _start_extraction(file_paths, fw_config, state.get("file_digests"))
+    try:
+        for index, file_path in enumerate(file_paths):
+            text = await _read_one_document(
+                index,
+                file_path,
+                state,
+                tasks,
+                fw_config,
+                file_types_seen,
+                joined_length,
+            )
             if text:
+                joined_length += len(text) + (1 if joined_length else 0)
                 extracted_texts.append(text)
-
-        except Exception as e:
-            append_error(state, f"Document extraction error for {file_path}: {str(e)}")
-            continue
+    finally:
+        _discard_extractions(tasks)
 
     if file_types_seen:
         # For single file, store as file_type for backward compatibility
@@ -326,18 +1238,133 @@ def read_document(state: GuardState, *, fw_config) -> GuardState:
     return state
 
 
-def llm_ocr_document(state: GuardState, *, fw_config) -> GuardState:
+async def _llm_ocr_frames(
+    llm_ocr, image_path: str, fw_config, usages: list[dict]
+) -> tuple[str, FrameSelection]:
+    """
+    Send the distinct frames of a multi-frame image to the LLM, at most
+    `ocr.max_frames` per call so each call's size stays bounded. Frames are
+    selected like for Tesseract, so long documents are read up to
+    `ocr.max_pages`. Each call's usage is appended to `usages`.
+    """
+    selection = FrameSelection()
+    batches = frames_for_llm(
+        image_path,
+        fw_config.ocr,
+        selection,
+        getattr(fw_config, "llm_ocr_image", None),
+    )
+    texts: list[str] = []
+    # The file's size is counted once, with its first call
+    original_bytes = os.path.getsize(image_path)
+    try:
+        # Each batch is encoded only when the previous call has returned
+        while frames := await asyncio.to_thread(next, batches, None):
+            usage: dict = {}
+            texts.extend(
+                await llm_ocr.acall_images(
+                    frames, original_bytes=original_bytes, usage=usage
+                )
+            )
+            original_bytes = 0
+            usages.append(usage)
+    finally:
+        batches.close()
+    return " ".join(text for text in texts if text), selection
+
+
+def _splice_llm_ocr_texts(
+    state: GuardState, texts: list[tuple[str, str, str | None]]
+) -> None:
+    """
+    Place LLM OCR texts where their image sits in raw_text, e.g. a scanned
+    page between the text pages of its PDF. Each entry is (path, text,
+    replaced): with replaced=None the text goes after any text Tesseract read
+    from the image, otherwise it replaces that text, which must be `replaced`.
+    Images without a matching span are appended, in order.
+    """
+    raw_text = state.get("raw_text", "")
+    spans = state.get("metadata", {}).get("llm_ocr_spans", {})
+    placed = []
+    appended = []
+    for order, (path, text, replaced) in enumerate(texts):
+        span = spans.get(path)
+        if span is None:
+            appended.append(text)
+        elif replaced is None:
+            placed.append((span[1], span[1], order, text))
+        elif raw_text[span[0] : span[1]] == replaced:
+            placed.append((span[0], span[1], order, text))
+        else:
+            appended.append(text)
+    # From the end, so earlier offsets stay valid
+    for start, end, _, text in sorted(placed, reverse=True):
+        before, after = raw_text[:start], raw_text[end:]
+        if before and not before[-1].isspace():
+            text = " " + text
+        if after and not after[0].isspace():
+            text += " "
+        raw_text = before + text + after
+    state["raw_text"] = " ".join(part for part in [raw_text, *appended] if part)
+
+
+def _apply_region_results(
+    state: GuardState, requests: list, results: list, model: str
+) -> list[tuple[str, str, str]]:
+    """
+    Merge LLM text for low-confidence regions into the Tesseract text of each
+    image, returning (path, merged, tesseract_text) splices for raw_text.
+    """
+    splices = []
+    regions_sent = 0
+    pixel_shares = []
+    for request, result in zip(requests, results):
+        if result is None:
+            continue
+        if isinstance(result, Exception):
+            # Tesseract's partial text is already in raw_text; keep it
+            append_warning(
+                state, f"LLM OCR failed for regions of {request['path']}: {result}"
+            )
+            continue
+        texts, usage = result
+        record_llm_usage(state, "llm_ocr", usage, model=model)
+        regions_sent += len(request["regions"])
+        if "region_pixel_share" in usage:
+            pixel_shares.append(usage["region_pixel_share"])
+
+        regions = [
+            OCRRegion(box=tuple(r["box"]), line_indices=tuple(r["line_indices"]))
+            for r in request["regions"]
+        ]
+        merged = merge_region_text(
+            layout_from_dict(request["lines"]), regions, texts
+        )
+        splices.append((request["path"], merged, request["tesseract_text"]))
+        state["metadata"]["llm_ocr_used"] = True
+
+    if regions_sent:
+        state["metadata"]["llm_ocr_regions_sent"] = regions_sent
+        state["metadata"]["llm_ocr_region_pixel_share"] = sum(pixel_shares) / max(
+            1, len(pixel_shares)
+        )
+    return splices
+
+
+async def llm_ocr_document(state: GuardState, *, fw_config) -> GuardState:
     """
     LLM OCR fallback node: Uses vision-capable LLM to extract text from images
-    when Tesseract OCR fails or returns empty results.
+    when Tesseract OCR fails or returns empty results, and to re-read the
+    low-confidence regions of images Tesseract only partly recognized.
 
-    Handles both single and multiple file scenarios by processing each image
-    that needs OCR fallback individually.
+    Images are sent concurrently, at most `fw_config.llm_ocr_concurrency` at a
+    time, and their texts are merged in input order.
     """
     metadata = state.get("metadata", {})
     images_needing_ocr = metadata.get("images_needing_llm_ocr", [])
+    region_requests = metadata.get("llm_ocr_regions", [])
 
-    if not images_needing_ocr:
+    if not images_needing_ocr and not region_requests:
         return state
 
     try:
@@ -346,34 +1373,147 @@ def llm_ocr_document(state: GuardState, *, fw_config) -> GuardState:
             provider=llm_ocr_settings.provider,
             model=llm_ocr_settings.model,
             client_params=llm_ocr_settings.client_params,
+            resilience=getattr(fw_config, "llm_resilience", None),
+            image_preprocess=getattr(fw_config, "llm_ocr_image", None),
         )
 
-        extracted_texts = []
-
-        for image_path in images_needing_ocr:
-            try:
+        cache = get_ocr_cache(getattr(fw_config, "ocr_cache", None))
+        cache_settings = _llm_ocr_cache_settings(llm_ocr_settings, fw_config)
+        semaphore = asyncio.Semaphore(
+            max(1, getattr(fw_config, "llm_ocr_concurrency", 1))
+        )
+        unavailable: list[ProviderUnavailableError] = []
+
+        async def _ocr_image(
+            image_path: str,
+        ) -> tuple[str, list[dict] | None, FrameSelection | None] | Exception | None:
+            cache_key = None
+            if cache is not None:
+                cache_key = await asyncio.to_thread(
+                    ocr_cache_key, image_path, "llm", cache_settings
+                )
+                cached = await asyncio.to_thread(cache.get, cache_key)
+                if cached is not None:
+                    return cached, None, None
+            async with semaphore:
+                # Once the provider is unavailable, skip images not yet started
+                if unavailable:
+                    return None
                 temp_state: dict = dict(state)  # type: ignore
                 temp_state["file_path"] = image_path
+                usage: dict = {}
+                usages = [usage]
+                selection = None
+                try:
+                    multi_frame = (
+                        await asyncio.to_thread(frame_count, image_path) > 1
+                    )
+                    tiling = (
+                        None
+                        if multi_frame
+                        else await _plan_ocr_strips(image_path, fw_config)
+                    )
+                    if multi_frame:
+                        usages = []
+                        text, selection = await _llm_ocr_frames(
+                            llm_ocr, image_path, fw_config, usages
+                        )
+                    elif tiling:
+                        # Downscaling a tall image as a whole would make its
+                        # text illegible; send its strips as separate crops
+                        width, strips = tiling
+                        texts = await llm_ocr.acall_regions(
+                            image_path,
+                            [(0, top, width, bottom) for top, bottom in strips],
+                            usage=usage,
+                        )
+                        text = merge_overlapping_texts(texts)
+                    else:
+                        text = await llm_ocr.acall(temp_state, usage=usage)  # type: ignore
+                except ProviderUnavailableError as e:
+                    unavailable.append(e)
+                    return None
+                except Exception as e:
+                    return e
+                if text and cache is not None:
+                    await asyncio.to_thread(cache.set, cache_key, text)
+                return text or "", usages, selection
+
+        async def _ocr_regions(request: dict) -> tuple[list, dict] | Exception | None:
+            async with semaphore:
+                if unavailable:
+                    return None
+                usage: dict = {}
+                try:
+                    texts = await llm_ocr.acall_regions(
+                        request["path"],
+                        [region["box"] for region in request["regions"]],
+                        usage=usage,
+                    )
+                except ProviderUnavailableError as e:
+                    unavailable.append(e)
+                    return None
+                except Exception as e:
+                    return e
+                return texts, usage
+
+        results, region_results = await asyncio.gather(
+            asyncio.gather(
+                *(_ocr_image(image_path) for image_path in images_needing_ocr)
+            ),
+            asyncio.gather(*(_ocr_regions(request) for request in region_requests)),
+        )
 
-                text = llm_ocr(temp_state) or ""  # type: ignore
+        extracted_texts = []
+        image_bytes = {"original": 0, "sent": 0}
 
-                if text:
-                    extracted_texts.append(text)
-                else:
-                    append_warning(
-                        state,
-                        f"LLM OCR did not extract any text from image: {image_path}",
-                    )
-            except Exception as e:
-                append_error(state, f"LLM OCR failed for {image_path}: {str(e)}")
+        for image_path, result in zip(images_needing_ocr, results):
+            if result is None:
                 continue
+            if isinstance(result, Exception):
+                append_error(state, f"LLM OCR failed for {image_path}: {str(result)}")
+                continue
+            text, usages, selection = result
+            if usages is None:
+                _record_ocr_cache_hit(state)
+            for usage in usages or []:
+                record_llm_usage(
+                    state, "llm_ocr", usage, model=llm_ocr_settings.model
+                )
+                image_bytes["original"] += usage.get("image_original_bytes", 0)
+                image_bytes["sent"] += usage.get("image_sent_bytes", 0)
+            if selection is not None and selection.truncated:
+                _warn_frames_truncated(state, image_path, selection)
+            if text:
+                extracted_texts.append((image_path, text))
+            else:
+                append_warning(
+                    state,
+                    f"LLM OCR did not extract any text from image: {image_path}",
+                )
+
+        splices: list[tuple[str, str, str | None]] = list(
+            _apply_region_results(
+                state, region_requests, region_results, llm_ocr_settings.model
+            )
+        )
 
-        if extracted_texts:
-            existing_text = state.get("raw_text", "")
-            all_texts = [existing_text] if existing_text else []
-            all_texts.extend(extracted_texts)
-            state["raw_text"] = " ".join(all_texts)
+        if image_bytes["original"]:
+            image_bytes["saved"] = image_bytes["original"] - image_bytes["sent"]
+            state["metadata"]["llm_ocr_image_bytes"] = image_bytes
+
+        if unavailable:
+            append_warning(
+                state,
+                "LLM OCR skipped for remaining images, provider unavailable: "
+                f"{unavailable[0]}",
+            )
+            state["metadata"]["llm_degraded"] = True
 
+        splices.extend((path, text, None) for path, text in extracted_texts)
+        _splice_llm_ocr_texts(state, splices)
+
+        if extracted_texts:
             if "metadata" not in state:
                 state["metadata"] = {}
             state["metadata"]["llm_ocr_used"] = True
@@ -382,10 +1522,17 @@ def llm_ocr_document(state: GuardState, *, fw_config) -> GuardState:
 
         if "images_needing_llm_ocr" in state["metadata"]:
             del state["metadata"]["images_needing_llm_ocr"]
+        if "llm_ocr_regions" in state["metadata"]:
+            del state["metadata"]["llm_ocr_regions"]
 
     except Exception as e:
         append_error(state, f"LLM OCR initialization failed: {str(e)}")
 
+    state.get("metadata", {}).pop("llm_ocr_spans", None)
+    # Scanned PDF pages rendered by read_document are no longer needed
+    for render_dir in state.get("metadata", {}).pop("pdf_render_dirs", []):
+        shutil.rmtree(render_dir, ignore_errors=True)
+
     return state
 
 
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import time
+
+from ..detectors.llm_gate import load_llm_gate
+from ..types import GuardState
+from ..utils import append_warning
+
+
+def evaluate_llm_gate(state: GuardState, *, fw_config) -> GuardState:
+    """
+    Score whether the LLM detector is likely to add findings beyond DLP/NER.
+
+    Stores the decision in metadata["llm_gate"]; the routers read `skip_llm`
+    to bypass the LLM call. No-op unless the gate is enabled with a model.
+    """
+    gate_config = getattr(fw_config, "llm_gate", None)
+    if not gate_config or not gate_config.enabled or not gate_config.model_path:
+        return state
+    if state.get("force_llm_detector"):
+        return state
+
+    text = state.get("normalized_text") or ""
+    metadata = state.setdefault("metadata", {})
+    try:
+        model = load_llm_gate(gate_config.model_path)
+    except Exception as exc:
+        append_warning(state, f"LLM gate disabled, failed to load model: {exc}")
+        return state
+
+    started = time.perf_counter()
+    score = model.predict_proba(text)
+    threshold = model.threshold_for_recall(gate_config.recall_target)
+    metadata["llm_gate"] = {
+        "score": round(score, 6),
+        "threshold": round(threshold, 6),
+        "recall_target": gate_config.recall_target,
+        "skip_llm": score < threshold,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+    return state
+
+
+__all__ = ["evaluate_llm_gate"]
@@ -1,16 +1,11 @@
 from __future__ import annotations
 
-import re
 from typing import Any
 
+from ..detectors.text_stream import normalize_text
 from ..types import FieldList, GuardState
 from ..config.detection import HIGH_RISK_FIELDS, MEDIUM_RISK_FIELDS, LOW_RISK_FIELDS
 
-_whitespace_re = re.compile(r"\s+")
-_system_reminder_re = re.compile(
-    r"<system-reminder>.*?</system-reminder>", flags=re.DOTALL | re.IGNORECASE
-)
-
 
 def _normalize_field_name(name: str) -> str:
     """Normalize a field label for matching (case-insensitive, preserves underscores)."""
@@ -41,11 +36,9 @@ def normalize(state: GuardState) -> GuardState:
     """Normalize raw text (strip system artifacts and collapse whitespace)."""
     text = state.get("raw_text") or ""
 
-    # Remove system tags (e.g., OpenCode CLI artifacts)
-    text = _system_reminder_re.sub("", text)
-
-    # Normalize whitespace
-    normalized = _whitespace_re.sub(" ", text).strip()
+    # Remove system tags (e.g., OpenCode CLI artifacts) and collapse whitespace,
+    # chunk by chunk so large uploads are not copied in full at each step
+    normalized = normalize_text(text)
 
     state["normalized_text"] = normalized
     if not normalized:
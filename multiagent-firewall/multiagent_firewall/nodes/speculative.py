@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict
+
+from ..detectors.budget import estimate_tokens
+from ..metrics import merge_llm_usage
+from ..routers import _llm_gate_skips
+from ..types import GuardState
+from ..utils import append_warning
+from .anonymizer import _anonymize_text
+from .gating import evaluate_llm_gate
+from .policy import apply_policy
+from .preprocessing import merge_detections
+from .risk import evaluate_risk
+
+
+@dataclass
+class SpeculativeLLMCall:
+    """An in-flight LLM call started before the rest of the pipeline finished."""
+
+    task: asyncio.Task
+    mapping: Dict[str, str]
+    # Scratch state the call records its usage, cascade and warnings on
+    state: GuardState
+    started: float = field(default_factory=time.perf_counter)
+
+
+# Pending speculative calls keyed by the per-run `speculative_llm_id`
+_PENDING: Dict[str, SpeculativeLLMCall] = {}
+# DLP runs shared with the speculative call, keyed by run id and name
+_SHARED: Dict[str, Dict[str, asyncio.Future]] = {}
+
+
+async def shared_detection(
+    state: GuardState, name: str, run: Callable[[], Awaitable[GuardState]]
+) -> GuardState:
+    """
+    Run a local detector once per speculative run.
+
+    The detector node and the speculative call both await the same result, so
+    DLP is not computed twice. Runs directly outside speculative runs.
+    """
+    run_id = state.get("speculative_llm_id")
+    if not run_id:
+        return await run()
+    shared = _SHARED.setdefault(run_id, {})
+    future = shared.get(name)
+    if future is None:
+        future = shared[name] = asyncio.ensure_future(run())
+    return await asyncio.shield(future)
+
+
+async def start_speculative_llm(state: GuardState, *, fw_config) -> GuardState:
+    """
+    Start the LLM detector as soon as DLP has finished.
+
+    The call waits for the DLP results (shared with the DLP node), which are
+    fast, and is only sent when the learned gate and the pre-LLM block decision
+    on those findings would let the run reach the LLM, with the text anonymized
+    from them. It then overlaps with NER, the slow local detector, and the
+    remaining pre-LLM nodes. Values only NER finds are therefore not masked in
+    the speculative text. The call is later awaited and reconciled with the
+    late findings by `run_llm_detector`, or cancelled by the orchestrator when
+    the run ends without reaching the LLM (e.g. NER findings block it).
+    Returns an empty update so it never conflicts with the parallel detectors.
+    """
+    run_id = state.get("speculative_llm_id")
+    text = state.get("normalized_text") or ""
+    if not run_id or not text or not getattr(fw_config, "speculative_llm", False):
+        return {}
+    max_tokens = getattr(fw_config.llm, "max_input_tokens", None)
+    if (
+        max_tokens
+        and len(text) > max_tokens
+        and estimate_tokens(text, fw_config.llm.model) > max_tokens
+    ):
+        # Oversized inputs go through the token budget in run_llm_detector
+        return {}
+
+    # Imported lazily: detection imports this module to reconcile results
+    from .detection import (
+        _anonymized_value_checker,
+        _detect_llm_fields,
+        run_dlp_detector,
+    )
+
+    dlp_update = await run_dlp_detector(state)
+    scratch: GuardState = {
+        "normalized_text": text,
+        "dlp_fields": dlp_update.get("dlp_fields") or [],
+        "ner_fields": [],
+        "min_block_level": state.get("min_block_level"),
+        "force_llm_detector": state.get("force_llm_detector"),
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+    merge_detections(scratch)
+    if not _reaches_llm(scratch, fw_config):
+        return {}
+
+    masked_text, mapping = _anonymize_text(
+        text, scratch.get("detected_fields") or [], None
+    )
+    _PENDING[run_id] = SpeculativeLLMCall(
+        task=asyncio.create_task(
+            _detect_llm_fields(
+                scratch, masked_text, fw_config, _anonymized_value_checker(mapping)
+            )
+        ),
+        mapping=mapping,
+        state=scratch,
+    )
+    return {}
+
+
+def _reaches_llm(scratch: GuardState, fw_config) -> bool:
+    """Mirror the llm_gate and pre-LLM policy routing on the DLP findings."""
+    if scratch.get("force_llm_detector"):
+        return True
+    evaluate_llm_gate(scratch, fw_config=fw_config)
+    if _llm_gate_skips(scratch):
+        return False
+    evaluate_risk(scratch)
+    apply_policy(scratch)
+    return scratch.get("decision") != "block"
+
+
+def take_speculative_llm(state: GuardState) -> SpeculativeLLMCall | None:
+    """Claim the speculative call for this run, if one was started."""
+    run_id = state.get("speculative_llm_id")
+    if not run_id:
+        return None
+    _SHARED.pop(run_id, None)
+    return _PENDING.pop(run_id, None)
+
+
+def cancel_speculative_llm(run_id: str | None) -> bool:
+    """Cancel a speculative call that was never consumed. Returns True if cancelled."""
+    if not run_id:
+        return False
+    for future in (_SHARED.pop(run_id, None) or {}).values():
+        future.cancel()
+    call = _PENDING.pop(run_id, None)
+    if call is None or call.task.done():
+        return False
+    call.task.cancel()
+    return True
+
+
+def pending_speculative_calls() -> int:
+    return len(_PENDING)
+
+
+def merge_speculative_state(state: GuardState, call: SpeculativeLLMCall) -> None:
+    """Carry usage, cascade metadata and warnings of a used call onto the run."""
+    scratch_metadata = call.state.get("metadata") or {}
+    metadata = state.setdefault("metadata", {})
+    merge_llm_usage(metadata, scratch_metadata.get("llm_usage"))
+    if "llm_cascade" in scratch_metadata:
+        metadata["llm_cascade"] = scratch_metadata["llm_cascade"]
+    for warning in call.state.get("warnings") or []:
+        append_warning(state, warning)
+
+
+__all__ = [
+    "SpeculativeLLMCall",
+    "cancel_speculative_llm",
+    "merge_speculative_state",
+    "pending_speculative_calls",
+    "shared_detection",
+    "start_speculative_llm",
+    "take_speculative_llm",
+]
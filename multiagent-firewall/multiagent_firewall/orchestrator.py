@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import importlib
 import logging
+import uuid
 from typing import cast, Any, Callable
 from functools import partial
 from pathlib import Path
@@ -11,6 +12,7 @@ from langgraph.graph import END, StateGraph
 
 from .config.env import GuardConfig
 from .config.registry import NODE_REGISTRY, ROUTER_REGISTRY
+from .nodes.speculative import cancel_speculative_llm
 from .types import GuardState
 from .utils import debug_ainvoke
 
@@ -30,6 +32,7 @@ class GuardOrchestrator:
         *,
         file_paths: list[str] | None = None,
         min_block_level: str | None = None,
+        file_digests: dict[str, str] | None = None,
     ) -> GuardState:
         """
         Run the detection pipeline.
@@ -38,6 +41,8 @@ class GuardOrchestrator:
             text: Direct text input
             file_paths: List of file paths to process (can be single file in list)
             min_block_level: Minimum risk level ("none", "low", "medium", "high") required to trigger blocking actions
+            file_digests: SHA-256 hex digests of files in file_paths, by path, when
+                already computed (skips re-hashing for the extraction cache)
 
         Returns:
             GuardState with detection results
@@ -45,6 +50,7 @@ class GuardOrchestrator:
         initial_state: GuardState = {
             "raw_text": text or "",
             "file_paths": file_paths if file_paths else None,
+            "file_digests": file_digests or None,
             "min_block_level": _normalize_risk(min_block_level),
             "llm_provider": self._config.llm.provider,
             "force_llm_detector": self._config.force_llm_detector,
@@ -54,6 +60,19 @@ class GuardOrchestrator:
             "decision": "allow",
             "risk_level": "none",
         }
+        if not self._config.speculative_llm:
+            return await self._invoke(initial_state)
+
+        run_id = uuid.uuid4().hex
+        initial_state["speculative_llm_id"] = run_id
+        try:
+            return await self._invoke(initial_state)
+        finally:
+            # The LLM was never reached (blocked, gated or failed): drop the call
+            if cancel_speculative_llm(run_id):
+                logger.debug("Cancelled unused speculative LLM call %s", run_id)
+
+    async def _invoke(self, initial_state: GuardState) -> GuardState:
         if self._config.debug:
             return await debug_ainvoke(self._graph, initial_state)
         return cast(GuardState, await self._graph.ainvoke(initial_state))
@@ -13,22 +13,32 @@ def should_read_document(state: GuardState) -> str:
 
 
 def should_run_llm_ocr(state: GuardState) -> str:
-    """Route to llm_ocr if there are images needing LLM OCR fallback."""
+    """Route to llm_ocr if there are images or image regions needing LLM OCR."""
     metadata = state.get("metadata", {})
     images_needing_ocr = metadata.get("images_needing_llm_ocr", [])
 
-    if images_needing_ocr:
+    if images_needing_ocr or metadata.get("llm_ocr_regions"):
         return "llm_ocr"
     return "normalize"
 
 
+def _llm_gate_skips(state: GuardState) -> bool:
+    """True when the learned LLM gate predicted the LLM would add nothing."""
+    if state.get("force_llm_detector"):
+        return False
+    gate = state.get("metadata", {}).get("llm_gate") or {}
+    return bool(gate.get("skip_llm"))
+
+
 def should_run_llm(state: GuardState) -> str:
-    """Route to anonymize_dlp_ner unless policy already blocks."""
+    """Route to anonymize_dlp_ner unless policy already blocks or the LLM gate skips."""
     if state.get("force_llm_detector"):
         return "anonymize_dlp_ner"
     decision = (state.get("decision") or "").lower()
     if decision == "block":
         return "remediation"
+    if _llm_gate_skips(state):
+        return "remediation"
     return "anonymize_dlp_ner"
 
 
@@ -40,6 +50,8 @@ def route_after_dlp_ner(state: GuardState) -> str:
         or state.get("ner_fields")
     ):
         return "risk_dlp_ner"
+    if _llm_gate_skips(state):
+        return END
     return "llm_detector"
 
 
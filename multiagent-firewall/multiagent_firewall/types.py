@@ -15,10 +15,13 @@ FieldList = List[Dict[str, Any]]
 class GuardState(TypedDict, total=False):
     # INPUT
     file_paths: NotRequired[list[str] | None]
+    # SHA-256 of files already hashed by the caller (e.g. while uploading)
+    file_digests: NotRequired[dict[str, str] | None]
     raw_text: str
     min_block_level: NotRequired[str | None]
     llm_provider: NotRequired[str]
     force_llm_detector: NotRequired[bool]
+    speculative_llm_id: NotRequired[str]
 
     # PROCESSING
     anonymized_text: NotRequired[str]
@@ -30,6 +33,11 @@ class GuardState(TypedDict, total=False):
     # DETECTION
     llm_fields: FieldList
     dlp_fields: FieldList
+    # DLP findings from profiling CSV/JSON columns, reported by the DLP node
+    structured_fields: FieldList
+    # Sampled values of CSV/JSON columns ({"column", "text"} blocks) for NER,
+    # since the LLM only sees a summary of the file
+    structured_ner_samples: NotRequired[list[dict]]
     ner_fields: FieldList
     code_similarity_fields: FieldList
     detected_fields: FieldList
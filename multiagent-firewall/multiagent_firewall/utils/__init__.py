@@ -5,13 +5,15 @@ This package is organized into:
 - core: Debug utilities and state management
 - validation: File validation and security functions
 - exceptions: Custom exception classes
+- matching: Multi-pattern substring matching
 """
 
 from __future__ import annotations
 
 # Import from submodules
 from .core import append_error, append_warning, debug_ainvoke
-from .exceptions import FileValidationError
+from .exceptions import FileValidationError, ProviderUnavailableError
+from .matching import AhoCorasickMatcher
 from .validation import (
     CHUNK_SIZE_BYTES,
     sanitize_filename,
@@ -26,9 +28,12 @@ __all__ = [
     "debug_ainvoke",
     "append_error",
     "append_warning",
+    # Matching utilities
+    "AhoCorasickMatcher",
     # Validation utilities
     "CHUNK_SIZE_BYTES",
     "FileValidationError",
+    "ProviderUnavailableError",
     "validate_file_size",
     "validate_mime_type",
     "sanitize_filename",
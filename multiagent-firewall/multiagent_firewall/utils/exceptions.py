@@ -5,3 +5,9 @@ class FileValidationError(ValueError):
     """Raised when file validation fails."""
 
     pass
+
+
+class ProviderUnavailableError(RuntimeError):
+    """Raised when an LLM provider call is shed by its circuit breaker or concurrency limit."""
+
+    pass
@@ -0,0 +1,75 @@
+"""
+Multi-pattern substring matching.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class AhoCorasickMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of patterns.
+
+    Built once, then `contains_any` scans a text in O(len(text)) regardless of
+    how many patterns there are. Empty patterns are ignored.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terminal: List[bool] = [False]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._build_failure_links()
+
+    def __bool__(self) -> bool:
+        return len(self._goto) > 1
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(False)
+                self._goto[state][ch] = next_state
+            state = next_state
+        self._terminal[state] = True
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # A match ending at the failure target also ends here
+                self._terminal[child] = self._terminal[child] or self._terminal[
+                    self._fail[child]
+                ]
+
+    def contains_any(self, text: str) -> bool:
+        """True if any pattern occurs as a substring of `text`."""
+        if not text or len(self._goto) == 1:
+            return False
+        goto, fail, terminal = self._goto, self._fail, self._terminal
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if terminal[state]:
+                return True
+        return False
+
+
+__all__ = ["AhoCorasickMatcher"]
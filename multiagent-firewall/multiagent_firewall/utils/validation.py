@@ -18,6 +18,7 @@ async def validate_file_size(
     file_path: Path,
     max_size_bytes: int,
     chunk_size_bytes: int,
+    digest=None,
 ) -> int:
     """
     Validates file size during streaming to prevent writing
@@ -28,6 +29,8 @@ async def validate_file_size(
         file_path: Destination path to write file
         max_size_bytes: Maximum allowed size in bytes
         chunk_size_bytes: Size of chunks to read/write
+        digest: Optional hashlib object updated with every chunk written, so
+            the file does not need to be read again to hash it
 
     Returns:
         Total bytes written
@@ -55,6 +58,8 @@ async def validate_file_size(
                     )
 
                 f.write(chunk)
+                if digest is not None:
+                    digest.update(chunk)
     except FileValidationError:
         raise
     except Exception as e:
@@ -0,0 +1,83 @@
+"""
+Train the learned "needs LLM" gate from recorded pipeline outcomes.
+
+Input is a JSON Lines file where each line is a final GuardState returned by
+GuardOrchestrator.run (for example collected with FORCE_LLM_DETECTOR=true so
+that every record contains llm_fields).
+
+Usage:
+    uv run python scripts/train_llm_gate.py states.jsonl llm_gate.json --recall 0.95
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from multiagent_firewall.detectors.llm_gate import (
+    examples_from_states,
+    train_llm_gate,
+)
+
+
+def _read_states(path: Path):
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                print(f"Skipping line {line_number}: {exc}", file=sys.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("states", type=Path, help="JSONL file of recorded GuardState")
+    parser.add_argument("output", type=Path, help="Where to write the gate model JSON")
+    parser.add_argument("--recall", type=float, default=0.95, help="Recall target to report")
+    parser.add_argument("--epochs", type=int, default=8)
+    parser.add_argument("--holdout", type=float, default=0.2, help="Evaluation split")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    examples = examples_from_states(_read_states(args.states))
+    if not examples:
+        print("No usable records (records need normalized_text and llm_fields).")
+        return 1
+
+    random.Random(args.seed).shuffle(examples)
+    split = int(len(examples) * (1.0 - args.holdout))
+    train, holdout = examples[:split] or examples, examples[split:]
+
+    model = train_llm_gate(
+        train, epochs=args.epochs, seed=args.seed, calibration=holdout or None
+    )
+    model.save(args.output)
+
+    threshold = model.threshold_for_recall(args.recall)
+    print(f"Trained on {len(train)} records, threshold @ recall {args.recall}: {threshold:.4f}")
+    if holdout:
+        started = time.perf_counter()
+        scores = [(model.predict_proba(text), label) for text, label in holdout]
+        per_call_ms = (time.perf_counter() - started) * 1000 / len(holdout)
+        positives = [score for score, label in scores if label]
+        kept = sum(1 for score in positives if score >= threshold)
+        skipped = sum(1 for score, _ in scores if score < threshold)
+        recall = kept / len(positives) if positives else 1.0
+        # Thresholds are calibrated on the holdout, so this is the calibrated recall
+        print(
+            f"Holdout: {len(holdout)} records, recall {recall:.3f}, "
+            f"LLM calls skipped {skipped / len(holdout):.1%}, "
+            f"{per_call_ms:.3f} ms/inference"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,9 @@ from multiagent_firewall.config import (
     OCRConfig,
     detection,
 )
+from multiagent_firewall.detectors.extraction_cache import reset_extraction_caches
+from multiagent_firewall.detectors.ocr_cache import reset_ocr_caches
+from multiagent_firewall.detectors.resilience import reset_provider_guards
 
 
 @pytest.fixture
@@ -25,6 +28,24 @@ def guard_config() -> GuardConfig:
     )
 
 
+@pytest.fixture(autouse=True)
+def reset_llm_provider_guards():
+    # Circuit breakers are process-wide; keep failures from leaking across tests
+    reset_provider_guards()
+    yield
+    reset_provider_guards()
+
+
+@pytest.fixture(autouse=True)
+def reset_ocr_result_caches():
+    # OCR caches are process-wide and content-addressed; identical test images collide
+    reset_ocr_caches()
+    reset_extraction_caches()
+    yield
+    reset_ocr_caches()
+    reset_extraction_caches()
+
+
 @pytest.fixture(scope="session")
 def stable_detection_config() -> dict:
     config_path = Path(__file__).parent / "fixtures" / "stable_detection.json"
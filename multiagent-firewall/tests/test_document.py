@@ -53,6 +53,9 @@ def test_extract_text_from_file_reads_pdf(monkeypatch, tmp_path):
         def extract_text(self):
             return self._text
 
+        def close(self):
+            pass
+
     class FakePdf:
         def __init__(self):
             self.pages = [
@@ -80,7 +83,8 @@ def test_extract_text_from_file_reads_pdf(monkeypatch, tmp_path):
     assert content == "First page\nSecond page"
 
 
-def test_read_document_with_file_path(tmp_path, guard_config):
+@pytest.mark.asyncio
+async def test_read_document_with_file_path(tmp_path, guard_config):
     """Extract text from file when file_path provided"""
     file_path = tmp_path / "test.txt"
     file_path.write_text("file content", encoding="utf-8")
@@ -90,13 +94,14 @@ def test_read_document_with_file_path(tmp_path, guard_config):
         "warnings": [],
         "errors": [],
     }
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     assert result["raw_text"] == "file content"
     assert len(result.get("errors", [])) == 0
 
 
-def test_read_document_with_missing_file(tmp_path, guard_config):
+@pytest.mark.asyncio
+async def test_read_document_with_missing_file(tmp_path, guard_config):
     """Handle missing file gracefully and preserve existing raw_text"""
     missing_path = tmp_path / "missing.txt"
 
@@ -105,7 +110,7 @@ def test_read_document_with_missing_file(tmp_path, guard_config):
         "warnings": [],
         "errors": [],
     }
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     # raw_text should remain empty since there was no existing text
     assert result["raw_text"] == ""
@@ -113,7 +118,8 @@ def test_read_document_with_missing_file(tmp_path, guard_config):
     assert "File not found" in result["errors"][0]
 
 
-def test_read_document_preserves_text_on_file_error(tmp_path, guard_config):
+@pytest.mark.asyncio
+async def test_read_document_preserves_text_on_file_error(tmp_path, guard_config):
     """Test that existing raw_text is preserved when file reading fails"""
     missing_path = tmp_path / "missing.txt"
 
@@ -123,7 +129,7 @@ def test_read_document_preserves_text_on_file_error(tmp_path, guard_config):
         "warnings": [],
         "errors": [],
     }
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     # Existing raw_text should be preserved even though file read failed
     assert result["raw_text"] == "existing text"
@@ -131,7 +137,8 @@ def test_read_document_preserves_text_on_file_error(tmp_path, guard_config):
     assert "File not found" in result["errors"][0]
 
 
-def test_read_document_appends_file_to_existing_text(tmp_path, guard_config):
+@pytest.mark.asyncio
+async def test_read_document_appends_file_to_existing_text(tmp_path, guard_config):
     """Test that file content is appended to existing raw_text"""
     file_path = tmp_path / "test.txt"
     file_path.write_text("file content", encoding="utf-8")
@@ -142,7 +149,7 @@ def test_read_document_appends_file_to_existing_text(tmp_path, guard_config):
         "warnings": [],
         "errors": [],
     }
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     # Both existing text and file content should be present
     assert "existing text" in result["raw_text"]
@@ -167,9 +174,10 @@ def test_is_image_file_rejects_non_images():
     assert is_image_file("data.csv") == False
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
 @patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
-def test_read_document_with_image_file_and_ocr_detector(
+async def test_read_document_with_image_file_and_ocr_detector(
     mock_has_ocr_support, mock_get_detector, tmp_path, guard_config
 ):
     """Test reading image file with OCR detector"""
@@ -187,15 +195,16 @@ def test_read_document_with_image_file_and_ocr_detector(
         "metadata": {},
     }
 
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     assert result["raw_text"] == "Some text from image test@example.com"
     assert result.get("metadata", {}).get("file_type") == "image"
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
 @patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
-def test_read_document_with_image_file_no_ocr_detector(
+async def test_read_document_with_image_file_no_ocr_detector(
     mock_has_ocr_support, mock_get_detector, tmp_path, guard_config
 ):
     """Test reading image file when OCR detector fails to initialize"""
@@ -211,14 +220,15 @@ def test_read_document_with_image_file_no_ocr_detector(
         "metadata": {},
     }
 
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     assert result["raw_text"] == ""
     assert "Image file detected but no OCR detector available" in result["warnings"][0]
     assert result.get("metadata", {}).get("file_type") == "image"
 
 
-def test_read_document_sets_file_type_metadata_for_pdf(tmp_path, guard_config):
+@pytest.mark.asyncio
+async def test_read_document_sets_file_type_metadata_for_pdf(tmp_path, guard_config):
     pdf_path = tmp_path / "document.pdf"
     pdf_path.write_bytes(b"%PDF-fake")
 
@@ -229,13 +239,14 @@ def test_read_document_sets_file_type_metadata_for_pdf(tmp_path, guard_config):
         "metadata": {},
     }
 
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     # Even if extraction fails, metadata should be set
     assert result.get("metadata", {}).get("file_type") == "pdf"
 
 
-def test_read_document_sets_file_type_metadata_for_text(tmp_path, guard_config):
+@pytest.mark.asyncio
+async def test_read_document_sets_file_type_metadata_for_text(tmp_path, guard_config):
     text_path = tmp_path / "document.txt"
     text_path.write_text("Some content", encoding="utf-8")
 
@@ -246,15 +257,16 @@ def test_read_document_sets_file_type_metadata_for_text(tmp_path, guard_config):
         "metadata": {},
     }
 
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     assert result["raw_text"] == "Some content"
     assert result.get("metadata", {}).get("file_type") == "text"
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
 @patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
-def test_read_document_handles_ocr_exception(
+async def test_read_document_handles_ocr_exception(
     mock_has_ocr_support, mock_get_detector, tmp_path, guard_config
 ):
     """Test handling OCR detector exceptions"""
@@ -272,14 +284,15 @@ def test_read_document_handles_ocr_exception(
         "metadata": {},
     }
 
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     assert result["raw_text"] == ""
     assert any("OCR detection failed" in e for e in result["errors"])
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document._has_pdf_support", return_value=False)
-def test_read_document_warns_when_pdf_support_missing(
+async def test_read_document_warns_when_pdf_support_missing(
     mock_has_pdf_support, tmp_path, guard_config
 ):
     pdf_path = tmp_path / "missing_support.pdf"
@@ -292,7 +305,7 @@ def test_read_document_warns_when_pdf_support_missing(
         "metadata": {},
     }
 
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     assert result["raw_text"] == ""
     assert any(
@@ -302,8 +315,9 @@ def test_read_document_warns_when_pdf_support_missing(
     assert result["errors"] == []
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=False)
-def test_read_document_warns_when_ocr_support_missing(
+async def test_read_document_warns_when_ocr_support_missing(
     mock_has_ocr_support, tmp_path, guard_config
 ):
     image_path = tmp_path / "missing_support.png"
@@ -316,7 +330,7 @@ def test_read_document_warns_when_ocr_support_missing(
         "metadata": {},
     }
 
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     assert result["raw_text"] == ""
     assert any(
@@ -326,7 +340,8 @@ def test_read_document_warns_when_ocr_support_missing(
     assert result["errors"] == []
 
 
-def test_read_document_with_multiple_files(tmp_path, guard_config):
+@pytest.mark.asyncio
+async def test_read_document_with_multiple_files(tmp_path, guard_config):
     """Test reading multiple files with file_paths parameter"""
     file1 = tmp_path / "file1.txt"
     file1.write_text("first file", encoding="utf-8")
@@ -344,7 +359,7 @@ def test_read_document_with_multiple_files(tmp_path, guard_config):
         "metadata": {},
     }
 
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     assert result["raw_text"] == "first file second file third file"
     assert result["metadata"]["file_type"] == "text"
@@ -352,7 +367,8 @@ def test_read_document_with_multiple_files(tmp_path, guard_config):
     assert result["errors"] == []
 
 
-def test_read_document_with_multiple_files_and_existing_text(tmp_path, guard_config):
+@pytest.mark.asyncio
+async def test_read_document_with_multiple_files_and_existing_text(tmp_path, guard_config):
     """Test reading multiple files with existing text"""
     file1 = tmp_path / "file1.txt"
     file1.write_text("file one", encoding="utf-8")
@@ -368,7 +384,7 @@ def test_read_document_with_multiple_files_and_existing_text(tmp_path, guard_con
         "metadata": {},
     }
 
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     # Existing text should be preserved and files appended with single space
     assert result["raw_text"] == "existing text file one file two"
@@ -376,7 +392,8 @@ def test_read_document_with_multiple_files_and_existing_text(tmp_path, guard_con
     assert result["errors"] == []
 
 
-def test_read_document_with_empty_file_paths_list(tmp_path, guard_config):
+@pytest.mark.asyncio
+async def test_read_document_with_empty_file_paths_list(tmp_path, guard_config):
     """Test reading with empty file_paths list"""
     state: GuardState = {
         "raw_text": "existing text",
@@ -386,9 +403,40 @@ def test_read_document_with_empty_file_paths_list(tmp_path, guard_config):
         "metadata": {},
     }
 
-    result = read_document(state, fw_config=guard_config)
+    result = await read_document(state, fw_config=guard_config)
 
     # Should preserve existing text
     assert result["raw_text"] == "existing text"
     assert result["warnings"] == []
     assert result["errors"] == []
+
+
+@pytest.mark.asyncio
+async def test_read_document_extracts_files_concurrently_in_order(
+    tmp_path, guard_config
+):
+    """Files are read concurrently but merged in input order"""
+    import threading
+    import time
+
+    slow = tmp_path / "slow.txt"
+    fast = tmp_path / "fast.txt"
+    slow.write_text("slow file", encoding="utf-8")
+    fast.write_text("fast file", encoding="utf-8")
+    # Both reads must be in flight at once for the barrier to release
+    barrier = threading.Barrier(2, timeout=5)
+
+    def read(path):
+        barrier.wait()
+        if path.endswith("slow.txt"):
+            time.sleep(0.05)
+        return Path(path).read_text(encoding="utf-8")
+
+    state: GuardState = {"file_paths": [str(slow), str(fast)], "metadata": {}}
+    with patch(
+        "multiagent_firewall.nodes.document.extract_text_from_file", side_effect=read
+    ):
+        result = await read_document(state, fw_config=guard_config)
+
+    assert result["raw_text"] == "slow file fast file"
+    assert result.get("errors", []) == []
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+
+from multiagent_firewall.config import ExtractionCacheConfig
+from multiagent_firewall.detectors.extraction_cache import (
+    ExtractionCache,
+    extraction_cache_key,
+)
+from multiagent_firewall.nodes.document import read_document
+from multiagent_firewall.types import GuardState
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=250)
+    entry = {"text": "x" * 80}
+    cache.set("aa01", entry)
+    cache.set("bb02", entry)
+    # Make the insertion order unambiguous, then use the older entry
+    for age, key in ((20, "aa01"), (10, "bb02")):
+        path = tmp_path / key[:2] / f"{key}.json"
+        mtime = path.stat().st_mtime - age
+        os.utime(path, (mtime, mtime))
+    assert cache.get("aa01") == entry
+
+    cache.set("cc03", entry)
+
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") == entry
+    assert cache.get("cc03") == entry
+
+
+def test_key_depends_on_extractor_settings():
+    digest = hashlib.sha256(b"report").hexdigest()
+    plumber = extraction_cache_key(digest, "pdf", {"backend": "pdfplumber"})
+
+    assert plumber == extraction_cache_key(digest, "pdf", {"backend": "pdfplumber"})
+    assert plumber != extraction_cache_key(digest, "pdf", {"backend": "pypdfium2"})
+    assert plumber != extraction_cache_key(digest, "text", {"backend": "pdfplumber"})
+
+
+@pytest.fixture
+def cached_config(guard_config, tmp_path):
+    return dataclasses.replace(
+        guard_config,
+        extraction_cache=ExtractionCacheConfig(cache_dir=str(tmp_path / "cache")),
+    )
+
+
+@pytest.mark.asyncio
+async def test_reupload_is_served_from_the_cache(cached_config, tmp_path):
+    first = tmp_path / "notes.txt"
+    first.write_text("Contact jane@example.com", encoding="utf-8")
+    # The same bytes uploaded again under another temporary name
+    second = tmp_path / "upload-2.txt"
+    second.write_bytes(first.read_bytes())
+
+    result = await read_document(
+        {"file_paths": [str(first)], "metadata": {}}, fw_config=cached_config
+    )
+    assert "extraction_cache_hits" not in result["metadata"]
+
+    with patch(
+        "multiagent_firewall.nodes.document.extract_text_from_file"
+    ) as mock_extract:
+        result = await read_document(
+            {"file_paths": [str(second)], "metadata": {}}, fw_config=cached_config
+        )
+
+    mock_extract.assert_not_called()
+    assert result["raw_text"] == "Contact jane@example.com"
+    assert result["metadata"]["extraction_cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_caller_digests_skip_rehashing(cached_config, tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("Contact jane@example.com", encoding="utf-8")
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    state: GuardState = {
+        "file_paths": [str(path)],
+        "file_digests": {str(path): digest},
+        "metadata": {},
+    }
+
+    with patch("multiagent_firewall.nodes.document.file_sha256") as mock_hash:
+        await read_document(state, fw_config=cached_config)
+        result = await read_document(
+            {**state, "metadata": {}}, fw_config=cached_config
+        )
+
+    mock_hash.assert_not_called()
+    assert result["metadata"]["extraction_cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_extractions_are_not_cached(cached_config, tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("Contact jane@example.com", encoding="utf-8")
+    state: GuardState = {"file_paths": [str(path)], "metadata": {}}
+
+    with patch(
+        "multiagent_firewall.nodes.document.extract_text_from_file",
+        return_value=None,
+    ):
+        result = await read_document(dict(state), fw_config=cached_config)
+    assert result["errors"]
+
+    result = await read_document(
+        {"file_paths": [str(path)], "metadata": {}}, fw_config=cached_config
+    )
+    assert result["raw_text"] == "Contact jane@example.com"
+    assert "extraction_cache_hits" not in result["metadata"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import pytest
 import tempfile
 from pathlib import Path
@@ -48,6 +49,24 @@ async def test_validate_file_size_within_limit():
         assert tmp_path.stat().st_size == 1024
 
 
+@pytest.mark.asyncio
+async def test_validate_file_size_hashes_while_streaming():
+    """The optional digest sees exactly the bytes written"""
+    data = bytes(range(256)) * 50
+    with tempfile.TemporaryDirectory() as tmpdir:
+        digest = hashlib.sha256()
+
+        await validate_file_size(
+            MockAsyncFile(data),
+            Path(tmpdir) / "test_file.bin",
+            max_size_bytes=1024 * 1024,
+            chunk_size_bytes=4096,
+            digest=digest,
+        )
+
+        assert digest.hexdigest() == hashlib.sha256(data).hexdigest()
+
+
 @pytest.mark.asyncio
 async def test_validate_file_size_at_exact_limit():
     """File at exact size limit should pass"""
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import base64
+import io
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image, ImageDraw  # noqa: E402
+
+from multiagent_firewall.config import LLMOCRImageConfig  # noqa: E402
+from multiagent_firewall.detectors.image_preprocess import (  # noqa: E402
+    crop_regions_for_llm,
+    prepare_image_for_llm,
+)
+from multiagent_firewall.detectors.ocr import LLMOCRDetector  # noqa: E402
+from multiagent_firewall.nodes.document import llm_ocr_document  # noqa: E402
+from multiagent_firewall.types import GuardState  # noqa: E402
+
+
+def _screenshot(path, size=(3000, 2000)):
+    image = Image.new("RGB", size, (250, 250, 245))
+    draw = ImageDraw.Draw(image)
+    for row in range(0, size[1], 40):
+        draw.text((20, row), f"Invoice line {row} for jane.doe@example.com", fill=(20, 20, 90))
+    image.save(path, format="PNG")
+    return path
+
+
+def test_prepare_image_downscales_grayscales_and_reencodes(tmp_path):
+    path = _screenshot(tmp_path / "shot.png")
+
+    prepared = prepare_image_for_llm(str(path), LLMOCRImageConfig(max_edge=1000))
+
+    assert prepared.preprocessed
+    assert prepared.mime_type == "image/jpeg"
+    assert prepared.bytes_saved > 0
+    with Image.open(io.BytesIO(prepared.data)) as result:
+        assert max(result.size) == 1000
+        assert result.mode == "L"
+
+
+def test_prepare_image_keeps_original_when_disabled_or_unreadable(tmp_path):
+    path = _screenshot(tmp_path / "shot.png", size=(200, 100))
+    disabled = prepare_image_for_llm(str(path), LLMOCRImageConfig(enabled=False))
+    assert not disabled.preprocessed
+    assert disabled.data == path.read_bytes()
+    assert disabled.mime_type == "image/png"
+
+    garbage = tmp_path / "broken.png"
+    garbage.write_bytes(b"not an image")
+    fallback = prepare_image_for_llm(str(garbage), LLMOCRImageConfig())
+    assert fallback.data == b"not an image"
+    assert fallback.bytes_saved == 0
+
+
+@pytest.mark.asyncio
+async def test_llm_ocr_sends_preprocessed_image_and_records_bytes_saved(
+    tmp_path, guard_config
+):
+    path = _screenshot(tmp_path / "shot.png")
+    # No usage metadata: the call is not priced with LiteLLM's cost map
+    response = MagicMock(content="Invoice text", usage_metadata=None)
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(return_value=response)
+
+    state: GuardState = {
+        "raw_text": "",
+        "metadata": {"images_needing_llm_ocr": [str(path)]},
+        "warnings": [],
+        "errors": [],
+    }
+    # Stub the client factory so litellm (and its background threads) is never
+    # imported by this test
+    with patch(
+        "multiagent_firewall.detectors.ocr.build_chat_litellm", return_value=mock_llm
+    ):
+        result = await llm_ocr_document(state, fw_config=guard_config)
+
+    messages = mock_llm.ainvoke.await_args.args[0]
+    url = messages[1].content[0]["image_url"]["url"]
+    assert url.startswith("data:image/jpeg;base64,")
+    sent = base64.b64decode(url.split(",", 1)[1])
+
+    image_bytes = result["metadata"]["llm_ocr_image_bytes"]
+    assert image_bytes["original"] == path.stat().st_size
+    assert image_bytes["sent"] == len(sent)
+    assert image_bytes["saved"] > 0
+    assert result["raw_text"] == "Invoice text"
+
+
+def test_detector_without_settings_sends_original_bytes(tmp_path):
+    path = _screenshot(tmp_path / "shot.png", size=(300, 200))
+    mock_llm = MagicMock()
+    mock_llm.invoke.return_value = "text"
+
+    with patch("langchain_litellm.ChatLiteLLM", return_value=mock_llm):
+        detector = LLMOCRDetector(
+            provider="openai", model="gpt-4o", client_params={"api_key": "k"}
+        )
+        usage: dict = {}
+        detector({"file_path": str(path)}, usage=usage)
+
+    assert usage["image_original_bytes"] == usage["image_sent_bytes"]
+
+
+@pytest.mark.asyncio
+async def test_async_llm_ocr_prepares_images_off_the_event_loop(tmp_path):
+    path = _screenshot(tmp_path / "shot.png", size=(300, 200))
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(return_value="text")
+    threads = []
+
+    def prepare(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return prepare_image_for_llm(*args, **kwargs)
+
+    def crop(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return crop_regions_for_llm(*args, **kwargs)
+
+    with (
+        patch("langchain_litellm.ChatLiteLLM", return_value=mock_llm),
+        patch(
+            "multiagent_firewall.detectors.ocr.prepare_image_for_llm",
+            side_effect=prepare,
+        ),
+        patch(
+            "multiagent_firewall.detectors.ocr.crop_regions_for_llm",
+            side_effect=crop,
+        ),
+    ):
+        detector = LLMOCRDetector(
+            provider="openai", model="gpt-4o", client_params={"api_key": "k"}
+        )
+        await detector.acall({"file_path": str(path)})
+        await detector.acall_regions(str(path), [(0, 0, 100, 50)])
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
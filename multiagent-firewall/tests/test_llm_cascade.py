@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from multiagent_firewall.config import GuardConfig, LLMConfig
+from multiagent_firewall.detectors.cascade import CASCADE_STATS, assess_uncertainty
+from multiagent_firewall.nodes.detection import run_llm_detector
+from multiagent_firewall.types import GuardState
+from multiagent_firewall.utils import ProviderUnavailableError
+
+
+@pytest.fixture(autouse=True)
+def reset_cascade_stats():
+    CASCADE_STATS.reset()
+    yield
+    CASCADE_STATS.reset()
+
+
+@pytest.fixture
+def cascade_config(guard_config) -> GuardConfig:
+    return dataclasses.replace(
+        guard_config,
+        llm_fast=LLMConfig(provider="ollama", model="small", client_params={}),
+    )
+
+
+def _detectors_by_model(fast_result, primary_result):
+    fast = MagicMock()
+    fast.acall = AsyncMock(return_value=fast_result)
+    primary = MagicMock()
+    primary.acall = AsyncMock(return_value=primary_result)
+
+    def factory(**kwargs):
+        return fast if kwargs["model"] == "small" else primary
+
+    return factory, fast, primary
+
+
+def test_assess_uncertainty_confident_result():
+    result = {
+        "detected_fields": [
+            {"field": "EMAIL", "value": "a@b.com", "sources": ["Explicit"]}
+        ]
+    }
+    assert assess_uncertainty(result) == []
+
+
+def test_assess_uncertainty_reasons():
+    result = {
+        "_error": "boom",
+        "detected_fields": [
+            {"field": "EMAIL", "value": "a@b.com", "sources": ["Inferred"]},
+            {"field": "OTHER", "value": "x", "sources": ["Explicit"]},
+            {"field": "PASSWORD", "value": "hunter2"},
+        ],
+    }
+    assert assess_uncertainty(result) == [
+        "fast_error",
+        "inferred_field",
+        "other_label",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cascade_keeps_confident_fast_result(cascade_config):
+    factory, fast, primary = _detectors_by_model(
+        {"detected_fields": [{"field": "EMAIL", "value": "test@example.com"}]},
+        {"detected_fields": []},
+    )
+    state: GuardState = {
+        "normalized_text": "Mail test@example.com",
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector", side_effect=factory
+    ):
+        result = await run_llm_detector(state, fw_config=cascade_config)
+
+    assert [f["value"] for f in result["llm_fields"]] == ["test@example.com"]
+    primary.acall.assert_not_awaited()
+    cascade = result["metadata"]["llm_cascade"]
+    assert cascade["escalated"] is False
+    assert cascade["escalation_rate"] == 0.0
+    assert "fast" in cascade["latency_ms"]
+    assert "primary" not in cascade["latency_ms"]
+
+
+@pytest.mark.asyncio
+async def test_cascade_escalates_uncertain_fast_result(cascade_config):
+    factory, fast, primary = _detectors_by_model(
+        {"detected_fields": [{"field": "OTHER", "value": "maybe"}]},
+        {"detected_fields": [{"field": "PASSWORD", "value": "s3cret"}]},
+    )
+    state: GuardState = {
+        "normalized_text": "pw s3cret",
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector", side_effect=factory
+    ):
+        result = await run_llm_detector(state, fw_config=cascade_config)
+
+    assert [f["field"] for f in result["llm_fields"]] == ["PASSWORD"]
+    cascade = result["metadata"]["llm_cascade"]
+    assert cascade["escalated"] is True
+    assert cascade["reasons"] == ["other_label"]
+    assert cascade["escalation_rate"] == 1.0
+    assert set(cascade["latency_ms"]) == {"fast", "primary"}
+
+
+@pytest.mark.asyncio
+async def test_cascade_keeps_fast_fields_when_primary_unavailable(cascade_config):
+    factory, fast, primary = _detectors_by_model(
+        {"detected_fields": [{"field": "EMAIL", "value": "a@b.com", "sources": ["Inferred"]}]},
+        None,
+    )
+    primary.acall = AsyncMock(side_effect=ProviderUnavailableError("circuit is open"))
+    state: GuardState = {
+        "normalized_text": "a@b.com",
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector", side_effect=factory
+    ):
+        result = await run_llm_detector(state, fw_config=cascade_config)
+
+    assert [f["value"] for f in result["llm_fields"]] == ["a@b.com"]
+    assert any("primary unavailable" in w for w in result["warnings"])
+
+
+def test_config_from_env_enables_fast_tier(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_MODEL", "gpt-4o")
+    monkeypatch.setenv("LLM_API_KEY", "key")
+    monkeypatch.setenv("LLM_FAST_MODEL", "gpt-4o-mini")
+
+    config = GuardConfig.from_env()
+
+    assert config.llm_fast is not None
+    assert config.llm_fast.model == "gpt-4o-mini"
+    assert config.llm_fast.provider == "openai"
+
+
+def test_config_from_env_without_fast_tier(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_MODEL", "gpt-4o")
+    monkeypatch.setenv("LLM_API_KEY", "key")
+    monkeypatch.delenv("LLM_FAST_MODEL", raising=False)
+
+    assert GuardConfig.from_env().llm_fast is None
+
+
+@pytest.mark.asyncio
+async def test_cascade_metadata_is_merged_across_chunks(cascade_config):
+    config = dataclasses.replace(
+        cascade_config,
+        llm=dataclasses.replace(
+            cascade_config.llm, max_input_tokens=20, overflow_policy="chunk"
+        ),
+    )
+    fast = MagicMock()
+    # Only the chunks with the password look uncertain
+    fast.acall = AsyncMock(
+        side_effect=lambda text: {
+            "detected_fields": [
+                {"field": "OTHER" if "s3cret" in text else "EMAIL", "value": "x"}
+            ]
+        }
+    )
+    primary = MagicMock()
+    primary.acall = AsyncMock(return_value={"detected_fields": []})
+    state: GuardState = {
+        "normalized_text": "mail a@b.com " * 8 + "pw s3cret " * 8,
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector",
+        side_effect=lambda **kw: fast if kw["model"] == "small" else primary,
+    ):
+        result = await run_llm_detector(state, fw_config=config)
+
+    cascade = result["metadata"]["llm_cascade"]
+    assert cascade["chunks"] == fast.acall.await_count > 1
+    assert cascade["escalated"] is True
+    assert cascade["escalated_chunks"] == primary.acall.await_count >= 1
+    assert cascade["reasons"] == ["other_label"]
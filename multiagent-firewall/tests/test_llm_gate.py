@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from multiagent_firewall.config import LLMGateConfig
+from multiagent_firewall.detectors.llm_gate import (
+    LLMGateModel,
+    examples_from_states,
+    featurize,
+    label_from_state,
+    load_llm_gate,
+    train_llm_gate,
+)
+from multiagent_firewall.nodes.gating import evaluate_llm_gate
+from multiagent_firewall.routers import route_after_dlp_ner, should_run_llm
+from multiagent_firewall.types import GuardState
+
+BENIGN = [
+    "What is the weather like today",
+    "Summarize this article about gardening",
+    "Write a poem about the sea",
+    "How do I sort a list in python",
+    "Translate hello world into french",
+    "Explain the theory of relativity simply",
+]
+SENSITIVE = [
+    "My diagnosis is type 2 diabetes and I take metformin",
+    "I was born in Madrid and my mother is Ana Lopez",
+    "Patient record shows diagnosis of asthma",
+    "My religion is catholic and my diagnosis is depression",
+    "born in Lisbon, mother maiden name Silva",
+    "diagnosis hypertension for my father Carlos",
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_gate_cache():
+    load_llm_gate.cache_clear()
+    yield
+    load_llm_gate.cache_clear()
+
+
+@pytest.fixture
+def trained_model() -> LLMGateModel:
+    examples = [(t, False) for t in BENIGN] + [(t, True) for t in SENSITIVE]
+    return train_llm_gate(examples, dim=1 << 12, epochs=20)
+
+
+def test_featurize_is_stable_and_bounded():
+    first = featurize("Hello World 1234", dim=1 << 10)
+    second = featurize("Hello World 1234", dim=1 << 10)
+    assert sorted(first) == sorted(second)
+    assert all(0 <= b < 1 << 10 for b in first)
+
+
+def test_label_from_state():
+    assert label_from_state({"normalized_text": "x"}) is None
+    assert (
+        label_from_state(
+            {
+                "dlp_fields": [{"field": "EMAIL", "value": "a@b.com"}],
+                "llm_fields": [{"field": "EMAIL", "value": "A@b.com"}],
+            }
+        )
+        is False
+    )
+    assert (
+        label_from_state({"llm_fields": [{"field": "DIAGNOSIS", "value": "asthma"}]})
+        is True
+    )
+
+
+def test_examples_from_states_skips_unlabelled_records():
+    states = [
+        {"normalized_text": "hello", "llm_fields": []},
+        {"normalized_text": "no llm run"},
+        {"normalized_text": "", "llm_fields": []},
+    ]
+    assert examples_from_states(states) == [("hello", False)]
+
+
+def test_trained_model_separates_classes(trained_model):
+    positive = trained_model.predict_proba("my diagnosis is asthma")
+    negative = trained_model.predict_proba("write a poem about gardening")
+    assert positive > negative
+
+
+def test_threshold_for_recall_is_monotonic(trained_model):
+    assert trained_model.threshold_for_recall(0.5) >= trained_model.threshold_for_recall(
+        0.99
+    )
+    assert trained_model.threshold_for_recall(1.0) == trained_model.recall_quantiles[0]
+
+
+def test_model_roundtrip(tmp_path, trained_model):
+    path = tmp_path / "gate.json"
+    trained_model.save(path)
+    loaded = load_llm_gate(str(path))
+    text = "my mother was born in Madrid"
+    assert loaded.predict_proba(text) == pytest.approx(
+        trained_model.predict_proba(text), abs=1e-4
+    )
+
+
+def test_evaluate_llm_gate_records_decision(tmp_path, guard_config, trained_model):
+    path = tmp_path / "gate.json"
+    trained_model.save(path)
+    config = dataclasses.replace(
+        guard_config,
+        llm_gate=LLMGateConfig(enabled=True, model_path=str(path), recall_target=0.9),
+    )
+    state: GuardState = {"normalized_text": "write a poem about the sea", "metadata": {}}
+
+    result = evaluate_llm_gate(state, fw_config=config)
+
+    gate = result["metadata"]["llm_gate"]
+    assert gate["skip_llm"] is True
+    assert gate["score"] < gate["threshold"]
+
+
+def test_evaluate_llm_gate_noop_when_disabled_or_forced(tmp_path, guard_config):
+    state: GuardState = {"normalized_text": "text", "metadata": {}}
+    assert "llm_gate" not in evaluate_llm_gate(state, fw_config=guard_config)["metadata"]
+
+    config = dataclasses.replace(
+        guard_config,
+        llm_gate=LLMGateConfig(enabled=True, model_path=str(tmp_path / "missing.json")),
+    )
+    forced: GuardState = {"normalized_text": "text", "metadata": {}, "force_llm_detector": True}
+    assert "llm_gate" not in evaluate_llm_gate(forced, fw_config=config)["metadata"]
+
+    result = evaluate_llm_gate(state, fw_config=config)
+    assert "llm_gate" not in result["metadata"]
+    assert any("LLM gate disabled" in w for w in result["warnings"])
+
+
+def test_routers_honour_gate_skip():
+    skip = {"metadata": {"llm_gate": {"skip_llm": True}}}
+    assert route_after_dlp_ner(skip) == "__end__"
+    assert should_run_llm({**skip, "decision": "warn"}) == "remediation"
+    assert should_run_llm({**skip, "force_llm_detector": True}) == "anonymize_dlp_ner"
+
+    keep = {"metadata": {"llm_gate": {"skip_llm": False}}}
+    assert route_after_dlp_ner(keep) == "llm_detector"
+    assert should_run_llm(keep) == "anonymize_dlp_ner"
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 import tempfile
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -300,3 +300,24 @@ def test_llm_ocr_detector_handles_unknown_image_type():
             assert result == "Text"
     finally:
         os.unlink(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_llm_ocr_detector_acall_uses_async_invoke(tmp_path):
+    """Test the async variant awaits ainvoke instead of blocking on invoke"""
+    image = tmp_path / "scan.png"
+    image.write_bytes(b"fake image data")
+    mock_response = MagicMock()
+    mock_response.content = "Async text"
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+
+    with patch("langchain_litellm.ChatLiteLLM", return_value=mock_llm):
+        detector = LLMOCRDetector(
+            provider="openai", model="gpt-4o", client_params={"api_key": "test-key"}
+        )
+        result = await detector.acall({"file_path": str(image)})
+
+    assert result == "Async text"
+    assert mock_llm.ainvoke.await_count == 1
+    assert not mock_llm.invoke.called
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -8,7 +8,8 @@ from multiagent_firewall.nodes.document import llm_ocr_document
 from multiagent_firewall.types import GuardState
 
 
-def test_llm_ocr_document_skips_non_image(guard_config):
+@pytest.mark.asyncio
+async def test_llm_ocr_document_skips_non_image(guard_config):
     """Test that LLM OCR skips when no images need processing"""
     state: GuardState = {
         "raw_text": "",
@@ -17,14 +18,15 @@ def test_llm_ocr_document_skips_non_image(guard_config):
         "errors": [],
     }
 
-    result = llm_ocr_document(state, fw_config=guard_config)
+    result = await llm_ocr_document(state, fw_config=guard_config)
 
     # State should be unchanged
     assert result["raw_text"] == ""
     assert len(result.get("warnings", [])) == 0
 
 
-def test_llm_ocr_document_skips_when_text_exists(guard_config):
+@pytest.mark.asyncio
+async def test_llm_ocr_document_skips_when_text_exists(guard_config):
     """Test that LLM OCR skips when no images need processing"""
     state: GuardState = {
         "raw_text": "Already extracted text",
@@ -33,21 +35,22 @@ def test_llm_ocr_document_skips_when_text_exists(guard_config):
         "errors": [],
     }
 
-    result = llm_ocr_document(state, fw_config=guard_config)
+    result = await llm_ocr_document(state, fw_config=guard_config)
 
     # State should be unchanged (no images in the list to process)
     assert result["raw_text"] == "Already extracted text"
     assert len(result.get("warnings", [])) == 0
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document.LLMOCRDetector")
-def test_llm_ocr_document_skips_when_text_is_whitespace(
+async def test_llm_ocr_document_skips_when_text_is_whitespace(
     mock_ocr_detector, guard_config
 ):
     """Test that LLM OCR runs when image is in processing list"""
     mock_detector = MagicMock()
     mock_detector.model = "gpt-4o"
-    mock_detector.return_value = "Extracted by LLM"
+    mock_detector.acall = AsyncMock(return_value="Extracted by LLM")
     mock_ocr_detector.return_value = mock_detector
 
     state: GuardState = {
@@ -61,7 +64,7 @@ def test_llm_ocr_document_skips_when_text_is_whitespace(
         "errors": [],
     }
 
-    result = llm_ocr_document(state, fw_config=guard_config)
+    result = await llm_ocr_document(state, fw_config=guard_config)
 
     # Should have extracted text via LLM
     assert "Extracted by LLM" in result["raw_text"]
@@ -69,12 +72,13 @@ def test_llm_ocr_document_skips_when_text_is_whitespace(
     assert result["metadata"]["ocr_method"] == "llm"
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document.LLMOCRDetector")
-def test_llm_ocr_document_extracts_text_successfully(mock_ocr_detector, guard_config):
+async def test_llm_ocr_document_extracts_text_successfully(mock_ocr_detector, guard_config):
     """Test successful text extraction via LLM OCR"""
     mock_detector = MagicMock()
     mock_detector.model = "gpt-4o"
-    mock_detector.return_value = "Text extracted by LLM OCR"
+    mock_detector.acall = AsyncMock(return_value="Text extracted by LLM OCR")
     mock_ocr_detector.return_value = mock_detector
 
     state: GuardState = {
@@ -88,7 +92,7 @@ def test_llm_ocr_document_extracts_text_successfully(mock_ocr_detector, guard_co
         "errors": [],
     }
 
-    result = llm_ocr_document(state, fw_config=guard_config)
+    result = await llm_ocr_document(state, fw_config=guard_config)
 
     # Should have extracted text
     assert result["raw_text"] == "Text extracted by LLM OCR"
@@ -98,12 +102,13 @@ def test_llm_ocr_document_extracts_text_successfully(mock_ocr_detector, guard_co
     assert len(result.get("errors", [])) == 0
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document.LLMOCRDetector")
-def test_llm_ocr_document_appends_to_existing_text(mock_ocr_detector, guard_config):
+async def test_llm_ocr_document_appends_to_existing_text(mock_ocr_detector, guard_config):
     """Test that LLM OCR appends to existing text if present"""
     mock_detector = MagicMock()
     mock_detector.model = "gpt-4o"
-    mock_detector.return_value = "New text from LLM"
+    mock_detector.acall = AsyncMock(return_value="New text from LLM")
     mock_ocr_detector.return_value = mock_detector
 
     state: GuardState = {
@@ -117,7 +122,7 @@ def test_llm_ocr_document_appends_to_existing_text(mock_ocr_detector, guard_conf
         "errors": [],
     }
 
-    result = llm_ocr_document(state, fw_config=guard_config)
+    result = await llm_ocr_document(state, fw_config=guard_config)
 
     # Should append to existing text with single space separator
     assert "Existing content" in result["raw_text"]
@@ -125,14 +130,15 @@ def test_llm_ocr_document_appends_to_existing_text(mock_ocr_detector, guard_conf
     assert result["raw_text"] == "Existing content New text from LLM"
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document.LLMOCRDetector")
-def test_llm_ocr_document_adds_warning_when_no_text_extracted(
+async def test_llm_ocr_document_adds_warning_when_no_text_extracted(
     mock_ocr_detector, guard_config
 ):
     """Test that warning is added when LLM returns empty text"""
     mock_detector = MagicMock()
     mock_detector.model = "gpt-4o"
-    mock_detector.return_value = ""  # Empty result
+    mock_detector.acall = AsyncMock(return_value="")  # Empty result
     mock_ocr_detector.return_value = mock_detector
 
     state: GuardState = {
@@ -146,7 +152,7 @@ def test_llm_ocr_document_adds_warning_when_no_text_extracted(
         "errors": [],
     }
 
-    result = llm_ocr_document(state, fw_config=guard_config)
+    result = await llm_ocr_document(state, fw_config=guard_config)
 
     # Should have warning
     assert len(result["warnings"]) == 1
@@ -154,12 +160,13 @@ def test_llm_ocr_document_adds_warning_when_no_text_extracted(
     assert result["raw_text"] == ""
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document.LLMOCRDetector")
-def test_llm_ocr_document_handles_detector_exception(mock_ocr_detector, guard_config):
+async def test_llm_ocr_document_handles_detector_exception(mock_ocr_detector, guard_config):
     """Test that exceptions from detector are handled gracefully"""
     mock_detector = MagicMock()
     mock_detector.model = "gpt-4o"
-    mock_detector.side_effect = RuntimeError("API call failed")
+    mock_detector.acall = AsyncMock(side_effect=RuntimeError("API call failed"))
     mock_ocr_detector.return_value = mock_detector
 
     state: GuardState = {
@@ -173,7 +180,7 @@ def test_llm_ocr_document_handles_detector_exception(mock_ocr_detector, guard_co
         "errors": [],
     }
 
-    result = llm_ocr_document(state, fw_config=guard_config)
+    result = await llm_ocr_document(state, fw_config=guard_config)
 
     # Should have error
     assert len(result["errors"]) == 1
@@ -182,8 +189,9 @@ def test_llm_ocr_document_handles_detector_exception(mock_ocr_detector, guard_co
     assert result["raw_text"] == ""
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document.LLMOCRDetector")
-def test_llm_ocr_document_handles_from_env_exception(mock_ocr_detector, guard_config):
+async def test_llm_ocr_document_handles_from_env_exception(mock_ocr_detector, guard_config):
     """Test that exceptions from initialization are handled gracefully"""
     state: GuardState = {
         "raw_text": "",
@@ -197,7 +205,7 @@ def test_llm_ocr_document_handles_from_env_exception(mock_ocr_detector, guard_co
     }
 
     mock_ocr_detector.side_effect = RuntimeError("Missing API key")
-    result = llm_ocr_document(state, fw_config=guard_config)
+    result = await llm_ocr_document(state, fw_config=guard_config)
 
     # Should have error
     assert len(result["errors"]) == 1
@@ -205,12 +213,13 @@ def test_llm_ocr_document_handles_from_env_exception(mock_ocr_detector, guard_co
     assert "Missing API key" in result["errors"][0]
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document.LLMOCRDetector")
-def test_llm_ocr_document_metadata_not_present(mock_ocr_detector, guard_config):
+async def test_llm_ocr_document_metadata_not_present(mock_ocr_detector, guard_config):
     """Test that node skips when no images_needing_llm_ocr list"""
     mock_detector = MagicMock()
     mock_detector.model = "gpt-4o"
-    mock_detector.return_value = "Extracted text"
+    mock_detector.acall = AsyncMock(return_value="Extracted text")
     mock_ocr_detector.return_value = mock_detector
 
     state: GuardState = {
@@ -221,18 +230,19 @@ def test_llm_ocr_document_metadata_not_present(mock_ocr_detector, guard_config):
     }
     # Note: metadata not in state, so no images_needing_llm_ocr list
 
-    result = llm_ocr_document(state, fw_config=guard_config)
+    result = await llm_ocr_document(state, fw_config=guard_config)
 
     # Should skip because no images in processing list
     assert result["raw_text"] == ""
 
 
+@pytest.mark.asyncio
 @patch("multiagent_firewall.nodes.document.LLMOCRDetector")
-def test_llm_ocr_document_sets_metadata_correctly(mock_ocr_detector, guard_config):
+async def test_llm_ocr_document_sets_metadata_correctly(mock_ocr_detector, guard_config):
     """Test that metadata is set correctly after successful extraction"""
     mock_detector = MagicMock()
     mock_detector.model = "claude-3-opus"
-    mock_detector.return_value = "Claude extracted this"
+    mock_detector.acall = AsyncMock(return_value="Claude extracted this")
     mock_ocr_detector.return_value = mock_detector
 
     state: GuardState = {
@@ -247,7 +257,7 @@ def test_llm_ocr_document_sets_metadata_correctly(mock_ocr_detector, guard_confi
         "errors": [],
     }
 
-    result = llm_ocr_document(state, fw_config=guard_config)
+    result = await llm_ocr_document(state, fw_config=guard_config)
 
     # Check metadata
     assert result["metadata"]["llm_ocr_used"] is True
@@ -256,3 +266,44 @@ def test_llm_ocr_document_sets_metadata_correctly(mock_ocr_detector, guard_confi
     assert result["metadata"]["other_key"] == "value"
     # images_needing_llm_ocr should be removed after processing
     assert "images_needing_llm_ocr" not in result["metadata"]
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.LLMOCRDetector")
+async def test_llm_ocr_document_runs_images_concurrently_in_order(
+    mock_ocr_detector, guard_config
+):
+    """Images are OCRed concurrently under the limit and merged in input order"""
+    import asyncio
+    import dataclasses
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_acall(state, usage=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        path = state["file_path"]
+        # Earlier images finish last
+        await asyncio.sleep(0.05 if path.endswith("0.png") else 0.01)
+        in_flight -= 1
+        return f"text-{path[-5]}"
+
+    mock_detector = MagicMock()
+    mock_detector.acall = fake_acall
+    mock_ocr_detector.return_value = mock_detector
+    config = dataclasses.replace(guard_config, llm_ocr_concurrency=2)
+
+    state: GuardState = {
+        "raw_text": "",
+        "metadata": {"images_needing_llm_ocr": [f"/fake/{i}.png" for i in range(4)]},
+        "warnings": [],
+        "errors": [],
+    }
+
+    result = await llm_ocr_document(state, fw_config=config)
+
+    assert result["raw_text"] == "text-0 text-1 text-2 text-3"
+    assert peak == 2
+    assert result["metadata"]["llm_ocr_images_processed"] == 4
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import pytest
+from unittest.mock import MagicMock, patch
+from langchain_core.messages import AIMessage
+
+from multiagent_firewall.detectors import llm
+from multiagent_firewall.detectors.llm import LiteLLMDetector, supports_cache_control
+from multiagent_firewall.nodes.detection import run_llm_detector
+from multiagent_firewall.types import GuardState
+
+
+class RecordingChatModel:
+    """Local stand-in for a provider: records request messages, reports usage."""
+
+    def __init__(self, cached: int = 0) -> None:
+        self.requests: list = []
+        self._cached = cached
+
+    def bind(self, **kwargs):
+        return self
+
+    def _response(self) -> AIMessage:
+        return AIMessage(
+            content='{"detected_fields": []}',
+            usage_metadata={
+                "input_tokens": 1200,
+                "output_tokens": 8,
+                "total_tokens": 1208,
+                "input_token_details": {"cache_read": self._cached},
+            },
+        )
+
+    def invoke(self, messages):
+        self.requests.append(messages)
+        return self._response()
+
+    async def ainvoke(self, messages):
+        self.requests.append(messages)
+        return self._response()
+
+
+def test_supports_cache_control():
+    assert supports_cache_control("anthropic", "claude-3-5-sonnet")
+    assert supports_cache_control("bedrock", "anthropic.claude-3-haiku")
+    assert not supports_cache_control("bedrock", "amazon.titan-text")
+    assert not supports_cache_control("openai", "gpt-4o-mini")
+
+
+def test_anthropic_system_prompt_carries_cache_control():
+    model = RecordingChatModel()
+    detector = LiteLLMDetector(
+        provider="anthropic", model="claude-3-5-haiku", client_params={}, llm=model
+    )
+
+    detector("hello")
+
+    system, user = model.requests[0]
+    assert system.content[0]["cache_control"] == {"type": "ephemeral"}
+    assert "{sensitive_fields}" not in system.content[0]["text"]
+    assert user.content == "hello"
+
+
+def test_openai_prefix_is_stable_and_hint_free():
+    model = RecordingChatModel()
+    detector = LiteLLMDetector(
+        provider="openai", model="gpt-4o-mini", client_params={}, llm=model
+    )
+
+    detector("first request")
+    detector("second request")
+
+    first, second = model.requests
+    assert isinstance(first[0].content, str)
+    assert first[0].content == second[0].content
+
+
+def test_prompt_cache_can_be_disabled():
+    model = RecordingChatModel()
+    detector = LiteLLMDetector(
+        provider="anthropic",
+        model="claude-3-5-haiku",
+        client_params={},
+        llm=model,
+        prompt_cache=False,
+    )
+
+    detector("hello")
+
+    assert isinstance(model.requests[0][0].content, str)
+
+
+def test_system_prompt_template_is_read_once():
+    llm._load_system_prompt.cache_clear()
+    detector = LiteLLMDetector(
+        provider="openai", model="gpt-4o-mini", client_params={}, llm=MagicMock()
+    )
+
+    detector._build_prompt("a")
+    detector._build_prompt("b")
+
+    assert llm._load_system_prompt.cache_info().misses == 1
+
+
+def test_detector_reports_cached_and_uncached_input_tokens():
+    detector = LiteLLMDetector(
+        provider="anthropic",
+        model="claude-3-5-haiku",
+        client_params={},
+        llm=RecordingChatModel(cached=1024),
+    )
+
+    result = detector("hello")
+
+    usage = result["_usage"]
+    assert {key: usage[key] for key in usage if key.endswith("_tokens")} == {
+        "input_tokens": 1200,
+        "cached_input_tokens": 1024,
+        "uncached_input_tokens": 176,
+        "cache_creation_input_tokens": 0,
+        "output_tokens": 8,
+    }
+
+
+@pytest.mark.asyncio
+async def test_run_llm_detector_records_usage_in_metadata(guard_config):
+    detector = LiteLLMDetector(
+        provider="openai",
+        model="gpt-4o-mini",
+        client_params={},
+        llm=RecordingChatModel(cached=1024),
+    )
+    state: GuardState = {
+        "normalized_text": "hello",
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector", return_value=detector
+    ):
+        result = await run_llm_detector(state, fw_config=guard_config)
+
+    usage = result["metadata"]["llm_usage"]
+    assert usage["calls"] == 1
+    assert usage["cached_input_tokens"] == 1024
+    assert usage["uncached_input_tokens"] == 176
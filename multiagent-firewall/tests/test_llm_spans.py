@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from unittest.mock import MagicMock
+from langchain_core.messages import AIMessage
+
+from multiagent_firewall.config import GuardConfig, LLM_DETECTOR_SPANS_PROMPT
+from multiagent_firewall.detectors.llm import LiteLLMDetector
+from multiagent_firewall.detectors.spans import (
+    reconstruct_fields,
+    render_spans,
+    segment_text,
+)
+
+
+def _fake_llm(payload: dict) -> MagicMock:
+    fake = MagicMock()
+    fake.bind.return_value = fake
+    fake.invoke.return_value = AIMessage(content=json.dumps(payload))
+    return fake
+
+
+def test_segment_text_splits_on_word_budget_and_newlines():
+    text = "one two three four\nfive six"
+    spans = segment_text(text, max_words=3)
+
+    assert render_spans(text, spans) == "[1] one two three\n[2] four\n[3] five six"
+
+
+def test_reconstruct_fields_rebuilds_values_locally():
+    text = "Contact Alice Smith at alice@example.com, thanks"
+    spans = segment_text(text)
+    result = {
+        "spans": [
+            [1, 1, 3, "FULL_NAME", "Explicit"],
+            {"span_id": 1, "start": 4, "end": 5, "field": "EMAIL"},
+        ]
+    }
+
+    assert reconstruct_fields(result, text, spans) == [
+        {"field": "FULL_NAME", "value": "Alice Smith", "sources": ["Explicit"]},
+        {"field": "EMAIL", "value": "alice@example.com"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        [2, 0, 1, "EMAIL"],  # unknown span
+        [1, 3, 3, "EMAIL"],  # empty range
+        [1, 0, 9, "EMAIL"],  # past the end of the span
+        [1, "x", 1, "EMAIL"],  # not an offset
+        [1, 0, 1],  # missing field
+        [1, 1, 2, "PERSON"],  # placeholder token
+    ],
+)
+def test_reconstruct_fields_drops_invalid_tuples(raw):
+    text = "Hi <<REDACTED:PERSON_1>> there"
+    assert reconstruct_fields({"spans": [raw]}, text, segment_text(text)) == []
+
+
+def test_detector_spans_mode_uses_spans_prompt_and_offsets():
+    fake = _fake_llm({"spans": [[1, 2, 3, "PASSWORD", "Explicit"]]})
+    detector = LiteLLMDetector(
+        provider="dummy",
+        model="dummy",
+        client_params={},
+        llm=fake,
+        output_format="spans",
+    )
+
+    result = detector("my password: hunter2")
+
+    messages = fake.invoke.call_args.args[0]
+    assert messages[1].content == "[1] my password: hunter2"
+    assert result["_prompt_source"] == f"prompts/{LLM_DETECTOR_SPANS_PROMPT}"
+    assert result["detected_fields"] == [
+        {"field": "PASSWORD", "value": "hunter2", "sources": ["Explicit"]}
+    ]
+    assert "spans" not in result
+
+
+def test_detector_rejects_unknown_output_format():
+    with pytest.raises(ValueError):
+        LiteLLMDetector(
+            provider="dummy",
+            model="dummy",
+            client_params={},
+            llm=MagicMock(),
+            output_format="xml",
+        )
+
+
+def test_config_from_env_parses_output_format(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_MODEL", "gpt-4o")
+    monkeypatch.setenv("LLM_API_KEY", "key")
+    monkeypatch.setenv("LLM_OUTPUT_FORMAT", "Spans")
+    assert GuardConfig.from_env().llm.output_format == "spans"
+
+    monkeypatch.setenv("LLM_OUTPUT_FORMAT", "bogus")
+    assert GuardConfig.from_env().llm.output_format == "values"
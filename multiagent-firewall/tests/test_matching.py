@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from multiagent_firewall.nodes.detection import _anonymized_value_checker
+from multiagent_firewall.utils.matching import AhoCorasickMatcher
+
+
+def _naive_contains(text: str, patterns) -> bool:
+    return any(p and p in text for p in patterns)
+
+
+@pytest.mark.parametrize(
+    "patterns,text,expected",
+    [
+        (["he", "she", "his", "hers"], "ushers", True),
+        (["abcd", "bc"], "xabcx", True),
+        (["abcd"], "abcabd", False),
+        (["", "zz"], "abc", False),
+        ([], "abc", False),
+        (["<<REDACTED:EMAIL_1>>"], "mail <<REDACTED:EMAIL_1>> now", True),
+    ],
+)
+def test_contains_any(patterns, text, expected):
+    assert AhoCorasickMatcher(patterns).contains_any(text) is expected
+
+
+def test_contains_any_matches_naive_search():
+    rng = random.Random(7)
+    alphabet = "abc"
+    for _ in range(300):
+        patterns = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 6))
+        ]
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        assert AhoCorasickMatcher(patterns).contains_any(text) == _naive_contains(
+            text, patterns
+        )
+
+
+def test_anonymized_value_checker_keeps_filter_semantics():
+    mapping = {
+        "alice@example.com": "<<REDACTED:EMAIL_1>>",
+        "Bob": "<<REDACTED:FIRST_NAME_1>>",
+    }
+    is_anonymized = _anonymized_value_checker(mapping)
+
+    assert is_anonymized("<<REDACTED:EMAIL_1>>")
+    assert is_anonymized("REDACTED:EMAIL_1")
+    assert is_anonymized("email_1")
+    assert is_anonymized("contact REDACTED:FIRST_NAME_1 today")
+    assert is_anonymized("<<SOMETHING>>")
+    assert is_anonymized("alice@example.com")
+    assert is_anonymized("  bob ")
+    assert not is_anonymized("carol@example.com")
+    assert not is_anonymized("Bobby Tables")
+
+
+def test_anonymized_value_checker_is_not_kept_across_requests():
+    mapping = {"x@y.com": "<<REDACTED:EMAIL_1>>"}
+    assert _anonymized_value_checker(mapping) is not _anonymized_value_checker(
+        dict(mapping)
+    )
+    assert not _anonymized_value_checker({})("anything")
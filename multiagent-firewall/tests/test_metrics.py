@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import pytest
+from unittest.mock import MagicMock, patch
+from langchain_core.messages import AIMessage
+
+from multiagent_firewall.detectors.ocr import LLMOCRDetector
+from multiagent_firewall.detectors.utils import build_call_usage
+from multiagent_firewall.metrics import LLM_METRICS, metrics_snapshot, record_llm_usage
+from multiagent_firewall.nodes.document import llm_ocr_document
+from multiagent_firewall.types import GuardState
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    LLM_METRICS.reset()
+    yield
+    LLM_METRICS.reset()
+
+
+def _response(input_tokens: int = 1000, output_tokens: int = 100) -> AIMessage:
+    return AIMessage(
+        content="text",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_token_details": {"cache_read": 200},
+        },
+    )
+
+
+def test_build_call_usage_reports_tokens_cost_latency_and_retries():
+    usage = build_call_usage(
+        _response(), provider="openai", model="gpt-4o-mini", latency_ms=12.345, retries=1
+    )
+
+    assert usage["input_tokens"] == 1000
+    assert usage["cached_input_tokens"] == 200
+    assert usage["uncached_input_tokens"] == 800
+    assert usage["output_tokens"] == 100
+    assert usage["latency_ms"] == 12.35
+    assert usage["retries"] == 1
+    assert usage["cost_usd"] > 0
+
+
+def test_build_call_usage_without_provider_usage():
+    usage = build_call_usage(
+        MagicMock(), provider="ollama", model="llama3", latency_ms=5.0
+    )
+
+    assert usage == {"latency_ms": 5.0, "retries": 0}
+
+
+def test_record_llm_usage_sums_per_request_and_per_node():
+    state: GuardState = {"metadata": {}}
+    call = {"input_tokens": 10, "output_tokens": 2, "latency_ms": 4.0, "retries": 0}
+
+    record_llm_usage(state, "llm_detector", call, model="gpt-4o-mini")
+    record_llm_usage(state, "llm_detector", call, model="gpt-4o-mini")
+    record_llm_usage(state, "llm_ocr", {**call, "retries": 1}, model="gpt-4o")
+    record_llm_usage(state, "llm_ocr", None, model="gpt-4o")
+
+    usage = state["metadata"]["llm_usage"]
+    assert usage["calls"] == 3
+    assert usage["input_tokens"] == 30
+    assert usage["retries"] == 1
+    assert usage["by_node"]["llm_detector"]["calls"] == 2
+    assert usage["by_node"]["llm_ocr"]["latency_ms"] == 4.0
+
+    snapshot = metrics_snapshot()
+    detector = snapshot["llm"]["llm_detector"]["gpt-4o-mini"]
+    assert detector["calls"] == 2
+    assert detector["avg_latency_ms"] == 4.0
+    assert detector["max_latency_ms"] == 4.0
+    assert "cascade" in snapshot and "providers" in snapshot
+
+
+def test_llm_ocr_detector_fills_usage(tmp_path):
+    image = tmp_path / "scan.png"
+    image.write_bytes(b"fake image data")
+    mock_llm = MagicMock()
+    mock_llm.invoke.return_value = _response()
+
+    with patch("langchain_litellm.ChatLiteLLM", return_value=mock_llm):
+        detector = LLMOCRDetector(
+            provider="openai", model="gpt-4o", client_params={"api_key": "k"}
+        )
+        usage: dict = {}
+        assert detector({"file_path": str(image)}, usage=usage) == "text"
+
+    assert usage["input_tokens"] == 1000
+    assert "latency_ms" in usage
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.LLMOCRDetector")
+async def test_llm_ocr_node_records_usage(mock_ocr_detector, guard_config):
+    async def fake_ocr(state, usage=None):
+        usage.update({"input_tokens": 500, "output_tokens": 20, "latency_ms": 30.0})
+        return "extracted"
+
+    mock_ocr_detector.return_value = MagicMock(acall=fake_ocr)
+    state: GuardState = {
+        "raw_text": "",
+        "metadata": {"images_needing_llm_ocr": ["/tmp/a.png", "/tmp/b.png"]},
+        "warnings": [],
+        "errors": [],
+    }
+
+    result = await llm_ocr_document(state, fw_config=guard_config)
+
+    usage = result["metadata"]["llm_usage"]
+    assert usage["by_node"]["llm_ocr"]["calls"] == 2
+    assert usage["input_tokens"] == 1000
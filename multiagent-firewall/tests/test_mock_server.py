@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import random
+import urllib.error
+import urllib.request
+
+import pytest
+
+from multiagent_firewall.detectors.llm import LiteLLMDetector
+from multiagent_firewall.mock_server import LatencyModel, MockLLMServer, MockSettings
+
+TEXT = "Contact me at jane.doe@example.com about the invoice."
+
+
+def _post(base_url: str, body: dict) -> tuple[int, bytes]:
+    request = urllib.request.Request(
+        f"{base_url}/chat/completions",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.read()
+
+
+def _chat(system: str, user) -> dict:
+    return {
+        "model": "mock",
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+    }
+
+
+def test_latency_model_parsing_and_sampling():
+    rng = random.Random(0)
+    assert LatencyModel.parse("fixed:25").sample_ms(rng) == 25
+    uniform = LatencyModel.parse("uniform:10:20")
+    assert all(10 <= uniform.sample_ms(rng) <= 20 for _ in range(20))
+    assert LatencyModel.parse("lognormal:100:0.5").sample_ms(rng) > 0
+    with pytest.raises(ValueError):
+        LatencyModel.parse("gamma:1")
+
+
+def test_detections_are_deterministic_and_cache_usage_simulated():
+    with MockLLMServer() as server:
+        status, first = _post(server.base_url, _chat("system prompt", TEXT))
+        _, second = _post(server.base_url, _chat("system prompt", TEXT))
+
+    assert status == 200
+    first_payload, second_payload = json.loads(first), json.loads(second)
+    content = json.loads(first_payload["choices"][0]["message"]["content"])
+    assert {"field": "EMAIL", "value": "jane.doe@example.com", "sources": ["Explicit"]} in content[
+        "detected_fields"
+    ]
+    assert first_payload["choices"] == second_payload["choices"]
+    assert first_payload["usage"]["prompt_tokens_details"]["cached_tokens"] == 0
+    assert second_payload["usage"]["prompt_tokens_details"]["cached_tokens"] > 0
+
+
+def test_spans_and_ocr_requests():
+    with MockLLMServer() as server:
+        _, spans = _post(
+            server.base_url,
+            _chat("Return numbered spans", "[0] Contact me at jane.doe@example.com today"),
+        )
+        _, ocr = _post(
+            server.base_url,
+            _chat(
+                "Extract text",
+                [{"type": "image_url", "image_url": {"url": "data:image/png;base64,AAAA"}}],
+            ),
+        )
+
+    span_content = json.loads(json.loads(spans)["choices"][0]["message"]["content"])
+    assert span_content["spans"] == [[0, 3, 4, "EMAIL", "Explicit"]]
+    assert json.loads(ocr)["choices"][0]["message"]["content"].startswith("Mock OCR text")
+
+
+def test_error_rate_and_streaming():
+    with MockLLMServer(MockSettings(error_rate=1.0, error_status=429)) as server:
+        status, _ = _post(server.base_url, _chat("s", TEXT))
+    assert status == 429
+
+    with MockLLMServer(MockSettings(stream_chunk_chars=8)) as server:
+        body = {**_chat("s", TEXT), "stream": True, "stream_options": {"include_usage": True}}
+        _, raw = _post(server.base_url, body)
+
+    events = [
+        line[len("data: ") :]
+        for line in raw.decode("utf-8").splitlines()
+        if line.startswith("data: ")
+    ]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(e) for e in events[:-1]]
+    text = "".join(
+        c["choices"][0]["delta"].get("content") or "" for c in chunks if c["choices"]
+    )
+    assert "jane.doe@example.com" in text
+    assert chunks[-1]["usage"]["total_tokens"] > 0
+
+
+@pytest.mark.asyncio
+async def test_litellm_detector_end_to_end_against_mock():
+    with MockLLMServer() as server:
+        detector = LiteLLMDetector(
+            provider="openai",
+            model="gpt-4o-mini",
+            client_params={"api_key": "mock", "api_base": server.base_url},
+        )
+        result = await detector.acall(TEXT)
+
+    values = {f["value"] for f in result["detected_fields"]}
+    assert "jane.doe@example.com" in values
+    assert result["_usage"]["input_tokens"] > 0
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from multiagent_firewall.config import GuardConfig, OCRCacheConfig
+from multiagent_firewall.detectors.ocr_cache import (
+    OCRResultCache,
+    get_ocr_cache,
+    ocr_cache_key,
+)
+from multiagent_firewall.nodes.document import llm_ocr_document, read_document
+from multiagent_firewall.types import GuardState
+
+
+def test_cache_key_depends_on_bytes_and_settings(tmp_path):
+    a = tmp_path / "a.png"
+    b = tmp_path / "b.png"
+    a.write_bytes(b"same bytes")
+    b.write_bytes(b"same bytes")
+
+    assert ocr_cache_key(str(a), "tesseract", {"lang": "eng"}) == ocr_cache_key(
+        str(b), "tesseract", {"lang": "eng"}
+    )
+    assert ocr_cache_key(str(a), "tesseract", {"lang": "eng"}) != ocr_cache_key(
+        str(a), "tesseract", {"lang": "spa"}
+    )
+    assert ocr_cache_key(str(a), "tesseract", {}) != ocr_cache_key(str(a), "llm", {})
+    assert ocr_cache_key(str(tmp_path / "missing.png"), "llm", {}) is None
+
+
+def test_lru_eviction_and_disk_tier(tmp_path):
+    cache = OCRResultCache(max_entries=2, cache_dir=str(tmp_path / "ocr"))
+    cache.set("k1", "one")
+    cache.set("k2", "two")
+    cache.set("k3", "three")
+
+    assert list(cache._entries) == ["k2", "k3"]
+    # Evicted from memory but still on disk; a fresh process sees it too
+    assert cache.get("k1") == "one"
+    assert OCRResultCache(cache_dir=str(tmp_path / "ocr")).get("k3") == "three"
+    assert cache.get("unknown") is None
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_disk_tier_evicts_least_recently_used_files(tmp_path):
+    cache = OCRResultCache(max_entries=1, cache_dir=str(tmp_path), max_bytes=250)
+    text = "x" * 100
+    cache.set("aa01", text)
+    cache.set("bb02", text)
+    # Make the insertion order unambiguous, then read the older file from disk
+    for age, key in ((20, "aa01"), (10, "bb02")):
+        path = tmp_path / key[:2] / f"{key}.txt"
+        mtime = path.stat().st_mtime - age
+        os.utime(path, (mtime, mtime))
+    assert cache.get("aa01") == text
+
+    cache.set("cc03", text)
+
+    assert sorted(path.stem for path in tmp_path.glob("*/*.txt")) == ["aa01", "cc03"]
+    # Texts larger than the whole tier stay in memory only
+    cache.set("dd04", "x" * 300)
+    assert not (tmp_path / "dd" / "dd04.txt").exists()
+
+
+def test_get_ocr_cache_respects_enabled():
+    assert get_ocr_cache(OCRCacheConfig(enabled=False)) is None
+    settings = OCRCacheConfig(max_entries=8)
+    assert get_ocr_cache(settings) is get_ocr_cache(settings)
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_read_document_reuses_tesseract_result(
+    mock_has_ocr_support, mock_get_detector, tmp_path, guard_config
+):
+    mock_detector = MagicMock(return_value="text from image")
+    mock_get_detector.return_value = mock_detector
+    first = tmp_path / "turn1.png"
+    second = tmp_path / "turn2.png"
+    first.write_bytes(b"screenshot")
+    second.write_bytes(b"screenshot")
+
+    results = []
+    for path in (first, second):
+        state: GuardState = {"file_paths": [str(path)], "metadata": {}}
+        results.append(await read_document(state, fw_config=guard_config))
+
+    assert mock_detector.call_count == 1
+    assert results[1]["raw_text"] == "text from image"
+    assert results[1]["metadata"]["ocr_cache_hits"] == 1
+    assert results[1]["metadata"]["ocr_method"] == "tesseract"
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.LLMOCRDetector")
+async def test_llm_ocr_reuses_result_without_provider_call(
+    mock_ocr_detector, tmp_path, guard_config
+):
+    mock_detector = MagicMock()
+    mock_detector.acall = AsyncMock(return_value="vision text")
+    mock_ocr_detector.return_value = mock_detector
+    image = tmp_path / "shot.png"
+    image.write_bytes(b"screenshot")
+
+    def _state() -> GuardState:
+        return {
+            "raw_text": "",
+            "metadata": {"images_needing_llm_ocr": [str(image)]},
+            "warnings": [],
+            "errors": [],
+        }
+
+    await llm_ocr_document(_state(), fw_config=guard_config)
+    result = await llm_ocr_document(_state(), fw_config=guard_config)
+
+    assert mock_detector.acall.await_count == 1
+    assert result["raw_text"] == "vision text"
+    assert result["metadata"]["ocr_cache_hits"] == 1
+    assert "llm_usage" not in result["metadata"]
+
+    # A different model must not reuse the cached text
+    other = dataclasses.replace(
+        guard_config, llm=dataclasses.replace(guard_config.llm, model="gpt-4o")
+    )
+    await llm_ocr_document(_state(), fw_config=other)
+    assert mock_detector.acall.await_count == 2
+
+
+def test_config_from_env_parses_ocr_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_MODEL", "gpt-4o")
+    monkeypatch.setenv("LLM_API_KEY", "key")
+    monkeypatch.setenv("OCR_CACHE_MAX_ENTRIES", "32")
+    monkeypatch.setenv("OCR_CACHE_DIR", str(tmp_path))
+
+    config = GuardConfig.from_env()
+
+    assert config.ocr_cache.enabled is True
+    assert config.ocr_cache.max_entries == 32
+    assert config.ocr_cache.cache_dir == str(tmp_path)
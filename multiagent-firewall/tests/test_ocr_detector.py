@@ -102,6 +102,32 @@ def test_tesseract_detector_extracts_text():
         os.unlink(tmp_path)
 
 
+def test_tesseract_cmd_applies_after_pickling(tmp_path):
+    """Workers get a pickled detector: the binary path is set when it runs"""
+    import pickle
+
+    mock_pytesseract = MagicMock()
+    mock_pytesseract.image_to_data.return_value = {"text": []}
+    image = tmp_path / "scan.png"
+    image.write_bytes(b"")
+    detector = pickle.loads(
+        pickle.dumps(
+            TesseractOCRDetector(
+                tesseract_cmd="/opt/tesseract/bin/tesseract", backend="pytesseract"
+            )
+        )
+    )
+
+    with patch.dict(
+        "sys.modules", {"pytesseract": mock_pytesseract, "PIL": MagicMock()}
+    ):
+        detector({"file_path": str(image)})
+
+    assert (
+        mock_pytesseract.pytesseract.tesseract_cmd == "/opt/tesseract/bin/tesseract"
+    )
+
+
 def test_tesseract_detector_filters_by_confidence():
     """Test that low-confidence results are filtered out"""
     import tempfile
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from multiagent_firewall.detectors.ocr import TesseractOCRDetector
+from multiagent_firewall.detectors.ocr_executor import run_ocr, shutdown_ocr_executors
+from multiagent_firewall.nodes.document import read_document
+from multiagent_firewall.types import GuardState
+
+
+class PidDetector(TesseractOCRDetector):
+    """Picklable detector reporting the process it ran in."""
+
+    def __call__(self, state):
+        return f"pid {os.getpid()}"
+
+
+@pytest.mark.asyncio
+async def test_run_ocr_uses_worker_processes_for_tesseract_detector(tmp_path):
+    image = tmp_path / "a.png"
+    image.write_bytes(b"image")
+    try:
+        text = await run_ocr(PidDetector(), str(image), workers=1)
+    finally:
+        shutdown_ocr_executors()
+
+    assert text.startswith("pid ")
+    assert text != f"pid {os.getpid()}"
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_read_document_ocrs_images_concurrently_in_order(
+    mock_has_ocr_support, mock_get_detector, tmp_path, guard_config
+):
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def fake_detector(state):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        name = os.path.basename(state["file_path"])
+        # The first image is the slowest so completion order differs from input order
+        time.sleep(0.15 if name == "0.png" else 0.05)
+        with lock:
+            in_flight -= 1
+        return "" if name == "2.png" else f"text {name}"
+
+    mock_get_detector.return_value = fake_detector
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"{i}.png"
+        path.write_bytes(f"image {i}".encode())
+        paths.append(str(path))
+    config = dataclasses.replace(
+        guard_config,
+        ocr=dataclasses.replace(guard_config.ocr, max_concurrency=2),
+    )
+    state: GuardState = {"file_paths": paths, "metadata": {}, "warnings": []}
+
+    result = await read_document(state, fw_config=config)
+
+    assert result["raw_text"] == "text 0.png text 1.png text 3.png"
+    assert peak == 2
+    assert result["metadata"]["ocr_method"] == "tesseract"
+    assert result["metadata"]["tesseract_text_found"] is True
+    assert result["metadata"]["images_needing_llm_ocr"] == [paths[2]]
+    assert result["warnings"] == [f"No text extracted from image: {paths[2]}"]
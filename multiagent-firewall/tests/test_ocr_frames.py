@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import dataclasses
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+from multiagent_firewall.config import OCRConfig  # noqa: E402
+from multiagent_firewall.detectors.ocr_frames import (  # noqa: E402
+    FrameSelection,
+    frame_count,
+    iter_frames,
+)
+from multiagent_firewall.nodes.document import (  # noqa: E402
+    llm_ocr_document,
+    read_document,
+)
+from multiagent_firewall.types import GuardState  # noqa: E402
+
+
+def _page(label: str, size=(600, 400), rows: int = 6, indent: int = 20) -> Image.Image:
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=22)
+    for row in range(rows):
+        draw.text((indent, 20 + row * 60), f"{label} line {row}", fill="black", font=font)
+    return image
+
+
+def _animation(path: Path, screens: int = 3, frames: int = 30) -> None:
+    # Screens differ in layout, as distinct screens of a screen recording do
+    images = []
+    for i in range(frames):
+        screen = i % screens
+        images.append(
+            _page(f"Screen {screen}", rows=2 + 2 * screen, indent=20 + 150 * screen)
+        )
+    images[0].save(path, save_all=True, append_images=images[1:], duration=50)
+
+
+def _selection(path: Path, **settings) -> FrameSelection:
+    selection = FrameSelection()
+    with Image.open(path) as image:
+        list(iter_frames(image, OCRConfig(**settings), selection))
+    return selection
+
+
+def test_animation_frames_are_sampled_and_deduplicated(tmp_path):
+    path = tmp_path / "loop.gif"
+    _animation(path)
+
+    assert frame_count(str(path)) == 30
+    uniform = _selection(path)
+    assert uniform.indices == [0, 2, 4] and not uniform.paged
+    assert uniform.duplicates == 13
+    assert _selection(path, frame_sampling="first").indices == [0]
+    assert _selection(path, frame_sampling="all").indices == [0, 1, 2]
+    limited = _selection(path, frame_sampling="all", max_frames=2)
+    assert limited.indices == [0, 1] and limited.truncated
+
+
+def test_tiff_pages_only_skip_identical_pages(tmp_path):
+    path = tmp_path / "scan.tiff"
+    # Pages differing by a single digit look alike to a perceptual hash
+    pages = [_page("Invoice 1001"), _page("Invoice 1002"), _page("Invoice 1001")]
+    pages[0].save(path, save_all=True, append_images=pages[1:])
+
+    selection = _selection(path)
+
+    assert selection.paged
+    assert selection.indices == [0, 1]
+    assert selection.duplicates == 1
+    assert _selection(path, max_pages=1).truncated
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_read_document_ocrs_every_distinct_page(
+    mock_has_ocr_support, mock_get_detector, tmp_path, guard_config
+):
+    path = tmp_path / "scan.tif"
+    pages = [_page(f"Page {i}") for i in range(3)]
+    pages[0].save(path, save_all=True, append_images=pages[1:])
+    detector = MagicMock(
+        side_effect=lambda state: f"text of {Path(state['file_path']).stem}"
+    )
+    mock_get_detector.return_value = detector
+    state: GuardState = {"file_paths": [str(path)], "metadata": {}}
+
+    result = await read_document(state, fw_config=guard_config)
+
+    assert detector.call_count == 3
+    assert result["raw_text"] == (
+        "text of frame-0000 text of frame-0001 text of frame-0002"
+    )
+    assert result["metadata"]["ocr_frames"][str(path)] == {
+        "frames": 3,
+        "ocr_frames": 3,
+        "duplicates": 0,
+        "truncated": False,
+    }
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_read_document_keeps_one_batch_of_pages_on_disk(
+    mock_has_ocr_support, mock_get_detector, tmp_path, guard_config
+):
+    path = tmp_path / "scan.tif"
+    pages = [_page(f"Page {i}", rows=1 + i) for i in range(5)]
+    pages[0].save(path, save_all=True, append_images=pages[1:])
+    on_disk = []
+
+    def detect(state):
+        frame = Path(state["file_path"])
+        on_disk.append(len(list(frame.parent.glob("frame-*.png"))))
+        return frame.stem
+
+    mock_get_detector.return_value = MagicMock(side_effect=detect)
+    config = dataclasses.replace(
+        guard_config,
+        ocr=dataclasses.replace(guard_config.ocr, max_frames=2, process_pool=False),
+    )
+    state: GuardState = {"file_paths": [str(path)], "metadata": {}}
+
+    result = await read_document(state, fw_config=config)
+
+    assert result["raw_text"] == " ".join(f"frame-{i:04d}" for i in range(5))
+    assert max(on_disk) == 2
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.LLMOCRDetector")
+async def test_llm_ocr_sends_distinct_frames(mock_ocr_class, tmp_path, guard_config):
+    path = tmp_path / "loop.gif"
+    _animation(path)
+    detector = MagicMock()
+    detector.acall_images = AsyncMock(return_value=["Screen 0", "", "Screen 2"])
+    mock_ocr_class.return_value = detector
+    config = dataclasses.replace(
+        guard_config, ocr=dataclasses.replace(guard_config.ocr, max_frames=8)
+    )
+    state: GuardState = {"metadata": {"images_needing_llm_ocr": [str(path)]}}
+
+    result = await llm_ocr_document(state, fw_config=config)
+
+    assert len(detector.acall_images.call_args.args[0]) == 3
+    detector.acall.assert_not_called()
+    assert result["raw_text"] == "Screen 0 Screen 2"
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.LLMOCRDetector")
+async def test_llm_ocr_batches_pages_and_warns_when_truncated(
+    mock_ocr_class, tmp_path, guard_config
+):
+    path = tmp_path / "scan.tif"
+    pages = [_page(f"Page {i}", rows=1 + i) for i in range(5)]
+    pages[0].save(path, save_all=True, append_images=pages[1:])
+    detector = MagicMock()
+
+    def acall_images(frames, *, original_bytes, usage):
+        usage["input_tokens"] = 10
+        return [f"p{len(frames)}"] * len(frames)
+
+    detector.acall_images = AsyncMock(side_effect=acall_images)
+    mock_ocr_class.return_value = detector
+    config = dataclasses.replace(
+        guard_config,
+        ocr=dataclasses.replace(guard_config.ocr, max_frames=2, max_pages=4),
+    )
+    state: GuardState = {"metadata": {"images_needing_llm_ocr": [str(path)]}}
+
+    result = await llm_ocr_document(state, fw_config=config)
+
+    # Four pages (max_pages) in calls of at most max_frames images
+    assert [len(c.args[0]) for c in detector.acall_images.call_args_list] == [2, 2]
+    assert result["raw_text"] == "p2 p2 p2 p2"
+    assert result["metadata"]["llm_usage"]["by_node"]["llm_ocr"]["calls"] == 2
+    assert any(
+        w == f"Only the first 4 distinct pages of {path} were OCRed"
+        for w in result["warnings"]
+    )
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import dataclasses
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from multiagent_firewall.detectors.ocr import LLMOCRDetector, TesseractOCRDetector
+from multiagent_firewall.detectors.ocr_layout import (
+    build_layout,
+    merge_region_text,
+    plan_regions,
+)
+from multiagent_firewall.nodes.document import llm_ocr_document, read_document
+from multiagent_firewall.routers import should_run_llm_ocr
+from multiagent_firewall.types import GuardState
+
+DATA = {
+    "text": ["Name:", "Jane", "~j@ne", "exam", "", "Total", "12", "Ref"],
+    "conf": [96, 94, 20, 35, "-1", 91, 88, 25],
+    "left": [0, 60, 0, 70, 0, 0, 60, 0],
+    "top": [0, 0, 40, 40, 0, 80, 80, 120],
+    "width": [50, 40, 60, 50, 0, 50, 20, 30],
+    "height": [20, 20, 20, 20, 0, 20, 20, 20],
+    "block_num": [1, 1, 1, 1, 1, 1, 1, 1],
+    "par_num": [1, 1, 1, 1, 1, 1, 1, 1],
+    "line_num": [1, 1, 2, 2, 2, 3, 3, 4],
+}
+
+
+def test_layout_groups_lines_and_plans_low_confidence_regions():
+    layout = build_layout(DATA, confidence_threshold=30)
+
+    assert [line.text for line in layout.lines] == [
+        "Name: Jane",
+        "exam",
+        "Total 12",
+        "",
+    ]
+    assert layout.text == "Name: Jane exam Total 12"
+    assert layout.lines[1].box == (0, 40, 120, 60)
+
+    regions = plan_regions(layout, min_confidence=60, max_regions=8, padding=4)
+    assert [(r.box, r.line_indices) for r in regions] == [
+        ((0, 36, 124, 64), (1,)),
+        ((0, 116, 34, 144), (3,)),
+    ]
+    # The LLM text replaces only the re-read lines
+    assert (
+        merge_region_text(layout, regions, ["jane@example.com", "Ref 7"])
+        == "Name: Jane jane@example.com Total 12 Ref 7"
+    )
+    # Regions without LLM text keep Tesseract's lines
+    assert (
+        merge_region_text(layout, regions, ["jane@example.com", " "])
+        == "Name: Jane jane@example.com Total 12"
+    )
+    assert merge_region_text(layout, regions, ["", ""]) == layout.text
+
+
+def test_plan_regions_falls_back_to_whole_image():
+    layout = build_layout(DATA)
+    assert plan_regions(layout, min_confidence=10, max_regions=8) == []
+    assert plan_regions(layout, min_confidence=60, max_regions=1) is None
+    assert plan_regions(layout, min_confidence=99, max_regions=8) is None
+    assert plan_regions(build_layout({"text": []}), min_confidence=60, max_regions=8) is None
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.analyze_ocr", new_callable=AsyncMock)
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_partial_tesseract_text_queues_only_regions(
+    mock_has_ocr_support, mock_get_detector, mock_analyze, tmp_path, guard_config
+):
+    image = tmp_path / "form.png"
+    image.write_bytes(b"image")
+    mock_get_detector.return_value = MagicMock(spec=TesseractOCRDetector)
+    mock_analyze.return_value = build_layout(DATA)
+    state: GuardState = {"file_paths": [str(image)], "metadata": {}}
+    config = dataclasses.replace(
+        guard_config,
+        ocr=dataclasses.replace(guard_config.ocr, region_fallback=True),
+    )
+
+    result = await read_document(state, fw_config=config)
+
+    assert result["raw_text"] == "Name: Jane ~j@ne exam Total 12 Ref"
+    metadata = result["metadata"]
+    assert "images_needing_llm_ocr" not in metadata
+    regions = metadata["llm_ocr_regions"][0]["regions"]
+    assert [region["line_indices"] for region in regions] == [[1], [3]]
+    assert should_run_llm_ocr(result) == "llm_ocr"
+
+    # Disabled by default: Tesseract's text is kept as is and the LLM is not involved
+    mock_get_detector.return_value = MagicMock(return_value="Name: Jane")
+    result = await read_document(
+        {"file_paths": [str(image)], "metadata": {}}, fw_config=guard_config
+    )
+    assert "llm_ocr_regions" not in result["metadata"]
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.analyze_ocr", new_callable=AsyncMock)
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_unreliable_tesseract_text_queues_whole_image(
+    mock_has_ocr_support, mock_get_detector, mock_analyze, tmp_path, guard_config
+):
+    image = tmp_path / "form.png"
+    image.write_bytes(b"image")
+    mock_get_detector.return_value = MagicMock(spec=TesseractOCRDetector)
+    mock_analyze.return_value = build_layout(DATA)
+    # Two low-confidence regions are more than region fallback allows
+    config = dataclasses.replace(
+        guard_config,
+        ocr=dataclasses.replace(
+            guard_config.ocr, region_fallback=True, max_regions=1
+        ),
+    )
+
+    for _ in range(2):
+        result = await read_document(
+            {"file_paths": [str(image)], "metadata": {}}, fw_config=config
+        )
+
+        assert result["metadata"]["images_needing_llm_ocr"] == [str(image)]
+        assert "llm_ocr_regions" not in result["metadata"]
+    # The unreliable text was not cached
+    assert mock_analyze.await_count == 2
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.LLMOCRDetector")
+async def test_llm_ocr_merges_region_text(mock_ocr_class, guard_config):
+    detector = MagicMock()
+    detector.acall_regions = AsyncMock(return_value=["jane@example.com"])
+    mock_ocr_class.return_value = detector
+    layout = build_layout(DATA, confidence_threshold=30)
+    # The image's text also appears earlier; only the image's span is rewritten
+    state: GuardState = {
+        "raw_text": "Name: Jane exam Total 12 Name: Jane exam Total 12",
+        "metadata": {
+            "llm_ocr_spans": {"/tmp/form.png": [25, 49]},
+            "llm_ocr_regions": [
+                {
+                    "path": "/tmp/form.png",
+                    "tesseract_text": layout.text,
+                    "lines": [
+                        {"text": line.text, "confidence": line.confidence, "box": line.box}
+                        for line in layout.lines
+                    ],
+                    "regions": [{"box": [0, 36, 124, 64], "line_indices": [1]}],
+                }
+            ]
+        },
+    }
+
+    result = await llm_ocr_document(state, fw_config=guard_config)
+
+    assert result["raw_text"] == (
+        "Name: Jane exam Total 12 Name: Jane jane@example.com Total 12"
+    )
+    detector.acall_regions.assert_awaited_once()
+    assert detector.acall_regions.call_args.args[1] == [[0, 36, 124, 64]]
+    assert result["metadata"]["llm_ocr_regions_sent"] == 1
+    assert "llm_ocr_regions" not in result["metadata"]
+    detector.acall.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_acall_regions_sends_crops_in_one_call(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    image = tmp_path / "form.png"
+    Image.new("RGB", (200, 120), "white").save(image)
+    detector = LLMOCRDetector(
+        provider="openai", model="gpt-4o-mini", client_params={"api_key": "test"}
+    )
+    detector._llm = MagicMock()
+    detector._llm.ainvoke = AsyncMock(
+        return_value=AIMessage(content="jane@example.com\n<<<CROP>>>\nTotal 12")
+    )
+    boxes = [[0, 36, 124, 64], [0, 76, 84, 104]]
+    usage: dict = {}
+
+    texts = await detector.acall_regions(str(image), boxes, usage=usage)
+
+    assert texts == ["jane@example.com", "Total 12"]
+    message = detector._llm.ainvoke.call_args.args[0]
+    assert len(message[1].content) == 2
+    assert 0 < usage["region_pixel_share"] < 0.5
+
+    # Unsplittable responses are attributed to the first region
+    detector._llm.ainvoke.return_value = AIMessage(content="everything")
+    assert await detector.acall_regions(str(image), boxes) == ["everything", ""]
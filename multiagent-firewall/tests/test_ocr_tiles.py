@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import dataclasses
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image  # noqa: E402
+
+from multiagent_firewall.detectors.ocr import TesseractOCRDetector  # noqa: E402
+from multiagent_firewall.detectors.ocr_layout import OCRLayout, OCRLine  # noqa: E402
+from multiagent_firewall.detectors.ocr_tiles import (  # noqa: E402
+    image_size,
+    merge_overlapping_texts,
+    merge_strip_layouts,
+    plan_strips,
+)
+from multiagent_firewall.nodes.document import (  # noqa: E402
+    llm_ocr_document,
+    read_document,
+)
+from multiagent_firewall.types import GuardState  # noqa: E402
+
+
+def _line(text, top, bottom):
+    return OCRLine(text=text, confidence=95.0, box=(0, top, 100, bottom))
+
+
+def test_plan_strips_overlaps_and_covers_the_image():
+    assert plan_strips(1000, 2048, 128) == [(0, 1000)]
+    assert plan_strips(5000, 2048, 128) == [(0, 2048), (1920, 3968), (3840, 5000)]
+    # Overlap is capped so strips always advance
+    assert plan_strips(300, 100, 500) == [(0, 100), (50, 150), (100, 200), (150, 250), (200, 300)]
+
+
+def test_merge_strip_layouts_keeps_each_line_once():
+    strips = [(0, 100), (80, 180)]  # overlap 80-100, owned up to 90
+    first = OCRLayout([_line("A", 0, 20), _line("B", 78, 96), _line("C-partial", 95, 100)])
+    second = OCRLayout([_line("B", 0, 16), _line("C", 15, 33), _line("D", 30, 50)])
+
+    merged = merge_strip_layouts([first, second], strips)
+
+    assert merged.text == "A B C D"
+    assert merged.lines[-1].box == (0, 110, 100, 130)
+
+
+def test_merge_overlapping_texts_drops_repeated_words():
+    assert (
+        merge_overlapping_texts(["card 4111 1111", "4111 1111 1111 1111 exp", "exp 12/27"])
+        == "card 4111 1111 1111 1111 exp 12/27"
+    )
+    assert merge_overlapping_texts(["a b", "", "c"]) == "a b c"
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.detectors.ocr_executor.analyze_ocr", new_callable=AsyncMock)
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_tall_images_are_ocred_in_strips(
+    mock_has_ocr_support, mock_get_detector, mock_analyze, tmp_path, guard_config
+):
+    path = tmp_path / "scroll.png"
+    Image.new("L", (300, 5000), 255).save(path)
+    mock_get_detector.return_value = MagicMock(spec=TesseractOCRDetector)
+    strip_heights = []
+
+    async def analyze(detector, strip_path, **kwargs):
+        strip_heights.append(image_size(strip_path)[1])
+        return OCRLayout([_line(f"strip{len(strip_heights)}", 1000, 1020)])
+
+    mock_analyze.side_effect = analyze
+    # The blank test image would otherwise be skipped as text-free
+    config = dataclasses.replace(
+        guard_config,
+        ocr=dataclasses.replace(guard_config.ocr, text_prefilter=False),
+    )
+    state: GuardState = {"file_paths": [str(path)], "metadata": {}}
+
+    result = await read_document(state, fw_config=config)
+
+    assert strip_heights == [2048, 2048, 1160]
+    assert result["raw_text"] == "strip1 strip2 strip3"
+    assert result["metadata"]["ocr_tiled_images"] == {str(path): 3}
+    assert "images_needing_llm_ocr" not in result["metadata"]
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.LLMOCRDetector")
+async def test_llm_ocr_sends_tall_images_as_strips(
+    mock_ocr_class, tmp_path, guard_config
+):
+    path = tmp_path / "scroll.png"
+    Image.new("L", (300, 3000), 255).save(path)
+    detector = MagicMock()
+    detector.acall_regions = AsyncMock(
+        return_value=["Name Jane Doe email", "email jane@example.com"]
+    )
+    mock_ocr_class.return_value = detector
+    state: GuardState = {"metadata": {"images_needing_llm_ocr": [str(path)]}}
+
+    result = await llm_ocr_document(state, fw_config=guard_config)
+
+    assert detector.acall_regions.call_args.args[1] == [
+        (0, 0, 300, 2048),
+        (0, 1920, 300, 3000),
+    ]
+    detector.acall.assert_not_called()
+    assert result["raw_text"] == "Name Jane Doe email jane@example.com"
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from multiagent_firewall.detectors.ocr_executor import (  # noqa: E402
+    shutdown_ocr_executors,
+)
+from multiagent_firewall.detectors.pdf_text import (  # noqa: E402
+    extract_page_range,
+    iter_pdf_pages,
+    plan_page_ranges,
+    read_pdf_pages,
+    resolve_pdf_backend,
+)
+from multiagent_firewall.nodes.document import (  # noqa: E402
+    _join_pdf_page_spans,
+    llm_ocr_document,
+    read_document,
+)
+from multiagent_firewall.types import GuardState  # noqa: E402
+
+
+def _make_pdf(pages):
+    """Build a minimal PDF with one line of Helvetica text per page."""
+    objects = []
+    n = len(pages)
+    # 1 catalog, 2 pages, 3 font, then page/content pairs
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, text in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1)
+    out += b"startxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out)
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(_make_pdf([f"Page {i} jane{i}@example.com" for i in range(7)]))
+    return path
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pypdfium2"])
+def test_backends_extract_every_page(pdf_path, backend):
+    if backend == "pypdfium2":
+        pytest.importorskip("pypdfium2")
+    pages = read_pdf_pages(str(pdf_path), backend)
+    assert pages == [f"Page {i} jane{i}@example.com" for i in range(7)]
+
+
+def test_page_spans_point_into_the_joined_text():
+    pages = ["", " Cover", "", "Body", "End "]
+    text, spans = _join_pdf_page_spans(pages)
+
+    assert text == "Cover\nBody\nEnd"
+    assert [text[start:end] for start, end in spans] == [
+        "",
+        "Cover",
+        "",
+        "Body",
+        "End",
+    ]
+    assert spans[2] == (5, 5)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_pdf_backend("pdfminer")
+
+
+@pytest.mark.asyncio
+async def test_pages_stream_in_order_across_ranges(pdf_path):
+    pages = [
+        page.text
+        async for page in iter_pdf_pages(
+            str(pdf_path), pages_per_task=3, use_processes=False
+        )
+    ]
+    assert pages == [f"Page {i} jane{i}@example.com" for i in range(7)]
+
+
+def test_page_ranges_are_one_per_worker():
+    assert plan_page_ranges(800, 8, 4) == [(0, 200), (200, 400), (400, 600), (600, 800)]
+    assert plan_page_ranges(10, 8, 4) == [(0, 8), (8, 10)]
+    assert plan_page_ranges(800, 8, 1) == [(0, 800)]
+    assert plan_page_ranges(0, 8, 4) == []
+
+
+@pytest.mark.asyncio
+async def test_long_pdf_is_opened_once_per_range(tmp_path, monkeypatch):
+    import pdfplumber
+
+    path = tmp_path / "long.pdf"
+    path.write_bytes(_make_pdf([f"Page {i}" for i in range(300)]))
+    opened = []
+    original_open = pdfplumber.open
+
+    def counting_open(*args, **kwargs):
+        opened.append(kwargs.get("pages"))
+        return original_open(*args, **kwargs)
+
+    monkeypatch.setattr(pdfplumber, "open", counting_open)
+
+    pages = [
+        page.text
+        async for page in iter_pdf_pages(
+            str(path), pages_per_task=8, use_processes=False
+        )
+    ]
+
+    assert pages == [f"Page {i}" for i in range(300)]
+    # Page count, then a single range: reopening the file per 8 pages made
+    # extraction quadratic in the page count
+    assert len(opened) == 2
+
+
+class _ConcurrencyProbe:
+    """Counts PDFium documents open at once across threads."""
+
+    def __init__(self, pdfium):
+        self.active = 0
+        self.peak = 0
+        probe = self
+
+        class Document(pdfium.PdfDocument):
+            def __init__(self, *args, **kwargs):
+                probe.active += 1
+                probe.peak = max(probe.peak, probe.active)
+                time.sleep(0.01)
+                super().__init__(*args, **kwargs)
+
+            def close(self):
+                probe.active -= 1
+                super().close()
+
+        self.document = Document
+
+
+@pytest.mark.asyncio
+async def test_pdfium_ranges_in_threads_never_overlap(pdf_path, monkeypatch):
+    pdfium = pytest.importorskip("pypdfium2")
+    probe = _ConcurrencyProbe(pdfium)
+    monkeypatch.setattr(pdfium, "PdfDocument", probe.document)
+
+    pages = [
+        page.text
+        async for page in iter_pdf_pages(
+            str(pdf_path), backend="pypdfium2", pages_per_task=1, use_processes=False
+        )
+    ]
+
+    assert pages == [f"Page {i} jane{i}@example.com" for i in range(7)]
+    assert probe.peak == 1
+
+
+@pytest.mark.asyncio
+async def test_read_document_extracts_large_pdfs_in_worker_processes(
+    pdf_path, guard_config
+):
+    config = dataclasses.replace(
+        guard_config,
+        document=dataclasses.replace(
+            guard_config.document, process_min_bytes=0, pdf_pages_per_task=2
+        ),
+        ocr=dataclasses.replace(guard_config.ocr, workers=2),
+    )
+    state: GuardState = {"file_paths": [str(pdf_path)], "metadata": {}}
+    try:
+        result = await read_document(state, fw_config=config)
+    finally:
+        shutdown_ocr_executors()
+
+    assert result["raw_text"] == "\n".join(
+        f"Page {i} jane{i}@example.com" for i in range(7)
+    )
+    assert result.get("errors", []) == []
+
+
+@pytest.fixture
+def scanned_pdf_path(tmp_path):
+    """Text page, scanned (image-only) page, blank page, text page."""
+    pdfium = pytest.importorskip("pypdfium2")
+    from PIL import Image, ImageDraw, ImageFont
+
+    text_path = tmp_path / "text.pdf"
+    text_path.write_bytes(_make_pdf(["Cover page text", "", "Last page text"]))
+    pdf = pdfium.PdfDocument(str(text_path))
+    scan = Image.new("RGB", (1224, 1584), "white")
+    ImageDraw.Draw(scan).text(
+        (100, 200),
+        "SCANNED jane@example.com",
+        fill="black",
+        font=ImageFont.load_default(size=40),
+    )
+    page = pdf.new_page(612, 792, index=1)
+    image = pdfium.PdfImage.new(pdf)
+    image.set_bitmap(pdfium.PdfBitmap.from_pil(scan))
+    image.set_matrix(pdfium.PdfMatrix().scale(612, 792))
+    page.insert_obj(image)
+    page.gen_content()
+    path = tmp_path / "scan.pdf"
+    pdf.save(str(path))
+    pdf.close()
+    return path
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pypdfium2"])
+def test_image_only_pages_are_detected_as_scanned(scanned_pdf_path, backend):
+    pages = extract_page_range(str(scanned_pdf_path), 0, 10, backend)
+
+    assert [page.is_scanned(0.5) for page in pages] == [False, True, False, False]
+    assert pages[1].image_coverage == pytest.approx(1.0)
+
+
+def _whole_page_ocr(guard_config):
+    # Prefiltering and tiling of the rendered page are covered elsewhere
+    return dataclasses.replace(
+        guard_config,
+        ocr=dataclasses.replace(
+            guard_config.ocr, text_prefilter=False, tiling=False
+        ),
+    )
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_read_document_ocrs_only_scanned_pages(
+    mock_has_ocr_support, mock_get_detector, scanned_pdf_path, guard_config
+):
+    detector = MagicMock(return_value="SCANNED jane@example.com")
+    mock_get_detector.return_value = detector
+    state: GuardState = {"file_paths": [str(scanned_pdf_path)], "metadata": {}}
+
+    result = await read_document(state, fw_config=_whole_page_ocr(guard_config))
+
+    assert detector.call_count == 1
+    rendered = detector.call_args.args[0]["file_path"]
+    assert os.path.basename(rendered) == "scan-page-2.png"
+    assert not os.path.exists(rendered)
+    assert result["raw_text"] == (
+        "Cover page text\nSCANNED jane@example.com\nLast page text"
+    )
+    assert result["metadata"]["pdf_ocr_pages"] == {str(scanned_pdf_path): [2]}
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.LLMOCRDetector")
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_scanned_pages_fall_back_to_llm_ocr(
+    mock_has_ocr_support,
+    mock_get_detector,
+    mock_ocr_class,
+    scanned_pdf_path,
+    guard_config,
+):
+    mock_get_detector.return_value = MagicMock(return_value="")
+    llm_detector = MagicMock()
+    llm_detector.acall = AsyncMock(return_value="SCANNED jane@example.com")
+    mock_ocr_class.return_value = llm_detector
+    config = _whole_page_ocr(guard_config)
+    state: GuardState = {"file_paths": [str(scanned_pdf_path)], "metadata": {}}
+
+    result = await read_document(state, fw_config=config)
+    [rendered] = result["metadata"]["images_needing_llm_ocr"]
+    assert os.path.exists(rendered)
+
+    result = await llm_ocr_document(result, fw_config=config)
+
+    # The page's text lands where the page is, not after the document
+    assert result["raw_text"] == (
+        "Cover page text SCANNED jane@example.com\nLast page text"
+    )
+    assert not os.path.exists(rendered)
+    assert "pdf_render_dirs" not in result["metadata"]
+    assert "llm_ocr_spans" not in result["metadata"]
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.LLMOCRDetector")
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_llm_ocr_of_scanned_pages_keeps_file_order(
+    mock_has_ocr_support,
+    mock_get_detector,
+    mock_ocr_class,
+    scanned_pdf_path,
+    guard_config,
+    tmp_path,
+):
+    mock_get_detector.return_value = MagicMock(return_value="")
+    llm_detector = MagicMock()
+    llm_detector.acall = AsyncMock(return_value="SCANNED")
+    mock_ocr_class.return_value = llm_detector
+    notes = tmp_path / "notes.txt"
+    notes.write_text("notes after the pdf", encoding="utf-8")
+    config = _whole_page_ocr(guard_config)
+    state: GuardState = {
+        "raw_text": "prompt",
+        "file_paths": [str(scanned_pdf_path), str(notes)],
+        "metadata": {},
+    }
+
+    result = await read_document(state, fw_config=config)
+    result = await llm_ocr_document(result, fw_config=config)
+
+    assert result["raw_text"] == (
+        "prompt Cover page text SCANNED\nLast page text notes after the pdf"
+    )
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document._process_image_file")
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_rendered_pages_are_deleted_when_processing_fails(
+    mock_has_ocr_support,
+    mock_get_detector,
+    mock_process_image,
+    scanned_pdf_path,
+    guard_config,
+):
+    detector = MagicMock(return_value="")
+    mock_get_detector.return_value = detector
+    mock_process_image.side_effect = RuntimeError("boom")
+    state: GuardState = {"file_paths": [str(scanned_pdf_path)], "metadata": {}}
+
+    result = await read_document(state, fw_config=_whole_page_ocr(guard_config))
+
+    rendered = detector.call_args.args[0]["file_path"]
+    assert not os.path.exists(os.path.dirname(rendered))
+    assert any("boom" in error for error in result["errors"])
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import threading
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from multiagent_firewall.config import LLMResilienceConfig
+from multiagent_firewall.detectors.resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    ProviderGuard,
+    get_provider_guard,
+    provider_key,
+)
+from multiagent_firewall.nodes.detection import run_llm_detector
+from multiagent_firewall.nodes.document import llm_ocr_document
+from multiagent_firewall.types import GuardState
+from multiagent_firewall.utils import ProviderUnavailableError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_circuit_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow_request() is False
+
+
+def test_circuit_breaker_half_open_allows_single_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow_request() is False
+
+    clock.now = 5.0
+    assert breaker.state == "half_open"
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow_request() is True
+
+
+def test_circuit_breaker_half_open_failure_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now = 6.0
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now = 8.0
+    assert breaker.allow_request() is False
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_limiter_rejects_over_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1, max_limit=4)
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    limiter.release(success=True)
+    assert limiter.try_acquire()
+
+
+def test_limiter_aimd_adjustments():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, min_limit=1, max_limit=10)
+    limiter.try_acquire()
+    limiter.release(success=False)
+    assert limiter.limit == 4
+
+    for _ in range(20):
+        limiter.try_acquire()
+        limiter.release(success=True)
+    assert 4 < limiter.limit <= 10
+
+    for _ in range(10):
+        limiter.try_acquire()
+        limiter.release(success=False)
+    assert limiter.limit == 1
+
+
+def test_guard_slot_records_outcomes():
+    guard = ProviderGuard(
+        "test",
+        breaker=CircuitBreaker(failure_threshold=1, recovery_timeout=60),
+        limiter=AdaptiveConcurrencyLimiter(initial_limit=4),
+    )
+    with pytest.raises(ValueError):
+        with guard.slot():
+            raise ValueError("boom")
+
+    assert guard.breaker.state == "open"
+    assert guard.limiter.in_flight == 0
+    with pytest.raises(ProviderUnavailableError):
+        with guard.slot():
+            pass
+
+
+def test_provider_guard_registry_is_shared_per_endpoint():
+    config = LLMResilienceConfig(failure_threshold=2)
+    first = get_provider_guard("OpenAI", {}, config)
+    second = get_provider_guard("openai", {"api_key": "x"})
+    other = get_provider_guard("openai", {"api_base": "http://localhost:8000/"})
+
+    assert first is second
+    assert first is not other
+    assert first.breaker.failure_threshold == 2
+    assert provider_key("openai", {"api_base": "http://x/"}) == "openai@http://x"
+
+
+def test_provider_guards_are_separate_per_model():
+    # A cascade's fast tier must not open the circuit of the primary model
+    fast = get_provider_guard("openai", {}, model="gpt-4o-mini")
+    primary = get_provider_guard("openai", {}, model="gpt-4o")
+
+    assert fast is not primary
+    assert fast is get_provider_guard("openai", {"api_key": "x"}, model="gpt-4o-mini")
+    assert provider_key("openai", {}, "gpt-4o") == "openai/gpt-4o"
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.detection.LiteLLMDetector")
+async def test_run_llm_detector_degrades_when_provider_unavailable(
+    mock_llm_detector, guard_config
+):
+    mock_detector = MagicMock()
+    mock_detector.acall = AsyncMock(
+        side_effect=ProviderUnavailableError("LLM provider 'openai' circuit is open")
+    )
+    mock_llm_detector.return_value = mock_detector
+
+    state: GuardState = {
+        "normalized_text": "Some text",
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    result = await run_llm_detector(state, fw_config=guard_config)
+
+    assert result["llm_fields"] == []
+    assert result["errors"] == []
+    assert any("DLP/NER-only" in w for w in result["warnings"])
+    assert result["metadata"]["llm_degraded"] is True
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document.LLMOCRDetector")
+async def test_llm_ocr_document_stops_when_provider_unavailable(
+    mock_ocr_detector, guard_config
+):
+    guard_config = dataclasses.replace(guard_config, llm_ocr_concurrency=1)
+    mock_detector = MagicMock()
+    mock_detector.acall = AsyncMock(
+        side_effect=ProviderUnavailableError("circuit is open")
+    )
+    mock_ocr_detector.return_value = mock_detector
+
+    state: GuardState = {
+        "raw_text": "",
+        "metadata": {"images_needing_llm_ocr": ["/fake/a.png", "/fake/b.png"]},
+        "warnings": [],
+        "errors": [],
+    }
+
+    result = await llm_ocr_document(state, fw_config=guard_config)
+
+    assert mock_detector.acall.await_count == 1
+    assert result["errors"] == []
+    assert result["metadata"]["llm_degraded"] is True
+    assert "images_needing_llm_ocr" not in result["metadata"]
+
+
+@pytest.mark.asyncio
+async def test_litellm_detector_sheds_calls_when_circuit_open():
+    from multiagent_firewall.detectors.llm import LiteLLMDetector
+
+    llm = MagicMock()
+    llm.bind.return_value = llm
+    llm.ainvoke = AsyncMock(side_effect=RuntimeError("timeout"))
+    detector = LiteLLMDetector(
+        provider="flaky",
+        model="m",
+        client_params={},
+        llm=llm,
+        resilience=LLMResilienceConfig(failure_threshold=2, recovery_timeout=60),
+    )
+
+    # Only the plain retry of each request counts -> opens after two requests
+    for _ in range(2):
+        result = await detector.acall("text")
+        assert result["detected_fields"] == []
+    assert llm.ainvoke.await_count == 4
+
+    with pytest.raises(ProviderUnavailableError):
+        await detector.acall("text")
+    assert llm.ainvoke.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_json_mode_rejection_is_not_a_provider_failure():
+    from multiagent_firewall.detectors.llm import LiteLLMDetector
+
+    json_llm = MagicMock()
+    json_llm.ainvoke = AsyncMock(side_effect=ValueError("response_format"))
+    llm = MagicMock()
+    llm.bind.return_value = json_llm
+    llm.ainvoke = AsyncMock(return_value=MagicMock(content='{"detected_fields": []}'))
+    detector = LiteLLMDetector(
+        provider="no-json-mode",
+        model="m",
+        client_params={},
+        llm=llm,
+        resilience=LLMResilienceConfig(failure_threshold=1, initial_concurrency=8),
+    )
+
+    result = await detector.acall("text")
+
+    assert result["detected_fields"] == []
+    guard = get_provider_guard("no-json-mode", {})
+    assert guard.breaker.state == "closed"
+    assert guard.limiter.limit == 8
+
+
+@pytest.mark.asyncio
+async def test_guard_queues_calls_over_the_limit():
+    guard = ProviderGuard(
+        "test",
+        breaker=CircuitBreaker(),
+        limiter=AdaptiveConcurrencyLimiter(initial_limit=1),
+        queue_timeout=5,
+    )
+    first_in = asyncio.Event()
+    release_first = asyncio.Event()
+    order = []
+
+    async def call(name, gate=None):
+        async with guard.async_slot():
+            order.append(name)
+            if gate is not None:
+                first_in.set()
+                await gate.wait()
+
+    first = asyncio.create_task(call("first", release_first))
+    await first_in.wait()
+    second = asyncio.create_task(call("second"))
+    await asyncio.sleep(0.01)
+    assert order == ["first"]
+
+    release_first.set()
+    await asyncio.wait_for(asyncio.gather(first, second), timeout=5)
+    assert order == ["first", "second"]
+    assert guard.limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_guard_sheds_after_queue_timeout():
+    guard = ProviderGuard(
+        "test",
+        breaker=CircuitBreaker(),
+        limiter=AdaptiveConcurrencyLimiter(initial_limit=1),
+        queue_timeout=0.05,
+    )
+    assert guard.limiter.try_acquire()
+
+    with pytest.raises(ProviderUnavailableError, match="concurrency limit"):
+        async with guard.async_slot():
+            pass
+    with pytest.raises(ProviderUnavailableError):
+        with guard.slot():
+            pass
+
+
+def test_limiter_wakes_blocked_threads():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    assert limiter.try_acquire()
+    timer = threading.Timer(0.05, limiter.release, kwargs={"success": True})
+    timer.start()
+
+    assert limiter.acquire(timeout=5)
+    timer.join()
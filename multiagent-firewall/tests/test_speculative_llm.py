@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from multiagent_firewall.config import GuardConfig
+from multiagent_firewall.nodes.detection import run_dlp_detector, run_llm_detector
+from multiagent_firewall.nodes.speculative import (
+    pending_speculative_calls,
+    start_speculative_llm,
+)
+from multiagent_firewall.orchestrator import GuardOrchestrator
+from multiagent_firewall.types import GuardState
+
+
+@pytest.fixture
+def speculative_config(guard_config) -> GuardConfig:
+    return dataclasses.replace(guard_config, speculative_llm=True)
+
+
+@pytest.mark.asyncio
+async def test_start_speculative_llm_is_noop_when_disabled(guard_config):
+    state: GuardState = {"normalized_text": "hi", "speculative_llm_id": "run"}
+
+    assert await start_speculative_llm(state, fw_config=guard_config) == {}
+    assert pending_speculative_calls() == 0
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_reuses_speculative_call(speculative_config):
+    mock_detector = MagicMock()
+    mock_detector.acall = AsyncMock(
+        return_value={
+            "detected_fields": [
+                {"field": "EMAIL", "value": "test@example.com"},
+                {"field": "FIRST_NAME", "value": "Alice"},
+            ],
+            "_usage": {"input_tokens": 12, "output_tokens": 4},
+        }
+    )
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector",
+        return_value=mock_detector,
+    ):
+        orchestrator = GuardOrchestrator(speculative_config)
+        result = await orchestrator.run(
+            text="Alice wrote from test@example.com", min_block_level="high"
+        )
+
+    mock_detector.acall.assert_awaited_once()
+    sent_text = mock_detector.acall.await_args.args[0]
+    assert "test@example.com" not in sent_text
+    assert "<<REDACTED:EMAIL_1>>" in sent_text
+    assert result["metadata"]["llm_usage"]["by_node"]["llm_detector"]["calls"] == 1
+    assert result["metadata"]["llm_speculative"]["used"] is True
+    # Values redacted by DLP are not reintroduced from the speculative output
+    assert [f["value"] for f in result["llm_fields"]] == ["Alice"]
+    assert pending_speculative_calls() == 0
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_cancels_speculative_call_on_block(speculative_config):
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow_call(text):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return {"detected_fields": []}
+
+    async def fake_policy(state):
+        return {"decision": "block"}
+
+    mock_detector = MagicMock()
+    mock_detector.acall = slow_call
+
+    with (
+        patch(
+            "multiagent_firewall.nodes.detection.LiteLLMDetector",
+            return_value=mock_detector,
+        ),
+        patch.dict(
+            "multiagent_firewall.config.registry.NODE_REGISTRY",
+            {"apply_policy": fake_policy},
+        ),
+    ):
+        orchestrator = GuardOrchestrator(speculative_config)
+        result = await asyncio.wait_for(
+            orchestrator.run(text="Mail test@example.com", min_block_level="high"),
+            timeout=5,
+        )
+        await asyncio.sleep(0)
+
+    assert result["decision"] == "block"
+    assert started.is_set()
+    assert cancelled.is_set()
+    assert pending_speculative_calls() == 0
+
+
+@pytest.mark.asyncio
+async def test_run_llm_detector_falls_back_when_speculative_call_fails(
+    speculative_config,
+):
+    failing = MagicMock()
+    failing.acall = AsyncMock(side_effect=RuntimeError("boom"))
+    regular = MagicMock()
+    regular.acall = AsyncMock(
+        return_value={"detected_fields": [{"field": "PASSWORD", "value": "s3cret"}]}
+    )
+    state: GuardState = {
+        "normalized_text": "pw s3cret",
+        "speculative_llm_id": "run-1",
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector",
+        side_effect=[failing, regular],
+    ):
+        await start_speculative_llm(state, fw_config=speculative_config)
+        result = await run_llm_detector(state, fw_config=speculative_config)
+
+    regular.acall.assert_awaited_once_with("pw s3cret")
+    assert [f["value"] for f in result["llm_fields"]] == ["s3cret"]
+    speculative = result["metadata"]["llm_speculative"]
+    assert speculative["used"] is False
+    assert speculative["error"] == "boom"
+
+
+@pytest.mark.asyncio
+async def test_speculative_call_redacts_all_local_findings(speculative_config):
+    mock_detector = MagicMock()
+    mock_detector.acall = AsyncMock(return_value={"detected_fields": []})
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector",
+        return_value=mock_detector,
+    ):
+        orchestrator = GuardOrchestrator(speculative_config)
+        await orchestrator.run(
+            text="Call +1 415-555-0132 about the invoice", min_block_level="high"
+        )
+
+    # Phone numbers need the phonenumbers library rule, not a plain regex
+    sent_text = mock_detector.acall.await_args.args[0]
+    assert "415-555-0132" not in sent_text
+    assert "<<REDACTED:PHONE_NUMBER_1>>" in sent_text
+
+
+@pytest.mark.asyncio
+async def test_speculative_call_is_not_sent_when_local_findings_block(
+    speculative_config,
+):
+    mock_detector = MagicMock()
+    mock_detector.acall = AsyncMock(return_value={"detected_fields": []})
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector",
+        return_value=mock_detector,
+    ):
+        orchestrator = GuardOrchestrator(speculative_config)
+        result = await orchestrator.run(text="ssn 123-45-6789", min_block_level="low")
+
+    assert result["decision"] == "block"
+    mock_detector.acall.assert_not_called()
+    assert pending_speculative_calls() == 0
+
+
+@pytest.mark.asyncio
+async def test_local_detectors_run_once_per_speculative_run(speculative_config):
+    state: GuardState = {
+        "normalized_text": "mail test@example.com",
+        "speculative_llm_id": "run-2",
+        "metadata": {},
+    }
+    mock_detector = MagicMock()
+    mock_detector.acall = AsyncMock(return_value={"detected_fields": []})
+
+    with (
+        patch(
+            "multiagent_firewall.nodes.detection.detect_regex_patterns",
+            return_value=[],
+        ) as mock_regex,
+        patch(
+            "multiagent_firewall.nodes.detection.LiteLLMDetector",
+            return_value=mock_detector,
+        ),
+    ):
+        await asyncio.gather(
+            run_dlp_detector(state),
+            start_speculative_llm(state, fw_config=speculative_config),
+        )
+        await run_llm_detector(state, fw_config=speculative_config)
+
+    assert mock_regex.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_speculative_call_overlaps_ner_and_reconciles_its_findings(
+    speculative_config,
+):
+    sent = asyncio.Event()
+
+    async def call(text):
+        sent.set()
+        return {
+            "detected_fields": [
+                {"field": "FIRST_NAME", "value": "Alice"},
+                {"field": "PASSWORD", "value": "s3cret"},
+            ]
+        }
+
+    mock_detector = MagicMock()
+    mock_detector.acall = AsyncMock(side_effect=call)
+    state: GuardState = {
+        "normalized_text": "Alice wrote from test@example.com, pw s3cret",
+        "speculative_llm_id": "run-3",
+        "min_block_level": "high",
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector",
+        return_value=mock_detector,
+    ):
+        # Only DLP is awaited: the call is in flight before NER has run
+        await start_speculative_llm(state, fw_config=speculative_config)
+        await asyncio.wait_for(sent.wait(), timeout=5)
+        sent_text = mock_detector.acall.await_args.args[0]
+        assert "test@example.com" not in sent_text
+
+        # NER later finds the name, which anonymize_dlp_ner adds to the mapping
+        state["metadata"]["llm_anonymized_values"] = {
+            "mapping": {
+                "test@example.com": "<<REDACTED:EMAIL_1>>",
+                "Alice": "<<REDACTED:FIRST_NAME_1>>",
+            }
+        }
+        result = await run_llm_detector(state, fw_config=speculative_config)
+
+    mock_detector.acall.assert_awaited_once()
+    assert [f["value"] for f in result["llm_fields"]] == ["s3cret"]
+    speculative = result["metadata"]["llm_speculative"]
+    assert speculative["used"] is True
+    assert speculative["unmasked_values"] == 1
+
+
+def test_config_from_env_enables_speculative_llm(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_MODEL", "gpt-4o")
+    monkeypatch.setenv("LLM_API_KEY", "key")
+    monkeypatch.setenv("LLM_SPECULATIVE", "true")
+
+    assert GuardConfig.from_env().speculative_llm is True
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import csv
+import dataclasses
+import json
+
+import pytest
+from unittest.mock import patch
+
+from multiagent_firewall.detectors.structured import (
+    AMBIGUOUS,
+    CLEAN,
+    SENSITIVE,
+    profile_structured_file,
+)
+from multiagent_firewall.config.env import NERConfig
+from multiagent_firewall.nodes.detection import run_dlp_detector, run_ner_detector
+from multiagent_firewall.nodes.document import read_document
+from multiagent_firewall.types import GuardState
+
+
+@pytest.fixture
+def users_csv(tmp_path):
+    path = tmp_path / "users.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "email", "ssn", "notes"])
+        for i in range(300):
+            note = "contact backup@example.net" if i % 5 == 0 else "ok"
+            # Too rare to be sampled: found by the full scan of the column
+            if i == 251:
+                note = "escalated by ops.lead@example.org"
+            writer.writerow(
+                [i, f"user{i}@example.com", f"123-45-{6000 + i:04d}", note]
+            )
+    return path
+
+
+def test_csv_columns_are_classified_from_a_sample(users_csv):
+    profile = profile_structured_file(str(users_csv), sample_rows=50)
+
+    assert profile is not None
+    assert profile.rows == 300 and profile.sampled_rows == 50
+    classes = {column.name: column.kind for column in profile.columns}
+    assert classes == {
+        "id": CLEAN,
+        "email": SENSITIVE,
+        # The column name is the keyword context SSN values need
+        "ssn": SENSITIVE,
+        "notes": AMBIGUOUS,
+    }
+
+    by_column = {}
+    for item in profile.fields:
+        by_column.setdefault(item["column"], []).append(item)
+    [email] = by_column["email"]
+    assert email["field"] == "EMAIL" and email["cells"] == 300
+    assert by_column["ssn"][0]["field"] == "SSN"
+    # Ambiguous columns are scanned in full
+    assert {item["value"] for item in by_column["notes"]} == {
+        "backup@example.net",
+        "ops.lead@example.org",
+    }
+
+
+def test_summary_masks_sensitive_columns(users_csv):
+    profile = profile_structured_file(str(users_csv), sample_rows=50)
+
+    assert "user0@example.com" not in profile.summary
+    assert "1,<EMAIL>,<SSN>,ok" in profile.summary
+    assert "- email: EMAIL in 100% of sampled values" in profile.summary
+
+
+def test_columns_are_sampled_across_the_whole_file(tmp_path):
+    path = tmp_path / "late.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "ssn", "card"])
+        for i in range(3000):
+            # Sensitive values only start after the first 1000 rows
+            if i < 1000:
+                writer.writerow([i, "", "n/a"])
+            else:
+                writer.writerow([i, f"123-45-{i:04d}", "4111 1111 1111 1111"])
+
+    profile = profile_structured_file(str(path), sample_rows=50)
+
+    classes = {column.name: column.kind for column in profile.columns}
+    assert classes["ssn"] == SENSITIVE
+    assert classes["card"] != CLEAN
+    assert {item["column"] for item in profile.fields} == {"ssn", "card"}
+
+
+def test_json_paths_are_profiled(tmp_path):
+    path = tmp_path / "export.json"
+    users = [
+        {"id": i, "contact": {"email": f"user{i}@example.com"}, "tags": ["a", "b"]}
+        for i in range(40)
+    ]
+    path.write_text(
+        json.dumps({"exported": "2024", "users": users}), encoding="utf-8"
+    )
+
+    profile = profile_structured_file(str(path), sample_rows=20)
+
+    assert profile is not None
+    assert profile.rows == 41
+    classes = {column.name: column.kind for column in profile.columns}
+    assert classes["users[].contact.email"] == SENSITIVE
+    assert classes["users[].tags[]"] == CLEAN
+    assert '"email": "<EMAIL>"' in profile.summary
+
+
+def test_unparseable_files_fall_back_to_text(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('{"users": [', encoding="utf-8")
+    assert profile_structured_file(str(path)) is None
+
+
+@pytest.mark.asyncio
+async def test_read_document_reports_columns_through_dlp(users_csv, guard_config):
+    config = dataclasses.replace(
+        guard_config,
+        document=dataclasses.replace(
+            guard_config.document,
+            process_pool=False,
+            structured_min_bytes=0,
+            structured_sample_rows=50,
+        ),
+    )
+    state: GuardState = {"file_paths": [str(users_csv)], "metadata": {}}
+
+    result = await read_document(state, fw_config=config)
+
+    assert result["raw_text"].startswith("CSV data with 300 records")
+    assert result["metadata"]["structured_files"][str(users_csv)]["rows"] == 300
+    structured = result["structured_fields"]
+    assert {item["column"] for item in structured} == {"email", "ssn", "notes"}
+
+    update = await run_dlp_detector(
+        {"normalized_text": result["raw_text"], **result}
+    )
+    dlp_values = {item["value"] for item in update["dlp_fields"]}
+    assert "ops.lead@example.org" in dlp_values
+    # Clean columns are only sampled, and say so
+    assert any(
+        "not scanned in full: id" in warning for warning in result["warnings"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_ner_reads_samples_of_columns_not_reported_whole(
+    users_csv, guard_config
+):
+    config = dataclasses.replace(
+        guard_config,
+        document=dataclasses.replace(
+            guard_config.document,
+            process_pool=False,
+            structured_min_bytes=0,
+            structured_sample_rows=50,
+        ),
+        ner=NERConfig(enabled=True),
+    )
+    result = await read_document(
+        {"file_paths": [str(users_csv)], "metadata": {}}, fw_config=config
+    )
+
+    samples = result["structured_ner_samples"]
+    # Sensitive columns are reported whole and not sent to NER
+    assert {sample["column"] for sample in samples} == {"id", "notes"}
+    assert all(len(sample["text"]) <= 1000 for sample in samples)
+
+    def detect(self, text):
+        if text.startswith("notes: "):
+            return [{"field": "FIRST_NAME", "value": "Jane", "sources": ["ner"]}]
+        return []
+
+    with patch(
+        "multiagent_firewall.nodes.detection.GlinerNERDetector.detect", detect
+    ):
+        update = await run_ner_detector(
+            {"normalized_text": result["raw_text"], **result}, fw_config=config
+        )
+
+    assert {"field": "FIRST_NAME", "value": "Jane", "sources": ["ner"]} not in (
+        update["ner_fields"]
+    )
+    assert {
+        "field": "FIRST_NAME",
+        "value": "Jane",
+        "sources": ["ner"],
+        "column": "notes",
+    } in update["ner_fields"]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import threading
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from multiagent_firewall.config import OCRConfig
+from multiagent_firewall.detectors.ocr import TesseractOCRDetector
+from multiagent_firewall.detectors.tesseract_pool import (
+    TesserocrPool,
+    _parse_tesseract_config,
+    get_tesserocr_pool,
+    reset_tesserocr_pools,
+)
+from multiagent_firewall.nodes.document import _cached_tesseract_detector
+
+
+class FakeRIL:
+    BLOCK, PARA, TEXTLINE, WORD = range(4)
+
+
+class FakeWord:
+    def __init__(self, text, conf, box, first_in_block=False, first_in_line=False):
+        self.text = text
+        self.conf = conf
+        self.box = box
+        self.starts = {FakeRIL.WORD}
+        if first_in_block:
+            self.starts |= {FakeRIL.BLOCK, FakeRIL.PARA, FakeRIL.TEXTLINE}
+        if first_in_line:
+            self.starts.add(FakeRIL.TEXTLINE)
+
+    def IsAtBeginningOf(self, level):
+        return level in self.starts
+
+    def BoundingBox(self, level):
+        return self.box
+
+    def GetUTF8Text(self, level):
+        return self.text
+
+    def Confidence(self, level):
+        return self.conf
+
+
+class FakeAPI:
+    instances: list = []
+
+    def __init__(self, lang="eng", psm=None):
+        self.lang = lang
+        self.psm = psm
+        self.variables = {}
+        FakeAPI.instances.append(self)
+
+    def SetVariable(self, name, value):
+        self.variables[name] = value
+
+    def SetImage(self, image):
+        self.image = image
+
+    def Recognize(self):
+        pass
+
+    def GetIterator(self):
+        return [
+            FakeWord("Invoice", 95.0, (0, 0, 50, 10), first_in_block=True),
+            FakeWord("jane@example.com", 88.0, (60, 0, 160, 10)),
+            FakeWord("~", 10.0, (0, 20, 5, 30), first_in_line=True),
+        ]
+
+    def Clear(self):
+        pass
+
+    def End(self):
+        pass
+
+
+@pytest.fixture
+def fake_tesserocr():
+    FakeAPI.instances = []
+    module = types.SimpleNamespace(
+        PyTessBaseAPI=FakeAPI,
+        RIL=FakeRIL,
+        iterate_level=lambda iterator, level: iter(iterator),
+    )
+    reset_tesserocr_pools()
+    with patch.dict("sys.modules", {"tesserocr": module}):
+        yield module
+    reset_tesserocr_pools()
+
+
+def test_parse_tesseract_config():
+    assert _parse_tesseract_config("--psm 6 -c preserve_interword_spaces=1") == (
+        6,
+        {"preserve_interword_spaces": "1"},
+    )
+    assert _parse_tesseract_config("") == (None, {})
+
+
+def test_pool_reuses_handles_and_caps_size(fake_tesserocr):
+    pool = TesserocrPool(fake_tesserocr, lang="spa", config="--psm 6", size=2)
+    barrier = threading.Barrier(4)
+
+    def work():
+        barrier.wait()
+        for _ in range(5):
+            pool.recognize_data(object())
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 1 <= len(FakeAPI.instances) <= 2
+    assert all(api.lang == "spa" and api.psm == 6 for api in FakeAPI.instances)
+
+
+def test_get_pool_is_shared_and_none_without_tesserocr(fake_tesserocr):
+    assert get_tesserocr_pool("eng") is get_tesserocr_pool("eng")
+    reset_tesserocr_pools()
+    with patch.dict("sys.modules", {"tesserocr": None}):
+        assert get_tesserocr_pool("eng") is None
+
+
+def test_detector_uses_pool_and_applies_threshold(fake_tesserocr, tmp_path):
+    image_path = tmp_path / "shot.png"
+    image_path.write_bytes(b"image")
+    mock_pil = MagicMock()
+    mock_pytesseract = MagicMock()
+
+    with patch.dict("sys.modules", {"PIL": mock_pil, "pytesseract": mock_pytesseract}):
+        detector = TesseractOCRDetector(confidence_threshold=50)
+        text = detector({"file_path": str(image_path)})
+
+    assert text == "Invoice jane@example.com"
+    mock_pytesseract.image_to_data.assert_not_called()
+
+
+def test_detector_falls_back_to_pytesseract(tmp_path):
+    image_path = tmp_path / "shot.png"
+    image_path.write_bytes(b"image")
+    mock_pytesseract = MagicMock()
+    mock_pytesseract.image_to_data.return_value = {"text": ["Hello"], "conf": ["90"]}
+    reset_tesserocr_pools()
+
+    with patch.dict(
+        "sys.modules",
+        {"PIL": MagicMock(), "pytesseract": mock_pytesseract, "tesserocr": None},
+    ):
+        assert TesseractOCRDetector()({"file_path": str(image_path)}) == "Hello"
+        with pytest.raises(RuntimeError, match="tesserocr"):
+            TesseractOCRDetector(backend="tesserocr")({"file_path": str(image_path)})
+    reset_tesserocr_pools()
+
+
+def test_detector_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        TesseractOCRDetector(backend="easyocr")
+
+
+def test_default_detector_is_reused_per_settings():
+    config = OCRConfig(lang="eng")
+    assert _cached_tesseract_detector(config) is _cached_tesseract_detector(
+        OCRConfig(lang="eng")
+    )
+    assert _cached_tesseract_detector(config) is not _cached_tesseract_detector(
+        OCRConfig(lang="spa")
+    )
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import dataclasses
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+from PIL import Image, ImageDraw, ImageFilter, ImageFont  # noqa: E402
+
+from multiagent_firewall.detectors.text_presence import (  # noqa: E402
+    estimate_text_likelihood,
+    image_text_likelihood,
+)
+from multiagent_firewall.nodes.document import read_document  # noqa: E402
+from multiagent_firewall.types import GuardState  # noqa: E402
+
+
+def _screenshot(lines: int = 20, size=(1600, 1000), dark: bool = False) -> Image.Image:
+    background, ink = ((30, 30, 30), (220, 220, 220)) if dark else ("white", "black")
+    image = Image.new("RGB", size, background)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=22)
+    for row in range(lines):
+        draw.text((20, 20 + row * 40), "Card 4111 1111 1111 1111 jane@example.com", fill=ink, font=font)
+    return image
+
+
+def _photo() -> Image.Image:
+    rng = np.random.default_rng(0)
+    image = Image.new("RGB", (1600, 1000), (90, 120, 60))
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = rng.integers(0, 1500), rng.integers(0, 900)
+        w, h = rng.integers(30, 300), rng.integers(30, 300)
+        draw.ellipse((x, y, x + w, y + h), fill=tuple(int(v) for v in rng.integers(0, 255, 3)))
+    noisy = np.asarray(image, dtype=np.float32) + rng.normal(0, 8, (1000, 1600, 3))
+    return Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8)).filter(
+        ImageFilter.GaussianBlur(1)
+    )
+
+
+def test_text_scores_high_and_photos_low():
+    assert estimate_text_likelihood(_screenshot()) == 1.0
+    assert estimate_text_likelihood(_screenshot(dark=True)) == 1.0
+    # A single short line on a large canvas still clears the default threshold
+    assert estimate_text_likelihood(_screenshot(lines=1)) > 0.05
+    assert estimate_text_likelihood(_photo()) < 0.05
+    assert estimate_text_likelihood(Image.new("RGB", (800, 600), "blue")) == 0.0
+
+
+def test_unreadable_image_is_not_scored(tmp_path):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"not an image")
+    assert image_text_likelihood(str(path)) is None
+
+
+@pytest.mark.asyncio
+@patch("multiagent_firewall.nodes.document._get_default_ocr_detector")
+@patch("multiagent_firewall.nodes.document._has_ocr_support", return_value=True)
+async def test_photos_skip_both_ocr_tiers(
+    mock_has_ocr_support, mock_get_detector, tmp_path, guard_config
+):
+    detector = MagicMock(return_value="text")
+    mock_get_detector.return_value = detector
+    photo = tmp_path / "photo.png"
+    shot = tmp_path / "shot.png"
+    _photo().save(photo)
+    _screenshot().save(shot)
+    state: GuardState = {"file_paths": [str(photo), str(shot)], "metadata": {}}
+    config = dataclasses.replace(
+        guard_config,
+        ocr=dataclasses.replace(guard_config.ocr, text_prefilter=True),
+    )
+
+    result = await read_document(state, fw_config=config)
+
+    assert detector.call_count == 1
+    assert detector.call_args.args[0]["file_path"] == str(shot)
+    metadata = result["metadata"]
+    assert metadata["ocr_skipped_images"] == [str(photo)]
+    assert metadata["image_text_scores"][str(photo)] < 0.05
+    assert metadata["image_text_scores"][str(shot)] == 1.0
+    # Neither tier reads the photo, and the skip is reported
+    assert "images_needing_llm_ocr" not in metadata
+    assert any("not scanned" in w for w in result["warnings"])
+    assert result["raw_text"] == "text"
+
+
+def test_prefilter_is_off_by_default(guard_config):
+    assert guard_config.ocr.text_prefilter is False
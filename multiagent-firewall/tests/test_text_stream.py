@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import dataclasses
+import random
+import re
+from unittest.mock import patch
+
+import pytest
+
+from multiagent_firewall.detectors.text_stream import (
+    iter_text_chunks,
+    normalize_chunks,
+    read_normalized_text,
+)
+from multiagent_firewall.nodes.document import read_document
+from multiagent_firewall.nodes.preprocessing import normalize
+from multiagent_firewall.types import GuardState
+
+_PIECES = [
+    "a",
+    "b",
+    " ",
+    "\n",
+    "\t",
+    "é",
+    "<system-reminder>",
+    "</system-reminder>",
+    "<SYSTEM-Reminder>",
+    "<sys",
+    "tem-reminder>",
+    "</sys",
+]
+
+
+def _reference(text: str) -> str:
+    # The whole-string normalization that chunked normalization replaces
+    text = re.sub(
+        r"<system-reminder>.*?</system-reminder>",
+        "",
+        text,
+        flags=re.DOTALL | re.IGNORECASE,
+    )
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def test_chunked_normalization_matches_whole_string_normalization():
+    rng = random.Random(7)
+    for _ in range(3000):
+        text = "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 30)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(4, len(text) + 1)))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+        assert "".join(normalize_chunks(chunks)) == _reference(text), chunks
+
+
+def test_multibyte_characters_split_across_chunks_are_decoded(tmp_path):
+    path = tmp_path / "log.txt"
+    text = "héllo wörld 🙂 ünïcode\n" * 3
+    path.write_text(text, encoding="utf-8")
+
+    chunks = list(iter_text_chunks(str(path), chunk_bytes=3))
+
+    assert "".join(chunks) == text
+    assert len(chunks) > 1
+
+
+def test_invalid_utf8_is_not_read(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_bytes(b"valid \xff\xfe invalid")
+    assert read_normalized_text(str(path)) is None
+
+
+def test_normalize_node_strips_tags_and_whitespace():
+    state: GuardState = {
+        "raw_text": "  Hello\n\n<system-reminder>ignore\nme</system-reminder>  world ",
+    }
+    assert normalize(state)["normalized_text"] == "Hello world"
+
+
+@pytest.mark.asyncio
+async def test_large_text_files_are_streamed(guard_config, tmp_path):
+    path = tmp_path / "server.txt"
+    path.write_text("line 1\n\n  jane@example.com\t\n" * 2, encoding="utf-8")
+    config = dataclasses.replace(
+        guard_config,
+        document=dataclasses.replace(guard_config.document, text_stream_min_bytes=1),
+    )
+    state: GuardState = {"file_paths": [str(path)], "metadata": {}}
+
+    with patch(
+        "multiagent_firewall.nodes.document.extract_text_from_file"
+    ) as mock_extract:
+        result = await read_document(state, fw_config=config)
+
+    mock_extract.assert_not_called()
+    assert result["raw_text"] == "line 1 jane@example.com line 1 jane@example.com"
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from multiagent_firewall.config import GuardConfig
+from multiagent_firewall.detectors import budget
+from multiagent_firewall.detectors.budget import apply_token_budget, estimate_tokens
+from multiagent_firewall.nodes.detection import run_llm_detector
+from multiagent_firewall.types import GuardState
+from multiagent_firewall.utils import ProviderUnavailableError
+
+TEXT = " ".join(f"w{i:03d}" for i in range(400))  # 1999 characters
+
+
+@pytest.fixture(autouse=True)
+def heuristic_estimator(monkeypatch):
+    # Keep estimates deterministic regardless of tokenizer availability
+    monkeypatch.setattr(budget, "_load_encoding", lambda model: None)
+
+
+def test_estimate_tokens_heuristic():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+
+
+def test_within_budget_is_untouched():
+    result = apply_token_budget(TEXT, 1000)
+    assert result.pieces == [TEXT]
+    assert not result.reduced
+    assert apply_token_budget(TEXT, None).pieces == [TEXT]
+
+
+def test_truncate_keeps_head_on_word_boundary():
+    result = apply_token_budget(TEXT, 100)
+
+    (piece,) = result.pieces
+    assert result.reduced
+    assert TEXT.startswith(piece)
+    assert estimate_tokens(piece) <= 100
+    assert piece.split()[-1] in TEXT.split()
+
+
+def test_head_tail_samples_both_ends():
+    result = apply_token_budget(TEXT, 100, "head_tail")
+
+    (piece,) = result.pieces
+    head, tail = piece.split(budget.HEAD_TAIL_SEPARATOR)
+    assert TEXT.startswith(head)
+    assert TEXT.endswith(tail)
+    assert estimate_tokens(piece) <= 100
+
+
+def test_chunk_covers_text_and_caps_chunks():
+    result = apply_token_budget(TEXT, 100, "chunk", max_chunks=50)
+    assert " ".join(result.pieces) == TEXT
+    assert all(estimate_tokens(p) <= 100 for p in result.pieces)
+    assert not result.reduced
+
+    capped = apply_token_budget(TEXT, 100, "chunk", max_chunks=2)
+    assert len(capped.pieces) == 2
+    assert capped.dropped_chunks == len(result.pieces) - 2
+    assert capped.reduced
+
+
+def test_never_splits_redaction_placeholders():
+    text = "x " * 150 + "<<REDACTED:EMAIL_1>> tail " * 50
+    for piece in apply_token_budget(text, 90, "chunk").pieces:
+        assert piece.count("<<") == piece.count(">>")
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        apply_token_budget(TEXT, 10, "sample")
+
+
+@pytest.mark.asyncio
+async def test_run_llm_detector_chunks_oversized_input(guard_config):
+    config = dataclasses.replace(
+        guard_config,
+        llm=dataclasses.replace(
+            guard_config.llm, max_input_tokens=200, overflow_policy="chunk"
+        ),
+    )
+    detector = MagicMock()
+    detector.acall = AsyncMock(
+        side_effect=lambda text: {
+            "detected_fields": [{"field": "OTHER", "value": text.split()[0]}]
+        }
+    )
+    state: GuardState = {
+        "normalized_text": TEXT,
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector", return_value=detector
+    ):
+        result = await run_llm_detector(state, fw_config=config)
+
+    calls = detector.acall.await_count
+    assert calls > 1
+    assert len(result["llm_fields"]) == calls
+    assert result["metadata"]["llm_input_budget"]["pieces"] == calls
+    assert result["warnings"] == []
+
+
+@pytest.mark.asyncio
+async def test_run_llm_detector_warns_when_truncating(guard_config):
+    config = dataclasses.replace(
+        guard_config,
+        llm=dataclasses.replace(guard_config.llm, max_input_tokens=50),
+    )
+    detector = MagicMock()
+    detector.acall = AsyncMock(return_value={"detected_fields": []})
+    state: GuardState = {
+        "normalized_text": TEXT,
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector", return_value=detector
+    ):
+        result = await run_llm_detector(state, fw_config=config)
+
+    sent = detector.acall.await_args.args[0]
+    assert len(sent) < len(TEXT)
+    assert any("LLM input reduced" in w for w in result["warnings"])
+
+
+def test_config_from_env_parses_budget(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_MODEL", "gpt-4o")
+    monkeypatch.setenv("LLM_API_KEY", "key")
+    monkeypatch.setenv("LLM_MAX_INPUT_TOKENS", "8000")
+    monkeypatch.setenv("LLM_OVERFLOW_POLICY", "head_tail")
+
+    config = GuardConfig.from_env()
+
+    assert config.llm.max_input_tokens == 8000
+    assert config.llm.overflow_policy == "head_tail"
+
+
+@pytest.mark.asyncio
+async def test_chunks_run_a_few_at_a_time_and_survive_failures(guard_config):
+    config = dataclasses.replace(
+        guard_config,
+        llm=dataclasses.replace(
+            guard_config.llm,
+            max_input_tokens=200,
+            overflow_policy="chunk",
+            chunk_concurrency=2,
+        ),
+    )
+    in_flight = 0
+    peak = 0
+    calls = 0
+
+    async def acall(text):
+        nonlocal in_flight, peak, calls
+        calls += 1
+        failing = calls == 1
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if failing:
+            raise ProviderUnavailableError("concurrency limit reached")
+        return {"detected_fields": [{"field": "OTHER", "value": text.split()[0]}]}
+
+    detector = MagicMock()
+    detector.acall = acall
+    state: GuardState = {
+        "normalized_text": TEXT,
+        "metadata": {},
+        "warnings": [],
+        "errors": [],
+    }
+
+    with patch(
+        "multiagent_firewall.nodes.detection.LiteLLMDetector", return_value=detector
+    ):
+        result = await run_llm_detector(state, fw_config=config)
+
+    assert calls > 2
+    assert peak == 2
+    # The other chunks' findings are kept
+    assert len(result["llm_fields"]) == calls - 1
+    assert result["metadata"]["llm_input_budget"]["failed_chunks"] == 1
+    assert result["metadata"]["llm_degraded"] is True
+    assert any(f"1 of {calls} chunks" in w for w in result["warnings"])